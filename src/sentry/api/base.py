@@ -1,24 +1,26 @@
 from __future__ import annotations
 
 import functools
+import itertools
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Any, Mapping
+from typing import Any, Iterable, Iterator, Mapping
 
 import sentry_sdk
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.http import urlquote
 from django.views.decorators.csrf import csrf_exempt
 from pytz import utc
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from sentry import analytics, tsdb
+from sentry import analytics, options, tsdb
 from sentry.auth import access
 from sentry.models import Environment
 from sentry.types.ratelimit import RateLimit, RateLimitCategory
@@ -43,11 +45,50 @@ LINK_HEADER = '<{uri}&cursor={cursor}>; rel="{name}"; results="{has_results}"; c
 
 DEFAULT_AUTHENTICATION = (TokenAuthentication, ApiKeyAuthentication, SessionAuthentication)
 
+# Streamed responses are written in chunks of at least this many bytes
+STREAMING_CHUNK_SIZE = 64 * 1024
+
 logger = logging.getLogger(__name__)
 audit_logger = logging.getLogger("sentry.audit.api")
 api_access_logger = logging.getLogger("sentry.access.api")
 
 
+def stream_json_list(
+    items: Iterable[Any], chunk_size: int = STREAMING_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Render `items` as a JSON list, one item at a time.
+
+    Each item is rendered exactly like a regular `Response` would render it,
+    and the output is buffered into chunks of about `chunk_size` bytes.
+    """
+    renderer = JSONRenderer()
+    buf = [b"["]
+    size = 1
+    for i, item in enumerate(items):
+        if i:
+            buf.append(b",")
+        chunk = renderer.render(item)
+        buf.append(chunk)
+        size += len(chunk) + 1
+        if size >= chunk_size:
+            yield b"".join(buf)
+            buf = []
+            size = 0
+    buf.append(b"]")
+    yield b"".join(buf)
+
+
+def _log_stream_errors(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    try:
+        yield from chunks
+    except Exception:
+        # The status and headers were sent already, the client only sees a
+        # truncated response.
+        logger.exception("api.streaming-response.failed")
+        raise
+
+
 def allow_cors_options(func):
     """
     Decorator that adds automatic handling of OPTIONS requests for CORS
@@ -293,6 +334,30 @@ class Endpoint(APIView):
     def respond_with_text(self, text):
         return self.respond({"text": text})
 
+    def respond_with_stream(self, results: Iterable[Any], **kwargs: Any) -> StreamingHttpResponse:
+        """
+        Respond with a JSON list that is rendered incrementally while it's
+        written out, e.g. from ``serialize_iter``.
+
+        The first chunk is rendered before responding, so that an error there
+        still results in a regular error response. An error in a later chunk
+        can only truncate the response, and is logged.
+        """
+        chunks = stream_json_list(results)
+        first_chunk = next(chunks)
+        return StreamingHttpResponse(
+            itertools.chain([first_chunk], _log_stream_errors(chunks)),
+            content_type="application/json",
+            **kwargs,
+        )
+
+    def should_stream_results(self, request: Request) -> bool:
+        """
+        Whether list results of this endpoint should be serialized lazily and
+        streamed (see ``serialize_iter`` and ``respond_with_stream``).
+        """
+        return type(self).__name__ in options.get("api.streaming-responses.endpoints")
+
     def get_per_page(self, request: Request, default_per_page=100, max_per_page=100):
         try:
             per_page = int(request.GET.get("per_page", default_per_page))
@@ -354,7 +419,11 @@ class Endpoint(APIView):
         else:
             results = cursor_result.results
 
-        response = Response(results)
+        # lazily serialized results (see ``serialize_iter``) are streamed
+        if isinstance(results, Iterator):
+            response = self.respond_with_stream(results)
+        else:
+            response = Response(results)
 
         self.add_cursor_headers(request, response, cursor_result)
 
@@ -20,7 +20,7 @@ from sentry.api.helpers.group_index import (
     update_groups,
 )
 from sentry.api.paginator import DateTimePaginator, Paginator
-from sentry.api.serializers import serialize
+from sentry.api.serializers import serialize, serialize_iter
 from sentry.api.serializers.models.group import StreamGroupSerializerSnuba
 from sentry.api.utils import InvalidParams, get_date_range_from_params
 from sentry.constants import ALLOWED_FUTURE_DELTA
@@ -316,7 +316,10 @@ class OrganizationGroupIndexEndpoint(OrganizationEventsEndpointBase):
 
         results = list(cursor_result)
 
-        context = serialize(
+        stream_results = self.should_stream_results(request)
+        serialize_results = serialize_iter if stream_results else serialize
+
+        context = serialize_results(
             results,
             request.user,
             serializer(
@@ -339,9 +342,12 @@ class OrganizationGroupIndexEndpoint(OrganizationEventsEndpointBase):
         ]
         if status and (GroupStatus.UNRESOLVED in status[0].value.raw_value):
             status_labels = {QUERY_STATUS_LOOKUP[s] for s in status[0].value.raw_value}
-            context = [r for r in context if "status" not in r or r["status"] in status_labels]
+            context = (r for r in context if "status" not in r or r["status"] in status_labels)
 
-        response = Response(context)
+        if stream_results:
+            response = self.respond_with_stream(context)
+        else:
+            response = Response(list(context))
 
         self.add_cursor_headers(request, response, cursor_result)
 
@@ -5,7 +5,7 @@ from rest_framework.response import Response
 from sentry.api.base import EnvironmentMixin
 from sentry.api.bases.organization import OrganizationEndpoint
 from sentry.api.paginator import OffsetPaginator
-from sentry.api.serializers import serialize
+from sentry.api.serializers import serialize, serialize_iter
 from sentry.api.serializers.models.project import ProjectSummarySerializer
 from sentry.models import Project, ProjectStatus, Team
 from sentry.search.utils import tokenize_query
@@ -112,6 +112,8 @@ class OrganizationProjectsEndpoint(OrganizationEndpoint, EnvironmentMixin):
                     session_stats=session_stats,
                     collapse=collapse,
                 )
+                if self.should_stream_results(request):
+                    return serialize_iter(result, request.user, serializer)
                 return serialize(result, request.user, serializer)
 
             return self.paginate(
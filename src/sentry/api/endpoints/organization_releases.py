@@ -14,7 +14,7 @@ from sentry.api.bases.organization import OrganizationReleasesBaseEndpoint
 from sentry.api.exceptions import ConflictError, InvalidRepository
 from sentry.api.paginator import MergingOffsetPaginator, OffsetPaginator
 from sentry.api.release_search import RELEASE_FREE_TEXT_KEY, parse_search_query
-from sentry.api.serializers import serialize
+from sentry.api.serializers import serialize, serialize_iter
 from sentry.api.serializers.rest_framework import (
     ListField,
     ReleaseHeadCommitSerializer,
@@ -373,11 +373,13 @@ class OrganizationReleasesEndpoint(
         queryset = queryset.extra(select=select_extra)
         queryset = add_date_filter_to_queryset(queryset, filter_params)
 
+        serialize_results = serialize_iter if self.should_stream_results(request) else serialize
+
         return self.paginate(
             request=request,
             queryset=queryset,
             paginator_cls=paginator_cls,
-            on_results=lambda x: serialize(
+            on_results=lambda x: serialize_results(
                 x,
                 request.user,
                 with_health_data=with_health,
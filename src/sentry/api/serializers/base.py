@@ -1,6 +1,9 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import (
     Any,
     Callable,
+    Iterator,
     List,
     Mapping,
     MutableMapping,
@@ -12,14 +15,37 @@ from typing import (
 )
 
 import sentry_sdk
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections
+from sentry_sdk import Hub
 
+from sentry import features
 from sentry.utils.json import JSONData
 
 K = TypeVar("K")
 
 registry: MutableMapping[Any, Any] = {}
 
+# Shared, bounded pool used to run attribute providers (see
+# `Serializer.get_attrs_providers`) concurrently with `get_attrs`. Its size is
+# configured with `SENTRY_SERIALIZER_ATTRS_PROVIDER_WORKERS`.
+_attrs_provider_pool: Optional[ThreadPoolExecutor] = None
+_attrs_provider_pool_lock = threading.Lock()
+_attrs_provider_thread = threading.local()
+
+
+def _get_attrs_provider_pool() -> ThreadPoolExecutor:
+    global _attrs_provider_pool
+    if _attrs_provider_pool is None:
+        with _attrs_provider_pool_lock:
+            if _attrs_provider_pool is None:
+                _attrs_provider_pool = ThreadPoolExecutor(
+                    max_workers=settings.SENTRY_SERIALIZER_ATTRS_PROVIDER_WORKERS,
+                    thread_name_prefix="serializer-attrs",
+                )
+    return _attrs_provider_pool
+
 
 def register(type: Any) -> Callable[[Type[K]], Type[K]]:
     """A wrapper that adds the wrapped Serializer to the Serializer registry (see above) for the key `type`."""
@@ -31,6 +57,53 @@ def register(type: Any) -> Callable[[Type[K]], Type[K]]:
     return wrapped
 
 
+def _run_attrs_provider(hub: Hub, description: str, provider: Callable[[], Any]) -> Any:
+    _attrs_provider_thread.active = True
+    try:
+        with hub:
+            with hub.start_span(op="serialize.get_attrs.provider", description=description):
+                return provider()
+    finally:
+        _attrs_provider_thread.active = False
+        # Some backends look up models to build their queries (e.g. Snuba
+        # translators), don't leak those connections from the pool's threads.
+        close_old_connections()
+
+
+def submit_attrs_providers(
+    description: str, providers: Mapping[str, Callable[[], Any]]
+) -> Mapping[str, "Future[Any]"]:
+    """
+    Start running each of `providers` in the shared attribute provider pool,
+    propagating the current Sentry hub into the worker threads.
+
+    Providers are run inline when the pool is disabled, or when called from a
+    provider itself (e.g. by a nested `serialize`), since waiting on the
+    bounded pool from one of its own threads could deadlock.
+
+    Providers may read from the database, but the worker threads use their
+    own connections, which are closed once a provider is done, so they don't
+    see what the caller's transaction hasn't committed yet.
+    """
+    pool_enabled = bool(settings.SENTRY_SERIALIZER_ATTRS_PROVIDER_WORKERS)
+    run_inline = not pool_enabled or getattr(_attrs_provider_thread, "active", False)
+
+    futures = {}
+    for name, provider in providers.items():
+        if run_inline:
+            future: "Future[Any]" = Future()
+            try:
+                future.set_result(provider())
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = _get_attrs_provider_pool().submit(
+                _run_attrs_provider, Hub(Hub.current), f"{description}.{name}", provider
+            )
+        futures[name] = future
+    return futures
+
+
 def serialize(
     objects: Union[Any, Sequence[Any]],
     user: Optional[Any] = None,
@@ -59,35 +132,111 @@ def serialize(
         return serialize([objects], user=user, serializer=serializer, **kwargs)[0]
 
     if serializer is None:
-        # find the first object that is in the registry
-        for o in objects:
-            try:
-                serializer = registry[type(o)]
-                break
-            except KeyError:
-                pass
-        else:
+        serializer = _get_registered_serializer(objects)
+        if serializer is None:
             return objects
 
     with sentry_sdk.start_span(op="serialize", description=type(serializer).__name__) as span:
         span.set_data("Object Count", len(objects))
 
-        with sentry_sdk.start_span(op="serialize.get_attrs", description=type(serializer).__name__):
-            attrs = serializer.get_attrs(
-                # avoid passing NoneType's to the serializer as they're allowed and
-                # filtered out of serialize()
-                item_list=[o for o in objects if o is not None],
-                user=user,
-                **kwargs,
-            )
+        # Keeps the features prefetched for `objects` until they're serialized
+        with features.memoized():
+            attrs = _get_attrs(serializer, objects, user, **kwargs)
+
+            with sentry_sdk.start_span(
+                op="serialize.iterate", description=type(serializer).__name__
+            ):
+                return [serializer(o, attrs=attrs.get(o, {}), user=user, **kwargs) for o in objects]
+
+
+def serialize_iter(
+    objects: Sequence[Any],
+    user: Optional[Any] = None,
+    serializer: Optional[Any] = None,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """
+    Like `serialize` for a list of objects, but serializes each object lazily.
+
+    The attributes of all objects are fetched in bulk up front, so errors from
+    `get_attrs` are raised by this call. Each object is only turned into
+    primitives as the returned iterator is consumed, which lets responses be
+    streamed without holding every serialized object in memory at once.
+
+    :param objects: A list of objects
+    :param user: The user who will be viewing the objects. Omit to view as `AnonymousUser`.
+    :param serializer: The `Serializer` class who's logic we'll use to serialize
+        `objects`. Omit to just look up the Serializer in the registry.
+    :param kwargs Any
+    :returns An iterator of the serialized versions of `objects`.
+    """
+    if user is None:
+        user = AnonymousUser()
+
+    if not objects:
+        return iter(())
+
+    if serializer is None:
+        serializer = _get_registered_serializer(objects)
+        if serializer is None:
+            return iter(objects)
+
+    with sentry_sdk.start_span(op="serialize", description=type(serializer).__name__) as span:
+        span.set_data("Object Count", len(objects))
+        attrs = _get_attrs(serializer, objects, user, **kwargs)
+
+    return (serializer(o, attrs=attrs.get(o, {}), user=user, **kwargs) for o in objects)
+
+
+def _get_registered_serializer(objects: Sequence[Any]) -> Optional[Any]:
+    # find the first object that is in the registry
+    for o in objects:
+        try:
+            return registry[type(o)]
+        except KeyError:
+            pass
+    return None
+
+
+def _get_attrs(
+    serializer: Any, objects: Sequence[Any], user: Any, **kwargs: Any
+) -> MutableMapping[Any, Any]:
+    # avoid passing NoneType's to the serializer as they're allowed and
+    # filtered out of serialize()
+    item_list = [o for o in objects if o is not None]
+
+    prefetch_features = getattr(serializer, "prefetch_features", None)
+    if prefetch_features is not None:
+        with sentry_sdk.start_span(
+            op="serialize.prefetch_features", description=type(serializer).__name__
+        ):
+            prefetch_features(item_list, user)
+
+    get_attrs_providers = getattr(serializer, "get_attrs_providers", None)
+    providers = get_attrs_providers(item_list, user, **kwargs) if get_attrs_providers else {}
+    futures = submit_attrs_providers(type(serializer).__name__, providers)
 
-        with sentry_sdk.start_span(op="serialize.iterate", description=type(serializer).__name__):
-            return [serializer(o, attrs=attrs.get(o, {}), user=user, **kwargs) for o in objects]
+    with sentry_sdk.start_span(op="serialize.get_attrs", description=type(serializer).__name__):
+        attrs = serializer.get_attrs(item_list=item_list, user=user, **kwargs)
+
+    if futures:
+        with sentry_sdk.start_span(
+            op="serialize.get_attrs.wait_providers", description=type(serializer).__name__
+        ):
+            for future in futures.values():
+                for item, item_attrs in future.result().items():
+                    attrs.setdefault(item, {}).update(item_attrs)
+
+    return attrs
 
 
 class Serializer:
     """A Serializer class contains the logic to serialize a specific type of object."""
 
+    # Feature flags that `serialize` checks with `features.has` for each object. They are
+    # evaluated for all objects at once before `get_attrs`, so those checks are memo hits.
+    feature_flags: Sequence[str] = ()
+
     def __call__(
         self, obj: Any, attrs: Mapping[Any, Any], user: Any, **kwargs: Any
     ) -> Optional[MutableMapping[str, Any]]:
@@ -96,6 +245,17 @@ class Serializer:
             return None
         return self.serialize(obj, attrs, user, **kwargs)
 
+    def prefetch_features(self, item_list: List[Any], user: Any) -> None:
+        """
+        Evaluate the feature flags checked while serializing `item_list` at once.
+
+        By default `feature_flags` are evaluated for the items themselves, with
+        `user` as the actor. Override this to evaluate flags of related objects,
+        e.g. the organizations of the items.
+        """
+        if self.feature_flags:
+            features.prefetch(self.feature_flags, item_list, actor=user)
+
     def get_attrs(self, item_list: List[Any], user: Any, **kwargs: Any) -> MutableMapping[Any, Any]:
         """
         Fetch all of the associated data needed to serialize the objects in `item_list`.
@@ -107,6 +267,25 @@ class Serializer:
         """
         return {}
 
+    def get_attrs_providers(
+        self, item_list: List[Any], user: Any, **kwargs: Any
+    ) -> Mapping[str, Callable[[], Mapping[Any, Mapping[str, Any]]]]:
+        """
+        Declare independent, blocking fetches of attributes for the objects in `item_list`.
+
+        Each provider is a callable returning a mapping of items to the attributes it
+        contributes. `serialize` runs the providers in a thread pool concurrently with
+        `get_attrs`, and merges their results into the mapping `get_attrs` returns.
+        Providers are meant for calls to external services (Snuba, TSDB, etc.). They may
+        read from the database, but on a connection of their own rather than the caller's.
+
+        :param item_list: List of input objects that should be serialized.
+        :param user: The user who will be viewing the objects.
+        :param kwargs: Any
+        :returns A mapping of provider names to providers.
+        """
+        return {}
+
     def serialize(
         self, obj: Any, attrs: Mapping[Any, Any], user: Any, **kwargs: Any
     ) -> MutableMapping[str, JSONData]:
@@ -10,10 +10,11 @@ from django.conf import settings
 from django.db.models import Min, prefetch_related_objects
 from django.utils import timezone
 
-from sentry import release_health, tagstore, tsdb
+from sentry import features, release_health, tagstore, tsdb
 from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers.base import submit_attrs_providers
 from sentry.api.serializers.models.actor import ActorSerializer
-from sentry.api.serializers.models.plugin import is_plugin_deprecated
+from sentry.api.serializers.models.plugin import SHADOW_DEPRECATED_PLUGINS, is_plugin_deprecated
 from sentry.app import env
 from sentry.auth.superuser import is_active_superuser
 from sentry.constants import LOG_LEVELS, StatsPeriod
@@ -93,6 +94,13 @@ class GroupSerializerBase(Serializer):
             return False
         return key in self.collapse
 
+    def prefetch_features(self, item_list, user):
+        # `is_plugin_deprecated` checks these for the organization of each group
+        deprecation_flags = list(set(SHADOW_DEPRECATED_PLUGINS.values()))
+        if deprecation_flags:
+            organizations = list({item.project.organization for item in item_list})
+            features.prefetch(deprecation_flags, organizations)
+
     def _get_seen_stats(self, item_list, user):
         """
         Returns a dictionary keyed by item that includes:
@@ -908,17 +916,23 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                 start=self.start,
                 end=self.end,
             )
-            time_range_result = partial_execute_seen_stats_query()
-            filtered_result = (
-                partial_execute_seen_stats_query(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
-            )
+            # These queries are independent of each other, run them concurrently
+            queries = {"time_range": partial_execute_seen_stats_query}
+            if self.conditions and not self._collapse("filtered"):
+                queries["filtered"] = functools.partial(
+                    partial_execute_seen_stats_query, conditions=self.conditions
+                )
+            if not self._collapse("lifetime") and (self.start or self.end):
+                queries["lifetime"] = functools.partial(
+                    partial_execute_seen_stats_query, start=None, end=None
+                )
+            futures = submit_attrs_providers(f"{type(self).__name__}.seen_stats", queries)
+
+            time_range_result = futures["time_range"].result()
+            filtered_result = futures["filtered"].result() if "filtered" in futures else None
             if not self._collapse("lifetime"):
                 lifetime_result = (
-                    partial_execute_seen_stats_query(start=None, end=None)
-                    if self.start or self.end
-                    else time_range_result
+                    futures["lifetime"].result() if "lifetime" in futures else time_range_result
                 )
             else:
                 lifetime_result = None
@@ -942,6 +956,30 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             **query_params,
         )
 
+    def get_attrs_providers(self, item_list, user, **kwargs):
+        providers = {}
+
+        if self.stats_period and not self._collapse("stats"):
+            partial_get_stats = functools.partial(
+                self.get_stats, item_list=item_list, user=user, environment_ids=self.environment_ids
+            )
+
+            def get_stats():
+                stats = partial_get_stats()
+                return {item: {"stats": stats[item.id]} for item in item_list}
+
+            providers["stats"] = get_stats
+
+            if self.conditions and not self._collapse("filtered"):
+
+                def get_filtered_stats():
+                    filtered_stats = partial_get_stats(conditions=self.conditions)
+                    return {item: {"filtered_stats": filtered_stats[item.id]} for item in item_list}
+
+                providers["filtered_stats"] = get_filtered_stats
+
+        return providers
+
     def get_attrs(self, item_list, user):
         if not self._collapse("base"):
             attrs = super().get_attrs(item_list, user)
@@ -953,20 +991,6 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                 attrs = {item: {} for item in item_list}
 
         if self.stats_period and not self._collapse("stats"):
-            partial_get_stats = functools.partial(
-                self.get_stats, item_list=item_list, user=user, environment_ids=self.environment_ids
-            )
-            stats = partial_get_stats()
-            filtered_stats = (
-                partial_get_stats(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
-            )
-            for item in item_list:
-                if filtered_stats:
-                    attrs[item].update({"filtered_stats": filtered_stats[item.id]})
-                attrs[item].update({"stats": stats[item.id]})
-
             if self._expand("sessions"):
                 uniq_project_ids = list({item.project_id for item in item_list})
                 cache_keys = {pid: self._build_session_cache_key(pid) for pid in uniq_project_ids}
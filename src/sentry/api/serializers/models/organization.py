@@ -91,6 +91,22 @@ class TrustedRelaySerializer(serializers.Serializer):
 
 @register(Organization)
 class OrganizationSerializer(Serializer):
+    def get_feature_flags(self):
+        from sentry import features
+        from sentry.features.base import OrganizationFeature
+
+        return [
+            feature
+            for feature in features.all(feature_type=OrganizationFeature).keys()
+            if feature.startswith(_ORGANIZATION_SCOPE_PREFIX)
+        ]
+
+    def prefetch_features(self, item_list, user):
+        from sentry import features
+
+        # `serialize` asks the entity handler itself, in one call per organization
+        features.prefetch(self.get_feature_flags(), item_list, actor=user, skip_entity=True)
+
     def get_attrs(self, item_list, user):
         avatars = {
             a.organization_id: a
@@ -103,7 +119,6 @@ class OrganizationSerializer(Serializer):
 
     def serialize(self, obj, attrs, user):
         from sentry import features
-        from sentry.features.base import OrganizationFeature
 
         if attrs.get("avatar"):
             avatar = {
@@ -116,11 +131,7 @@ class OrganizationSerializer(Serializer):
         status = OrganizationStatus(obj.status)
 
         # Retrieve all registered organization features
-        org_features = [
-            feature
-            for feature in features.all(feature_type=OrganizationFeature).keys()
-            if feature.startswith(_ORGANIZATION_SCOPE_PREFIX)
-        ]
+        org_features = self.get_feature_flags()
         feature_list = set()
 
         # Check features in batch using the entity handler
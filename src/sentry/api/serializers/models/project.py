@@ -99,21 +99,23 @@ def get_access_by_project(
     return result
 
 
+def get_project_feature_flags() -> List[str]:
+    return [
+        feature
+        for feature in features.all(feature_type=ProjectFeature).keys()
+        if feature.startswith(_PROJECT_SCOPE_PREFIX)
+    ]
+
+
 def get_features_for_projects(
     all_projects: Sequence[Project], user: User
 ) -> MutableMapping[Project, List[str]]:
-    # Arrange to call features.has_for_batch rather than features.has
-    # for performance's sake
     projects_by_org = defaultdict(list)
     for project in all_projects:
         projects_by_org[project.organization].append(project)
 
     features_by_project = defaultdict(list)
-    project_features = [
-        feature
-        for feature in features.all(feature_type=ProjectFeature).keys()
-        if feature.startswith(_PROJECT_SCOPE_PREFIX)
-    ]
+    project_features = get_project_feature_flags()
 
     batch_checked = set()
     for (organization, projects) in projects_by_org.items():
@@ -132,15 +134,16 @@ def get_features_for_projects(
 
                     batch_checked.add(feature_name)
 
+    # Remaining features should not be checked via the entity handler. They were
+    # evaluated for all projects at once by `ProjectSerializer.prefetch_features`,
+    # so these checks are memo hits.
     for feature_name in project_features:
         if feature_name in batch_checked:
             continue
         abbreviated_feature = feature_name[len(_PROJECT_SCOPE_PREFIX) :]
-        for (organization, projects) in projects_by_org.items():
-            result = features.has_for_batch(feature_name, organization, projects, user)
-            for (project, flag) in result.items():
-                if flag:
-                    features_by_project[project].append(abbreviated_feature)
+        for project in all_projects:
+            if features.has(feature_name, project, actor=user, skip_entity=True):
+                features_by_project[project].append(abbreviated_feature)
 
     for project in all_projects:
         if project.flags.has_releases:
@@ -171,6 +174,10 @@ class ProjectSerializer(Serializer):
         self.transaction_stats = transaction_stats
         self.session_stats = session_stats
 
+    def prefetch_features(self, item_list: Sequence[Project], user: User) -> None:
+        # `get_features_for_projects` asks the entity handler itself, per organization
+        features.prefetch(get_project_feature_flags(), item_list, actor=user, skip_entity=True)
+
     def get_attrs(
         self, item_list: Sequence[Project], user: User, **kwargs: Any
     ) -> MutableMapping[Project, MutableMapping[str, Any]]:
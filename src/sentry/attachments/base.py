@@ -7,6 +7,10 @@ ATTACHMENT_META_KEY = "{key}:a"
 ATTACHMENT_UNCHUNKED_DATA_KEY = "{key}:a:{id}"
 ATTACHMENT_DATA_CHUNK_KEY = "{key}:a:{id}:{chunk_index}"
 
+#: The number of chunks that are fetched at once when reading an attachment
+#: from the cache.
+ATTACHMENT_READ_AHEAD_CHUNKS = 8
+
 UNINITIALIZED_DATA = object()
 
 
@@ -63,9 +67,18 @@ class CachedAttachment:
         assert self._data is not UNINITIALIZED_DATA
         return self._data
 
+    def iter_data(self):
+        """
+        Yields the data of the attachment in chunks, without holding all of it
+        in memory unless it was loaded already.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            yield from self._cache.iter_data(self)
+        else:
+            yield self.data
+
     def delete(self):
-        for key in self.chunk_keys:
-            self._cache.inner.delete(key)
+        self._cache.inner.delete_many(list(self.chunk_keys))
 
     @property
     def chunk_keys(self):
@@ -132,6 +145,20 @@ class BaseAttachmentCache:
         key = ATTACHMENT_DATA_CHUNK_KEY.format(key=key, id=id, chunk_index=chunk_index)
         self.inner.set(key, zlib.compress(chunk_data), timeout, raw=True)
 
+    def set_chunks(self, chunks, timeout=None):
+        """
+        Stores many chunks at once, given as ``(key, id, chunk_index,
+        chunk_data)`` tuples.
+        """
+        items = [
+            (
+                ATTACHMENT_DATA_CHUNK_KEY.format(key=key, id=id, chunk_index=chunk_index),
+                zlib.compress(chunk_data),
+            )
+            for key, id, chunk_index, chunk_data in chunks
+        ]
+        self.inner.set_many(items, timeout, raw=True)
+
     def set_unchunked_data(self, key, id, data, timeout=None, metrics_tags=None):
         key = ATTACHMENT_UNCHUNKED_DATA_KEY.format(key=key, id=id)
         compressed = zlib.compress(data)
@@ -151,16 +178,24 @@ class BaseAttachmentCache:
             attachment.setdefault("key", key)
             yield CachedAttachment(cache=self, **attachment)
 
-    def get_data(self, attachment):
-        data = []
-
-        for key in attachment.chunk_keys:
-            raw_data = self.inner.get(key, raw=True)
-            if raw_data is None:
-                raise MissingAttachmentChunks()
-            data.append(zlib.decompress(raw_data))
+    def iter_data(self, attachment, read_ahead=ATTACHMENT_READ_AHEAD_CHUNKS):
+        """
+        Yields the decompressed chunks of the attachment, fetching up to
+        ``read_ahead`` of them at once. Raises ``MissingAttachmentChunks`` once
+        a chunk is reached that is missing.
+        """
+        keys = list(attachment.chunk_keys)
+        for start in range(0, len(keys), read_ahead):
+            batch = keys[start : start + read_ahead]
+            raw_chunks = self.inner.get_many(batch, raw=True)
+            for key in batch:
+                raw_data = raw_chunks.get(key)
+                if raw_data is None:
+                    raise MissingAttachmentChunks()
+                yield zlib.decompress(raw_data)
 
-        return b"".join(data)
+    def get_data(self, attachment):
+        return b"".join(self.iter_data(attachment))
 
     def delete(self, key):
         for attachment in self.get(key):
@@ -15,3 +15,16 @@ class DjangoCache(BaseCache):
     def get(self, key, version=None, raw=False):
         return cache.get(key, version=version or self.version)
         self._mark_transaction("get")
+
+    def get_many(self, keys, version=None, raw=False):
+        rv = cache.get_many(keys, version=version or self.version)
+        self._mark_transaction("get")
+        return rv
+
+    def set_many(self, items, timeout, version=None, raw=False):
+        cache.set_many(dict(items), timeout, version=version or self.version)
+        self._mark_transaction("set")
+
+    def delete_many(self, keys, version=None):
+        cache.delete_many(keys, version=version or self.version)
+        self._mark_transaction("delete")
@@ -16,15 +16,39 @@ class CommonRedisCache(BaseCache):
         self.client = client
         BaseCache.__init__(self, **options)
 
-    def set(self, key, value, timeout, version=None, raw=False):
-        key = self.make_key(key, version=version)
+    def _execute_many(self, commands):
+        """
+        Runs the given ``(command, args)`` pairs in a single round trip per
+        node, and returns their results.
+        """
+        pipeline = self.client.pipeline(transaction=False)
+        for command, args in commands:
+            getattr(pipeline, command)(*args)
+        return pipeline.execute()
+
+    def _get_set_command(self, key, value, timeout, raw):
         v = json.dumps(value) if not raw else value
         if len(v) > self.max_size:
             raise ValueTooLarge(f"Cache key too large: {key!r} {len(v)!r}")
         if timeout:
-            self.client.setex(key, int(timeout), v)
+            return "setex", (key, int(timeout), v)
         else:
-            self.client.set(key, v)
+            return "set", (key, v)
+
+    def set(self, key, value, timeout, version=None, raw=False):
+        key = self.make_key(key, version=version)
+        command, args = self._get_set_command(key, value, timeout, raw)
+        getattr(self.client, command)(*args)
+
+        self._mark_transaction("set")
+
+    def set_many(self, items, timeout, version=None, raw=False):
+        commands = [
+            self._get_set_command(self.make_key(key, version=version), value, timeout, raw)
+            for key, value in items
+        ]
+        if commands:
+            self._execute_many(commands)
 
         self._mark_transaction("set")
 
@@ -34,6 +58,13 @@ class CommonRedisCache(BaseCache):
 
         self._mark_transaction("delete")
 
+    def delete_many(self, keys, version=None):
+        commands = [("delete", (self.make_key(key, version=version),)) for key in keys]
+        if commands:
+            self._execute_many(commands)
+
+        self._mark_transaction("delete")
+
     def get(self, key, version=None, raw=False):
         key = self.make_key(key, version=version)
         result = self.client.get(key)
@@ -44,6 +75,20 @@ class CommonRedisCache(BaseCache):
 
         return result
 
+    def get_many(self, keys, version=None, raw=False):
+        keys = list(keys)
+        commands = [("get", (self.make_key(key, version=version),)) for key in keys]
+        results = self._execute_many(commands) if commands else []
+
+        rv = {}
+        for key, result in zip(keys, results):
+            if result is not None:
+                rv[key] = json.loads(result) if not raw else result
+
+        self._mark_transaction("get")
+
+        return rv
+
 
 class RbCache(CommonRedisCache):
     def __init__(self, **options):
@@ -51,6 +96,13 @@ class RbCache(CommonRedisCache):
         client = cluster.get_routing_client()
         CommonRedisCache.__init__(self, client, **options)
 
+    def _execute_many(self, commands):
+        # The routing client doesn't support pipelines, but sends the commands
+        # issued in a map to each node at once.
+        with self.client.map() as client:
+            promises = [getattr(client, command)(*args) for command, args in commands]
+        return [promise.value for promise in promises]
+
 
 # Confusing legacy name for RbCache.  We don't actually have a pure redis cache
 RedisCache = RbCache
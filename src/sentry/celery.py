@@ -3,6 +3,8 @@ from celery.app.task import Task
 from celery.worker.request import Request
 from django.conf import settings
 
+from sentry.queue.routers import get_task_serializer
+from sentry.queue.serializer import register_serializers
 from sentry.utils import metrics
 
 DB_SHARED_THREAD = """\
@@ -48,12 +50,19 @@ def patch_thread_ident():
 
 
 patch_thread_ident()
+register_serializers()
 
 
 class SentryTask(Task):
     Request = "sentry.celery:SentryRequest"
 
     def apply_async(self, *args, **kwargs):
+        # Per-queue serializers must be passed here, routes can't override the task's serializer
+        if "serializer" not in kwargs:
+            serializer = get_task_serializer(self, kwargs.get("queue"))
+            if serializer is not None:
+                kwargs["serializer"] = serializer
+
         with metrics.timer("jobs.delay", instance=self.name):
             return Task.apply_async(self, *args, **kwargs)
 
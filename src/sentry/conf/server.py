@@ -545,7 +545,7 @@ CELERY_REDIRECT_STDOUTS = False
 CELERYD_HIJACK_ROOT_LOGGER = False
 CELERY_TASK_SERIALIZER = "pickle"
 CELERY_RESULT_SERIALIZER = "pickle"
-CELERY_ACCEPT_CONTENT = {"pickle"}
+CELERY_ACCEPT_CONTENT = {"pickle", "sentry-msgpack", "sentry-msgpack-zstd"}
 CELERY_IMPORTS = (
     "sentry.data_export.tasks",
     "sentry.discover.tasks",
@@ -581,6 +581,7 @@ CELERY_IMPORTS = (
     "sentry.tasks.reports",
     "sentry.tasks.reprocessing",
     "sentry.tasks.reprocessing2",
+    "sentry.tasks.rule_status",
     "sentry.tasks.scheduler",
     "sentry.tasks.sentry_apps",
     "sentry.tasks.servicehooks",
@@ -662,6 +663,17 @@ for queue in CELERY_QUEUES:
 
 CELERY_ROUTES = ("sentry.queue.routers.SplitQueueRouter",)
 
+# Serializers to use instead of CELERY_TASK_SERIALIZER for the tasks sent to a
+# queue, e.g. {"events.save_event": "sentry-msgpack-zstd", "counters": "sentry-msgpack"}.
+# Partitioned queues are configured by the name they are created with. Workers
+# must accept a serializer before producers start using it, see
+# sentry.queue.serializer.
+SENTRY_CELERY_QUEUE_SERIALIZERS = {}
+
+# Messages sent with the sentry-msgpack-zstd serializer are compressed when
+# larger than this many bytes.
+SENTRY_CELERY_COMPRESSION_THRESHOLD = 4096
+
 
 def create_partitioned_queues(name):
     exchange = Exchange(name, type="direct")
@@ -702,6 +714,11 @@ CELERYBEAT_SCHEDULE = {
         "schedule": timedelta(seconds=10),
         "options": {"expires": 10, "queue": "buffers.process_pending"},
     },
+    "persist-rule-statuses": {
+        "task": "sentry.tasks.rule_status.persist_rule_statuses",
+        "schedule": timedelta(seconds=10),
+        "options": {"expires": 10, "queue": "buffers.process_pending"},
+    },
     "sync-options": {
         "task": "sentry.tasks.options.sync_options",
         "schedule": timedelta(seconds=10),
@@ -1351,6 +1368,9 @@ SENTRY_DIGESTS_OPTIONS = {}
 SENTRY_QUOTAS = "sentry.quotas.Quota"
 SENTRY_QUOTA_OPTIONS = {}
 
+# Number of compiled PII configs each process keeps in memory for server-side data scrubbing
+SENTRY_DATASCRUBBING_LOCAL_CACHE_SIZE = 1000
+
 # Cache for Relay project configs
 SENTRY_RELAY_PROJECTCONFIG_CACHE = "sentry.relay.projectconfig_cache.base.ProjectConfigCache"
 SENTRY_RELAY_PROJECTCONFIG_CACHE_OPTIONS = {}
@@ -1430,6 +1450,8 @@ SENTRY_METRICS_SKIP_INTERNAL_PREFIXES = []  # Order this by most frequent prefix
 SENTRY_METRICS_INDEXER = "sentry.sentry_metrics.indexer.postgres.PGStringIndexer"
 SENTRY_METRICS_INDEXER_OPTIONS = {}
 SENTRY_METRICS_INDEXER_CACHE_TTL = 3600 * 2
+# Number of strings each process keeps in memory in front of the indexer cache
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE = 100000
 
 # Release Health
 SENTRY_RELEASE_HEALTH = "sentry.release_health.sessions.SessionsReleaseHealthBackend"
@@ -1650,10 +1672,28 @@ SENTRY_ROLES = (
     },
 )
 
+# The implementation used by ``sentry.utils.json`` to encode and decode JSON,
+# one of "simplejson" or "rapidjson" (see ``sentry.utils.json.backends``).
+SENTRY_JSON_BACKEND = "simplejson"
+
+# Number of threads shared by API serializers to fetch attributes from
+# external services concurrently (see ``Serializer.get_attrs_providers``).
+# Set to 0 to fetch them inline.
+SENTRY_SERIALIZER_ATTRS_PROVIDER_WORKERS = 10
+
 # See sentry/options/__init__.py for more information
 SENTRY_OPTIONS = {}
 SENTRY_DEFAULT_OPTIONS = {}
 
+# Load all registered options in bulk during startup rather than one by one
+# on first use.
+SENTRY_OPTIONS_PREFETCH = False
+
+# If set, reload all registered options in a background thread every this
+# many seconds. Keep this below the options' local cache TTL (10 seconds by
+# default) so that option reads are always served from memory.
+SENTRY_OPTIONS_REFRESH_INTERVAL = None
+
 # You should not change this setting after your database has been created
 # unless you have altered all schemas first
 SENTRY_USE_BIG_INTS = False
@@ -1965,6 +2005,13 @@ SENTRY_SELF_HOSTED = True
 # when checking REMOTE_ADDR ip addresses
 SENTRY_USE_X_FORWARDED_FOR = True
 
+# Import plugins and integrations the first time they are used rather than
+# when Sentry starts. This defers their import-time side effects, such as
+# connecting signal receivers, so only enable it if no installed plugin relies
+# on those. The worker and cron processes always load plugins up front, as
+# plugins can contribute Celery queues, imports and schedules.
+SENTRY_LAZY_PLUGINS = False
+
 SENTRY_DEFAULT_INTEGRATIONS = (
     "sentry.integrations.bitbucket.BitbucketIntegrationProvider",
     "sentry.integrations.bitbucket_server.BitbucketServerIntegrationProvider",
@@ -2396,6 +2443,10 @@ SENTRY_SYNTHETIC_MONITORING_PROJECT_ID = None
 SENTRY_SIMILARITY_INDEX_REDIS_CLUSTER = "default"
 # Similarity-v2: uses grouping components for diffing (None = fallback to setting for v1)
 SENTRY_SIMILARITY2_INDEX_REDIS_CLUSTER = None
+# Build similarity signatures hashing every feature only once. These signatures
+# aren't compatible with the default ones, so they are indexed under new
+# namespaces that start out empty.
+SENTRY_SIMILARITY_SLICED_HASHING = False
 
 # The grouping strategy to use for driving similarity-v2. You can add multiple
 # strategies here to index them all. This is useful for transitioning a
@@ -2480,6 +2531,10 @@ SENTRY_REALTIME_METRICS_OPTIONS = {
     # This backoff is only applied to automatic changes to project eligibility, and has zero effect
     # on any manually-triggered changes to a project's presence in the LPQ.
     "backoff_timer": 5 * 60,
+    # Number of seconds that each worker buffers metrics for before writing them to redis.
+    #
+    # Buffered metrics are written in a single pipeline, 0 writes every metric right away.
+    "flush_interval": 1,
 }
 
 # XXX(meredith): Temporary metrics indexer
@@ -2491,6 +2546,31 @@ SENTRY_METRICS_INDEXER_REDIS_CLUSTER = "default"
 # Value is in milliseconds. Set to `None` to disable.
 SENTRY_PROJECT_COUNTER_STATEMENT_TIMEOUT = 1000
 
+# Maximum number of projects each process keeps a block of short IDs for, see
+# the store.projectcounter-block-size option.
+SENTRY_PROJECT_COUNTER_LOCAL_BLOCKS = 10000
+
+# Cache of the group each hash of a project is associated with, used to save
+# events of existing groups without querying GroupHash and Group rows. Entries
+# are kept in Redis and locally, and each process reads the version of a
+# project's entries at most every SENTRY_GROUPHASH_CACHE_LOCAL_TTL seconds.
+SENTRY_GROUPHASH_CACHE_ENABLED = True
+SENTRY_GROUPHASH_CACHE_REDIS_CLUSTER = "default"
+SENTRY_GROUPHASH_CACHE_TTL = 60 * 60
+SENTRY_GROUPHASH_CACHE_LOCAL_TTL = 1
+SENTRY_GROUPHASH_CACHE_LOCAL_SIZE = 10000
+
+# Keep the state of rules that rate-limits their actions per group in Redis,
+# and write it to GroupRuleStatus rows in batches, see sentry.rules.status.
+SENTRY_RULE_STATUS_REDIS_ENABLED = False
+SENTRY_RULE_STATUS_REDIS_CLUSTER = "default"
+SENTRY_RULE_STATUS_TTL = 60 * 60 * 24 * 7
+
+# Seconds for which the owners of a group aren't evaluated again in post
+# processing, unless the ownership rules or CODEOWNERS of its project change.
+# Other events of the group in the meantime don't affect its owners.
+SENTRY_OWNER_EVALUATION_DEBOUNCE = 60
+
 # Implemented in getsentry to run additional devserver workers.
 SENTRY_EXTRA_WORKERS = None
 
@@ -2518,6 +2598,10 @@ INJECTED_SCRIPT_ASSETS = []
 # Sentry post process forwarder use batching consumer
 SENTRY_POST_PROCESS_FORWARDER_BATCHING = True
 
+# Sentry post process forwarder forwards every partition independently with
+# its own window of messages in flight, takes precedence over batching
+SENTRY_POST_PROCESS_FORWARDER_PARTITIONED = False
+
 # Whether badly behaving projects will be automatically
 # sent to the low priority queue
 SENTRY_ENABLE_AUTO_LOW_PRIORITY_QUEUE = False
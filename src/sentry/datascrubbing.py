@@ -1,11 +1,34 @@
 import copy
+import random
+import threading
 
 import sentry_relay
+from django.conf import settings
 from rest_framework import serializers
 
+from sentry import options
 from sentry.utils import json, metrics
+from sentry.utils.cache import LRUCache
+from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import safe_execute
 
+# Organization and project options the PII configs of a project are derived from.
+PII_CONFIG_OPTIONS = (
+    "sentry:relay_pii_config",
+    "sentry:safe_fields",
+    "sentry:sensitive_fields",
+    "sentry:scrub_data",
+    "sentry:require_scrub_data",
+    "sentry:scrub_ip_address",
+    "sentry:require_scrub_ip_address",
+    "sentry:scrub_defaults",
+    "sentry:require_scrub_defaults",
+)
+
+# (project id, options epoch) -> [(PII config, [(metric, value)])]
+_compiled_pii_configs = LRUCache(settings.SENTRY_DATASCRUBBING_LOCAL_CACHE_SIZE)
+_compiled_pii_configs_lock = threading.Lock()
+
 
 def _escape_key(key):
     """
@@ -80,18 +103,58 @@ def get_all_pii_configs(project):
     yield sentry_relay.convert_datascrubbing_config(get_datascrubbing_settings(project))
 
 
+def get_pii_configs_epoch(project):
+    """
+    Returns a version of the options the PII configs of the project are
+    derived from, which changes whenever one of them changes.
+    """
+    org = project.organization
+    return hash_values(
+        [project.id]
+        + [org.get_option(key) for key in PII_CONFIG_OPTIONS]
+        + [project.get_option(key) for key in PII_CONFIG_OPTIONS]
+    )
+
+
+def _get_config_metrics(config):
+    applications = config.get("applications") or {}
+    rv = [("datascrubbing.config.num_applications", len(applications))]
+    total_rules = 0
+    for selector, rules in applications.items():
+        rv.append(("datascrubbing.config.selectors.size", len(selector)))
+        rv.append(("datascrubbing.config.rules_per_selector.size", len(rules)))
+        total_rules += len(rules)
+    rv.append(("datascrubbing.config.rules.size", total_rules))
+    return rv
+
+
+def get_compiled_pii_configs(project):
+    """
+    Returns the PII configs of the project along with the metrics describing
+    their size. Merging and converting the configs is costly, so the result is
+    kept in a process local LRU cache keyed by the options epoch.
+    """
+    key = (project.id, get_pii_configs_epoch(project))
+    with _compiled_pii_configs_lock:
+        rv = _compiled_pii_configs.get(key)
+    if rv is not None:
+        metrics.incr("datascrubbing.config.local_cache.hit")
+        return rv
+
+    metrics.incr("datascrubbing.config.local_cache.miss")
+    rv = [(config, _get_config_metrics(config)) for config in get_all_pii_configs(project)]
+    with _compiled_pii_configs_lock:
+        _compiled_pii_configs.set(key, rv)
+    return rv
+
+
 def scrub_data(project, event):
-    for config in get_all_pii_configs(project):
-        metrics.timing(
-            "datascrubbing.config.num_applications", len(config.get("applications") or ())
-        )
-        total_rules = 0
-        for selector, rules in (config.get("applications") or {}).items():
-            metrics.timing("datascrubbing.config.selectors.size", len(selector))
-            metrics.timing("datascrubbing.config.rules_per_selector.size", len(rules))
-            total_rules += len(rules)
+    record_metrics = random.random() < options.get("datascrubbing.config-metrics.sample-rate")
 
-        metrics.timing("datascrubbing.config.rules.size", total_rules)
+    for config, config_metrics in get_compiled_pii_configs(project):
+        if record_metrics:
+            for key, value in config_metrics:
+                metrics.timing(key, value)
 
         event = sentry_relay.pii_strip_event(config, event)
 
@@ -126,8 +126,12 @@ class GroupDeletionTask(ModelDeletionTask):
         return super().delete_instance(instance)
 
     def mark_deletion_in_progress(self, instance_list):
+        from sentry.grouping.grouphash_cache import grouphash_cache
         from sentry.models import Group, GroupStatus
 
         Group.objects.filter(id__in=[i.id for i in instance_list]).exclude(
             status=GroupStatus.DELETION_IN_PROGRESS
         ).update(status=GroupStatus.DELETION_IN_PROGRESS)
+
+        # Events must not be associated with the groups anymore
+        grouphash_cache.invalidate({i.project_id for i in instance_list})
@@ -4,7 +4,6 @@ import logging
 import random
 import time
 from datetime import datetime, timedelta
-from io import BytesIO
 
 import sentry_sdk
 from django.conf import settings
@@ -45,6 +44,7 @@ from sentry.grouping.api import (
     get_grouping_config_dict_for_project,
     load_grouping_config,
 )
+from sentry.grouping.grouphash_cache import grouphash_cache
 from sentry.grouping.result import CalculatedHashes
 from sentry.ingest.inbound_filters import FilterStatKeys
 from sentry.killswitches import killswitch_matches_context
@@ -1004,6 +1004,22 @@ def get_culprit(data):
 def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwargs):
     project = event.project
 
+    # Events of existing groups are saved without looking up their hashes in
+    # the database. Hierarchical hashes are always looked up, as any of them
+    # may have been split.
+    cache_version = None
+    if settings.SENTRY_GROUPHASH_CACHE_ENABLED and not hashes.hierarchical_hashes:
+        cache_version, group = _get_cached_group(project, hashes.hashes)
+        metrics.incr(
+            "event_manager.grouphash_cache", tags={"outcome": "miss" if group is None else "hit"}
+        )
+        if group is not None:
+            kwargs["data"] = _get_group_data(event, metadata, received_timestamp)
+            is_regression = _process_existing_aggregate(
+                group=group, event=event, data=kwargs, release=release
+            )
+            return group, False, is_regression
+
     flat_grouphashes = [
         GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
     ]
@@ -1034,17 +1050,7 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
     else:
         root_hierarchical_grouphash = None
 
-    # In principle the group gets the same metadata as the event, so common
-    # attributes can be defined in eventtypes.
-    #
-    # Additionally the `last_received` key is set for group metadata, later in
-    # _save_aggregate
-    kwargs["data"] = materialize_metadata(
-        event.data,
-        get_event_type(event.data),
-        metadata,
-    )
-    kwargs["data"]["last_received"] = received_timestamp
+    kwargs["data"] = _get_group_data(event, metadata, received_timestamp)
 
     if existing_grouphash is None:
 
@@ -1173,6 +1179,13 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
             state=GroupHash.State.LOCKED_IN_MIGRATION
         ).update(group=group)
 
+        for h in new_hashes:
+            if h.state != GroupHash.State.LOCKED_IN_MIGRATION:
+                h.group_id = group.id
+
+    if cache_version is not None:
+        grouphash_cache.set_many(project.id, cache_version, flat_grouphashes)
+
     is_regression = _process_existing_aggregate(
         group=group, event=event, data=kwargs, release=release
     )
@@ -1180,6 +1193,42 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
     return group, is_new, is_regression
 
 
+def _get_group_data(event, metadata, received_timestamp):
+    # In principle the group gets the same metadata as the event, so common
+    # attributes can be defined in eventtypes.
+    #
+    # Additionally the `last_received` key is set for group metadata, later in
+    # _save_aggregate
+    data = materialize_metadata(
+        event.data,
+        get_event_type(event.data),
+        metadata,
+    )
+    data["last_received"] = received_timestamp
+    return data
+
+
+def _get_cached_group(project, hashes):
+    """
+    Returns the version of the project's cached grouphashes, and the group the
+    first of the given hashes is associated with if all of them are cached.
+    The group is looked up the same way ``_find_existing_grouphash`` would:
+    only hashes associated with a group and without a tombstone are cached.
+    The group itself is always read from the database, as bulk updates to
+    its status don't invalidate the model cache and regressions depend on it.
+    """
+    version, cached_grouphashes = grouphash_cache.get_many(project.id, hashes)
+    if not hashes or any(hash not in cached_grouphashes for hash in hashes):
+        return version, None
+
+    try:
+        group = Group.objects.get(id=cached_grouphashes[hashes[0]].group_id)
+    except Group.DoesNotExist:
+        return version, None
+
+    return version, group
+
+
 def _find_existing_grouphash(
     project,
     flat_grouphashes,
@@ -1558,7 +1607,8 @@ def save_attachment(
     Persists a cached event attachments into the file store.
 
     Emits one outcome, either ACCEPTED on success or INVALID(missing_chunks) if
-    retrieving the attachment data fails.
+    retrieving the attachment data fails. Any other error is raised once the
+    partially written file is deleted.
 
     :param cache_key:  The cache key at which the attachment is stored for
                        debugging purposes.
@@ -1579,9 +1629,18 @@ def save_attachment(
     else:
         timestamp = datetime.utcnow().replace(tzinfo=UTC)
 
+    file = File.objects.create(
+        name=attachment.name,
+        type=attachment.type,
+        headers={"Content-Type": attachment.content_type},
+    )
+
+    # The data is streamed from the cache into the blobs of the file, rather
+    # than loaded into memory at once.
     try:
-        data = attachment.data
+        file.putchunks(attachment.iter_data(), blob_size=settings.SENTRY_ATTACHMENT_BLOB_SIZE)
     except MissingAttachmentChunks:
+        file.delete()
         track_outcome(
             org_id=project.organization_id,
             project_id=project.id,
@@ -1595,13 +1654,10 @@ def save_attachment(
 
         logger.exception("Missing chunks for cache_key=%s", cache_key)
         return
-
-    file = File.objects.create(
-        name=attachment.name,
-        type=attachment.type,
-        headers={"Content-Type": attachment.content_type},
-    )
-    file.putfile(BytesIO(data), blob_size=settings.SENTRY_ATTACHMENT_BLOB_SIZE)
+    except Exception:
+        # Don't leave a partially written file behind
+        file.delete()
+        raise
 
     EventAttachment.objects.create(
         event_id=event_id,
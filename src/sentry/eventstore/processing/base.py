@@ -1,5 +1,5 @@
 from datetime import timedelta
-from typing import Any, Optional
+from typing import Any, Mapping, Optional, Sequence
 
 import sentry_sdk
 
@@ -23,6 +23,11 @@ class EventProcessingStore:
 
     Separating processing store from the cache allows use of different
     implementations.
+
+    The ``*_many`` methods take a single round trip for many events, for
+    callers that handle events in batches. The tasks in ``sentry.tasks.store``
+    handle one event each, so they only benefit from ``delete_by_key``
+    removing an event and its unprocessed copy at once.
     """
 
     def __init__(self, inner: KVStorage[str, Event]):
@@ -40,16 +45,39 @@ class EventProcessingStore:
             self.inner.set(key, event, self.timeout)
             return key
 
+    def store_many(self, events: Sequence[Event], unprocessed: bool = False) -> Sequence[str]:
+        """
+        Stores the events at once, and returns their keys in the same order.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.store_many"):
+            keys = [cache_key_for_event(event) for event in events]
+            if unprocessed:
+                keys = [self.__get_unprocessed_key(key) for key in keys]
+            self.inner.set_many(list(zip(keys, events)), self.timeout)
+            return keys
+
     def get(self, key: str, unprocessed: bool = False) -> Optional[Event]:
         with sentry_sdk.start_span(op="eventstore.processing.get"):
             if unprocessed:
                 key = self.__get_unprocessed_key(key)
             return self.inner.get(key)
 
+    def get_many(self, keys: Sequence[str]) -> Mapping[str, Event]:
+        """
+        Returns the events that are present at the given keys, by key.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.get_many"):
+            return dict(self.inner.get_many(keys))
+
     def delete_by_key(self, key: str) -> None:
         with sentry_sdk.start_span(op="eventstore.processing.delete_by_key"):
-            self.inner.delete(key)
-            self.inner.delete(self.__get_unprocessed_key(key))
+            self.inner.delete_many([key, self.__get_unprocessed_key(key)])
+
+    def delete_many_by_key(self, keys: Sequence[str]) -> None:
+        with sentry_sdk.start_span(op="eventstore.processing.delete_many_by_key"):
+            self.inner.delete_many(
+                [k for key in keys for k in (key, self.__get_unprocessed_key(key))]
+            )
 
     def delete(self, event: Event) -> None:
         key = cache_key_for_event(event)
@@ -8,6 +8,7 @@ from django.utils.functional import cached_property
 
 from sentry import options
 from sentry.eventstream.kafka.consumer import SynchronizedConsumer
+from sentry.eventstream.kafka.partitionedforwarder import PartitionedPostProcessForwarder
 from sentry.eventstream.kafka.postprocessworker import (
     _CONCURRENCY_OPTION,
     ErrorsPostProcessForwarderWorker,
@@ -15,6 +16,8 @@ from sentry.eventstream.kafka.postprocessworker import (
     PostProcessForwarderWorker,
     TransactionsPostProcessForwarderWorker,
     _sampled_eventstream_timer,
+    is_errors_message,
+    is_transactions_message,
 )
 from sentry.eventstream.kafka.protocol import (
     get_task_kwargs_for_message,
@@ -221,6 +224,73 @@ class KafkaEventStream(SnubaProtocolEventStream):
 
         consumer.run()
 
+    def _build_partitioned_consumer(
+        self,
+        entity,
+        consumer_group,
+        commit_log_topic,
+        synchronize_commit_group,
+        commit_batch_size=100,
+        commit_batch_timeout_ms=5000,
+        initial_offset_reset="latest",
+    ):
+        cluster_name = settings.KAFKA_TOPICS[settings.KAFKA_EVENTS]["cluster"]
+
+        synchronized_consumer = SynchronizedConsumer(
+            cluster_name=cluster_name,
+            consumer_group=consumer_group,
+            commit_log_topic=commit_log_topic,
+            synchronize_commit_group=synchronize_commit_group,
+            initial_offset_reset=initial_offset_reset,
+        )
+
+        logger.info(f"Starting partitioned post process forwarder to consume {entity} messages")
+        if entity == PostProcessForwarderType.TRANSACTIONS:
+            message_filter = is_transactions_message
+        elif entity == PostProcessForwarderType.ERRORS:
+            message_filter = is_errors_message
+        else:
+            message_filter = None
+
+        return PartitionedPostProcessForwarder(
+            topics=[self.topic],
+            consumer=synchronized_consumer,
+            message_filter=message_filter,
+            window_size=options.get("post-process-forwarder:partition-window"),
+            concurrency=options.get(_CONCURRENCY_OPTION),
+            max_retries=options.get("post-process-forwarder:max-retries"),
+            commit_batch_size=commit_batch_size,
+            commit_batch_timeout_ms=commit_batch_timeout_ms,
+        )
+
+    def run_partitioned_consumer(
+        self,
+        entity,
+        consumer_group,
+        commit_log_topic,
+        synchronize_commit_group,
+        commit_batch_size=100,
+        commit_batch_timeout_ms=5000,
+        initial_offset_reset="latest",
+    ):
+        consumer = self._build_partitioned_consumer(
+            entity,
+            consumer_group,
+            commit_log_topic,
+            synchronize_commit_group,
+            commit_batch_size,
+            commit_batch_timeout_ms,
+            initial_offset_reset,
+        )
+
+        def handler(signum, frame):
+            consumer.signal_shutdown()
+
+        signal.signal(signal.SIGINT, handler)
+        signal.signal(signal.SIGTERM, handler)
+
+        consumer.run()
+
     def run_streaming_consumer(
         self,
         consumer_group,
@@ -428,7 +498,18 @@ class KafkaEventStream(SnubaProtocolEventStream):
     ):
         logger.debug("Starting post-process forwarder...")
 
-        if settings.SENTRY_POST_PROCESS_FORWARDER_BATCHING:
+        if settings.SENTRY_POST_PROCESS_FORWARDER_PARTITIONED:
+            logger.info("Starting partitioned consumer")
+            self.run_partitioned_consumer(
+                entity,
+                consumer_group,
+                commit_log_topic,
+                synchronize_commit_group,
+                commit_batch_size,
+                commit_batch_timeout_ms,
+                initial_offset_reset,
+            )
+        elif settings.SENTRY_POST_PROCESS_FORWARDER_BATCHING:
             logger.info("Starting batching consumer")
             self.run_batched_consumer(
                 entity,
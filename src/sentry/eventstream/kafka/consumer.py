@@ -184,6 +184,11 @@ class SynchronizedConsumer(KafkaConsumerFacade):
 
         self.__positions = {}
 
+        # Partitions paused by the caller stay paused regardless of the state
+        # of the commit log until they are resumed by the caller.
+        self.__paused = set()
+        self.__paused_lock = threading.Lock()
+
         def commit_callback(error, partitions):
             if on_commit is not None:
                 return on_commit(error, partitions)
@@ -256,16 +261,20 @@ class SynchronizedConsumer(KafkaConsumerFacade):
         # TODO: This will be called from the commit log consumer thread, so need
         # to verify that calling the ``consumer.{pause,resume}`` methods is
         # thread safe!
-        if current_state in (
-            SynchronizedPartitionState.UNKNOWN,
-            SynchronizedPartitionState.SYNCHRONIZED,
-            SynchronizedPartitionState.REMOTE_BEHIND,
-        ):
-            self.__consumer.pause([TopicPartition(topic, partition, current_offsets.local)])
-        elif current_state is SynchronizedPartitionState.LOCAL_BEHIND:
-            self.__consumer.resume([TopicPartition(topic, partition, current_offsets.local)])
-        else:
-            raise NotImplementedError(f"Unexpected partition state: {current_state}")
+        with self.__paused_lock:
+            if current_state in (
+                SynchronizedPartitionState.UNKNOWN,
+                SynchronizedPartitionState.SYNCHRONIZED,
+                SynchronizedPartitionState.REMOTE_BEHIND,
+            ):
+                self.__consumer.pause([TopicPartition(topic, partition, current_offsets.local)])
+            elif current_state is SynchronizedPartitionState.LOCAL_BEHIND:
+                if (topic, partition) not in self.__paused:
+                    self.__consumer.resume(
+                        [TopicPartition(topic, partition, current_offsets.local)]
+                    )
+            else:
+                raise NotImplementedError(f"Unexpected partition state: {current_state}")
 
     def subscribe(self, topics, on_assign=None, on_revoke=None):
         """
@@ -320,6 +329,8 @@ class SynchronizedConsumer(KafkaConsumerFacade):
             for item in assignment:
                 # TODO: This should probably also be removed from the state manager.
                 self.__positions.pop((item.topic, item.partition))
+                with self.__paused_lock:
+                    self.__paused.discard((item.topic, item.partition))
 
             if on_revoke is not None:
                 on_revoke(self, assignment)
@@ -348,6 +359,32 @@ class SynchronizedConsumer(KafkaConsumerFacade):
 
         return message
 
+    def pause(self, partitions):
+        """
+        Pause consumption from the given partitions until they are resumed,
+        even if the commit log allows consuming from them.
+        """
+        with self.__paused_lock:
+            self.__paused.update((i.topic, i.partition) for i in partitions)
+            self.__consumer.pause(partitions)
+
+    def resume(self, partitions):
+        """
+        Resume consumption from the given partitions. Partitions that are not
+        trailing the commit log stay paused until they are.
+        """
+        with self.__paused_lock:
+            resumable = []
+            for i in partitions:
+                self.__paused.discard((i.topic, i.partition))
+                state, offsets = self.__partition_state_manager.partitions.get(
+                    (i.topic, i.partition), (None, None)
+                )
+                if state is SynchronizedPartitionState.LOCAL_BEHIND:
+                    resumable.append(i)
+            if resumable:
+                self.__consumer.resume(resumable)
+
     def commit(self, *args, **kwargs):
         self.__check_commit_log_consumer_running()
 
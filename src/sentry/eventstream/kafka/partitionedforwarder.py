@@ -0,0 +1,301 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional, Sequence, Tuple
+
+from confluent_kafka import KafkaError, TopicPartition
+
+from sentry.eventstream.kafka.postprocessworker import (
+    Message,
+    _get_task_kwargs,
+    _record_metrics,
+    dispatch_post_process_group_task,
+)
+from sentry.utils import metrics
+from sentry.utils.batching_kafka_consumer import KafkaConsumerFacade
+
+logger = logging.getLogger(__name__)
+
+_RETRIES_METRIC = "eventstream.dispatch.retries"
+_PENDING_METRIC = "eventstream.partition.pending"
+
+
+def dispatch_with_retries(message: Message, max_retries: int, retry_backoff_ms: int) -> None:
+    """
+    Dispatches the post process task of a message, retrying up to
+    ``max_retries`` times with exponential backoff if the task could not be
+    published to the broker.
+    """
+    task_kwargs = _get_task_kwargs(message)
+    if not task_kwargs:
+        return
+
+    _record_metrics(message.partition(), task_kwargs)
+
+    retries = 0
+    while True:
+        try:
+            dispatch_post_process_group_task(**task_kwargs)
+            return
+        except Exception as error:
+            if retries >= max_retries:
+                raise
+            retries += 1
+            logger.warning(
+                "Could not dispatch post process task (%d/%d retries): %s",
+                retries,
+                max_retries,
+                error,
+            )
+            metrics.incr(_RETRIES_METRIC, tags={"partition": message.partition()})
+            time.sleep(retry_backoff_ms * 2 ** (retries - 1) / 1000.0)
+
+
+class PartitionState:
+    """
+    The messages of a partition that are being forwarded.
+
+    Up to ``window_size`` messages are in flight at once, in offset order.
+    Messages received while the window is full are held in the backlog.
+    """
+
+    def __init__(self, topic: str, partition: int, concurrency: int) -> None:
+        self.topic = topic
+        self.partition = partition
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix=f"post-process-forwarder-{partition}",
+        )
+        # (offset, future) pairs, the future is None for skipped messages
+        self.inflight: Deque[Tuple[int, Optional[Future]]] = deque()
+        self.backlog: Deque[Message] = deque()
+        # The offset up to which all messages were forwarded, and the offset
+        # that was last committed.
+        self.watermark: Optional[int] = None
+        self.committed: Optional[int] = None
+        self.paused = False
+
+    def advance(self) -> int:
+        """
+        Moves the watermark past the messages at the start of the window that
+        were forwarded, and returns how many there were. Raises the error of a
+        message that could not be forwarded.
+        """
+        completed = 0
+        while self.inflight:
+            offset, future = self.inflight[0]
+            if future is not None:
+                if not future.done():
+                    break
+                exc = future.exception()
+                if exc is not None:
+                    raise exc
+            self.inflight.popleft()
+            self.watermark = offset + 1
+            completed += 1
+        return completed
+
+    def wait(self) -> None:
+        """
+        Waits until all messages in flight were forwarded.
+        """
+        wait([future for offset, future in self.inflight if future is not None])
+        self.advance()
+
+
+class PartitionedPostProcessForwarder:
+    """
+    Forwards post process tasks from the events topic with an independent
+    in-flight window for each assigned partition.
+
+    Unlike the batching consumer, a slow or failing publish only holds back
+    the partition it belongs to: every partition submits its messages to its
+    own thread pool, and a partition is paused once ``window_size`` of its
+    messages are in flight, while the other partitions keep being consumed.
+
+    The committed offset of every partition is the offset of the lowest
+    message that has not been forwarded yet, so no message is skipped if the
+    forwarder stops, but messages may be forwarded again. Offsets are
+    committed every ``commit_batch_size`` forwarded messages and at least
+    every ``commit_batch_timeout_ms`` milliseconds.
+    """
+
+    # Same as ``BatchingKafkaConsumer.RECOVERABLE_ERRORS``
+    RECOVERABLE_ERRORS = frozenset([KafkaError._PARTITION_EOF, KafkaError._TRANSPORT])
+
+    def __init__(
+        self,
+        topics: Sequence[str],
+        consumer: KafkaConsumerFacade,
+        message_filter: Optional[Callable[[Message], bool]] = None,
+        window_size: int = 100,
+        concurrency: int = 1,
+        max_retries: int = 3,
+        retry_backoff_ms: int = 100,
+        commit_batch_size: int = 100,
+        commit_batch_timeout_ms: int = 5000,
+        poll_timeout: float = 0.1,
+    ) -> None:
+        assert isinstance(consumer, KafkaConsumerFacade)
+        self.consumer = consumer
+        self.message_filter = message_filter
+        self.window_size = window_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_backoff_ms = retry_backoff_ms
+        self.commit_batch_size = commit_batch_size
+        self.commit_batch_timeout_ms = commit_batch_timeout_ms
+        self.poll_timeout = poll_timeout
+
+        self.shutdown = False
+
+        self.__partitions: Dict[Tuple[str, int], PartitionState] = {}
+        self.__uncommitted = 0
+        self.__last_commit = time.time()
+
+        def on_partitions_assigned(consumer: Any, partitions: Sequence[TopicPartition]) -> None:
+            logger.info("New partitions assigned: %r", partitions)
+            for i in partitions:
+                key = (i.topic, i.partition)
+                if key not in self.__partitions:
+                    self.__partitions[key] = PartitionState(i.topic, i.partition, self.concurrency)
+
+        def on_partitions_revoked(consumer: Any, partitions: Sequence[TopicPartition]) -> None:
+            "Finish forwarding the messages in flight, and commit the revoked partitions."
+            logger.info("Partitions revoked: %r", partitions)
+            revoked = [
+                self.__partitions.pop((i.topic, i.partition))
+                for i in partitions
+                if (i.topic, i.partition) in self.__partitions
+            ]
+            for partition in revoked:
+                # The backlog is dropped, its messages are consumed again by
+                # the next owner of the partition.
+                partition.wait()
+                partition.executor.shutdown()
+            self._commit(revoked)
+
+        self.consumer.subscribe(
+            list(topics), on_assign=on_partitions_assigned, on_revoke=on_partitions_revoked
+        )
+
+    def run(self) -> None:
+        logger.debug("Starting")
+        while not self.shutdown:
+            self._run_once()
+
+        self._shutdown()
+
+    def signal_shutdown(self) -> None:
+        logger.debug("Shutdown signalled")
+        self.shutdown = True
+
+    def _run_once(self) -> None:
+        for partition in list(self.__partitions.values()):
+            self._advance(partition)
+
+        self._maybe_commit()
+
+        message = self.consumer.poll(timeout=self.poll_timeout)
+        if message is None:
+            return
+        if message.error():
+            if message.error().code() in self.RECOVERABLE_ERRORS:
+                return
+            else:
+                raise Exception(message.error())
+
+        self._handle_message(message)
+
+    def _handle_message(self, message: Message) -> None:
+        partition = self.__partitions.get((message.topic(), message.partition()))
+        if partition is None:
+            logger.warning(
+                "Skipping message for unowned partition: %r",
+                (message.topic(), message.partition()),
+            )
+            return
+
+        if partition.backlog or len(partition.inflight) >= self.window_size:
+            partition.backlog.append(message)
+            if not partition.paused:
+                self.consumer.pause([TopicPartition(partition.topic, partition.partition)])
+                partition.paused = True
+        else:
+            self._submit(partition, message)
+
+    def _submit(self, partition: PartitionState, message: Message) -> None:
+        if self.message_filter is None or self.message_filter(message):
+            future = partition.executor.submit(
+                dispatch_with_retries, message, self.max_retries, self.retry_backoff_ms
+            )
+        else:
+            future = None
+        partition.inflight.append((message.offset(), future))
+
+    def _advance(self, partition: PartitionState) -> None:
+        self.__uncommitted += partition.advance()
+
+        while partition.backlog and len(partition.inflight) < self.window_size:
+            self._submit(partition, partition.backlog.popleft())
+
+        if partition.paused and not partition.backlog:
+            self.consumer.resume([TopicPartition(partition.topic, partition.partition)])
+            partition.paused = False
+
+    def _maybe_commit(self) -> None:
+        commit_by_size = self.__uncommitted >= self.commit_batch_size
+        commit_by_time = time.time() > self.__last_commit + self.commit_batch_timeout_ms / 1000.0
+        if commit_by_size or commit_by_time:
+            self._commit(self.__partitions.values())
+
+    def _commit(self, partitions: Sequence[PartitionState]) -> None:
+        committable = [
+            partition
+            for partition in partitions
+            if partition.watermark is not None and partition.watermark != partition.committed
+        ]
+        for partition in partitions:
+            metrics.gauge(
+                _PENDING_METRIC,
+                len(partition.inflight) + len(partition.backlog),
+                tags={"partition": partition.partition},
+            )
+
+        if committable:
+            offsets = [
+                TopicPartition(partition.topic, partition.partition, partition.watermark)
+                for partition in committable
+            ]
+            logger.debug("Committing offsets: %r", offsets)
+            results = self.consumer.commit(offsets=offsets, asynchronous=False)
+
+            errors = [i for i in results if i.error is not None]
+            if errors:
+                raise Exception(
+                    "Failed to commit {}/{} partitions: {!r}".format(
+                        len(errors), len(offsets), errors
+                    )
+                )
+
+            for partition in committable:
+                partition.committed = partition.watermark
+
+        self.__uncommitted = 0
+        self.__last_commit = time.time()
+
+    def _shutdown(self) -> None:
+        logger.debug("Stopping")
+
+        # Messages in flight are already being published, wait for them so that
+        # they are not forwarded again by the next consumer.
+        partitions = list(self.__partitions.values())
+        for partition in partitions:
+            partition.wait()
+            partition.executor.shutdown()
+        self._commit(partitions)
+
+        logger.debug("Stopping consumer")
+        self.consumer.close()
+        logger.debug("Stopped")
@@ -1,9 +1,10 @@
 import logging
 import random
+from collections import defaultdict
 from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Generator, Mapping, Optional, Sequence
+from typing import Any, Generator, Iterator, List, Mapping, MutableMapping, Optional, Sequence
 
 from sentry import options
 from sentry.eventstream.kafka.protocol import (
@@ -11,7 +12,7 @@ from sentry.eventstream.kafka.protocol import (
     get_task_kwargs_for_message,
     get_task_kwargs_for_message_from_headers,
 )
-from sentry.tasks.post_process import post_process_group
+from sentry.tasks.post_process import post_process_group, post_process_group_batch
 from sentry.utils import metrics
 from sentry.utils.batching_kafka_consumer import AbstractBatchWorker
 from sentry.utils.cache import cache_key_for_event
@@ -23,6 +24,7 @@ _DURATION_METRIC = "eventstream.duration"
 _CONCURRENCY_METRIC = "eventstream.concurrency"
 _MESSAGES_METRIC = "eventstream.messages"
 _CONCURRENCY_OPTION = "post-process-forwarder:concurrency"
+_BATCH_SIZE_OPTION = "post-process-forwarder:task-batch-size"
 _TRANSACTION_FORWARDER_HEADER = "transaction_forwarder"
 
 
@@ -66,6 +68,26 @@ def _record_metrics(partition: int, task_kwargs: Mapping[str, Any]) -> None:
     )
 
 
+def is_errors_message(message: Message) -> bool:
+    headers = {header: value for header, value in message.headers()}
+
+    # Backwards-compatibility case for messages missing header.
+    if _TRANSACTION_FORWARDER_HEADER not in headers:
+        return True
+
+    return decode_bool(headers.get(_TRANSACTION_FORWARDER_HEADER)) is False
+
+
+def is_transactions_message(message: Message) -> bool:
+    headers = {header: value for header, value in message.headers()}
+
+    # Backwards-compatibility for messages missing headers.
+    if _TRANSACTION_FORWARDER_HEADER not in headers:
+        return False
+
+    return decode_bool(headers.get(_TRANSACTION_FORWARDER_HEADER)) is True
+
+
 def dispatch_post_process_group_task(
     event_id: str,
     project_id: int,
@@ -100,6 +122,51 @@ def _get_task_kwargs_and_dispatch(message: Message):
     dispatch_post_process_group_task(**task_kwargs)
 
 
+def _get_task_kwargs_and_record(message: Message) -> Optional[Mapping[str, Any]]:
+    task_kwargs = _get_task_kwargs(message)
+    if not task_kwargs:
+        return None
+
+    _record_metrics(message.partition(), task_kwargs)
+    return task_kwargs
+
+
+def get_post_process_group_batches(
+    task_kwargs_list: Sequence[Mapping[str, Any]], batch_size: int
+) -> Iterator[List[Mapping[str, Any]]]:
+    """
+    Splits the task kwargs of messages into the events of
+    ``post_process_group_batch`` tasks, with up to ``batch_size`` events of
+    the same project each.
+    """
+    events_by_project: MutableMapping[int, List[Mapping[str, Any]]] = defaultdict(list)
+    for task_kwargs in task_kwargs_list:
+        if task_kwargs.get("skip_consume"):
+            logger.info("post_process.skip.raw_event", extra={"event_id": task_kwargs["event_id"]})
+            continue
+
+        events_by_project[task_kwargs["project_id"]].append(
+            {
+                "is_new": task_kwargs["is_new"],
+                "is_regression": task_kwargs["is_regression"],
+                "is_new_group_environment": task_kwargs["is_new_group_environment"],
+                "primary_hash": task_kwargs["primary_hash"],
+                "cache_key": cache_key_for_event(
+                    {"project": task_kwargs["project_id"], "event_id": task_kwargs["event_id"]}
+                ),
+                "group_id": task_kwargs["group_id"],
+            }
+        )
+
+    for events in events_by_project.values():
+        for i in range(0, len(events), batch_size):
+            yield events[i : i + batch_size]
+
+
+def _dispatch_post_process_group_batch_task(events: Sequence[Mapping[str, Any]]) -> None:
+    post_process_group_batch.delay(events=events)
+
+
 class PostProcessForwarderWorker(AbstractBatchWorker):
     """
     Implementation of the AbstractBatchWorker which would be used for post process forwarder.
@@ -114,13 +181,18 @@ class PostProcessForwarderWorker(AbstractBatchWorker):
         logger.info(f"Starting post process forwarder with {concurrency} threads")
         metrics.incr(_CONCURRENCY_METRIC, amount=concurrency)
         self.__executor = ThreadPoolExecutor(max_workers=self.__current_concurrency)
+        self.__batch_size = options.get(_BATCH_SIZE_OPTION)
 
     def process_message(self, message: Message) -> Optional[Future]:
         """
         Process the message received by the consumer and return the Future associated with the message. The future
         is stored in the batch of batching_kafka_consumer and provided as an argument to flush_batch. If None is
         returned, the batching_kafka_consumer will not add the return value to the batch.
+
+        If tasks are batched, the future only decodes the message, and its task is dispatched in flush_batch.
         """
+        if self.__batch_size > 1:
+            return self.__executor.submit(_get_task_kwargs_and_record, message)
         return self.__executor.submit(_get_task_kwargs_and_dispatch, message)
 
     def flush_batch(self, batch: Optional[Sequence[Future]]) -> None:
@@ -135,6 +207,12 @@ class PostProcessForwarderWorker(AbstractBatchWorker):
                 if exc is not None:
                     raise exc
 
+            # The tasks of messages that were only decoded are dispatched in batches, in the order
+            # of the messages.
+            task_kwargs_list = [future.result() for future in batch if future.result() is not None]
+            if task_kwargs_list:
+                self.__dispatch_batches(task_kwargs_list)
+
         # Check if the concurrency settings have changed. If yes, then shutdown the existing executor
         # and create a new one with the new settings
         new_concurrency = options.get(_CONCURRENCY_OPTION)
@@ -147,6 +225,18 @@ class PostProcessForwarderWorker(AbstractBatchWorker):
             self.__executor = ThreadPoolExecutor(max_workers=new_concurrency)
             self.__current_concurrency = new_concurrency
 
+        self.__batch_size = options.get(_BATCH_SIZE_OPTION)
+
+    def __dispatch_batches(self, task_kwargs_list: Sequence[Mapping[str, Any]]) -> None:
+        futures = [
+            self.__executor.submit(_dispatch_post_process_group_batch_task, events)
+            for events in get_post_process_group_batches(task_kwargs_list, self.__batch_size)
+        ]
+        for future in as_completed(futures):
+            exc = future.exception()
+            if exc is not None:
+                raise exc
+
     def shutdown(self) -> None:
         self.__executor.shutdown()
 
@@ -161,13 +251,7 @@ class ErrorsPostProcessForwarderWorker(PostProcessForwarderWorker):
     """
 
     def process_message(self, message: Message) -> Optional[Future]:
-        headers = {header: value for header, value in message.headers()}
-
-        # Backwards-compatibility case for messages missing header.
-        if _TRANSACTION_FORWARDER_HEADER not in headers:
-            return super().process_message(message)
-
-        if decode_bool(headers.get(_TRANSACTION_FORWARDER_HEADER)) is False:
+        if is_errors_message(message):
             return super().process_message(message)
 
         return None
@@ -180,13 +264,7 @@ class TransactionsPostProcessForwarderWorker(PostProcessForwarderWorker):
     """
 
     def process_message(self, message: Message) -> Optional[Future]:
-        headers = {header: value for header, value in message.headers()}
-
-        # Backwards-compatibility for messages missing headers.
-        if _TRANSACTION_FORWARDER_HEADER not in headers:
-            return None
-
-        if decode_bool(headers.get(_TRANSACTION_FORWARDER_HEADER)) is True:
+        if is_transactions_message(message):
             return super().process_message(message)
 
         return None
@@ -45,6 +45,7 @@ from .manager import *  # NOQA
 #         `requires_snuba` tuple.
 
 default_manager = FeatureManager()  # NOQA
+default_manager.connect_signals()
 
 # Unscoped features
 default_manager.add("auth:register")
@@ -208,3 +209,5 @@ all = default_manager.all
 add_handler = default_manager.add_handler
 add_entity_handler = default_manager.add_entity_handler
 has_for_batch = default_manager.has_for_batch
+prefetch = default_manager.prefetch
+memoized = default_manager.memoized
@@ -58,5 +58,12 @@ class BatchFeatureHandler(FeatureHandler):
         return self._check_for_batch(feature.name, feature.get_organization(), actor)
 
     def has_for_batch(self, batch: "FeatureCheckBatch") -> Mapping["Project", bool]:
+        if batch.organization is None:
+            # A batch of organizations
+            return {
+                obj: self._check_for_batch(batch.feature_name, obj, batch.actor)
+                for obj in batch.objects
+            }
+
         flag = self._check_for_batch(batch.feature_name, batch.organization, batch.actor)
         return {obj: flag for obj in batch.objects}
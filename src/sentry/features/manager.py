@@ -1,24 +1,31 @@
 __all__ = ["FeatureManager"]
 
 import abc
+import threading
 from collections import defaultdict
+from contextlib import contextmanager
 from typing import (
     TYPE_CHECKING,
     Any,
+    Hashable,
     Iterable,
+    Iterator,
     List,
     Mapping,
     MutableMapping,
     MutableSet,
     Optional,
     Sequence,
+    Set,
+    Tuple,
     Type,
+    Union,
 )
 
 import sentry_sdk
 from django.conf import settings
 
-from .base import Feature
+from .base import Feature, OrganizationFeature, ProjectFeature
 from .exceptions import FeatureNotRegistered
 
 if TYPE_CHECKING:
@@ -55,6 +62,46 @@ class RegisteredFeatureManager:
                 return rv
         return None
 
+    def _get_handlers_for_batch(
+        self,
+        name: str,
+        organization: Optional["Organization"],
+        objects: Iterable[Any],
+        actor: Optional["User"],
+    ) -> Tuple[MutableMapping[Any, bool], Set[Any]]:
+        """
+        Run the registered handlers for ``name`` over a batch of objects.
+
+        Returns the flags that were determined by a handler, and the set of
+        objects that no handler had an answer for.
+        """
+        result = dict()
+        remaining = set(objects)
+
+        handlers = self._handler_registry[name]
+        for handler in handlers:
+            if not remaining:
+                break
+
+            with sentry_sdk.start_span(
+                op="feature.has_for_batch.handler",
+                description=f"{type(handler).__name__} ({name})",
+            ) as span:
+                batch_size = len(remaining)
+                span.set_data("Batch Size", batch_size)
+                span.set_data("Feature Name", name)
+                span.set_data("Handler Type", type(handler).__name__)
+
+                batch = FeatureCheckBatch(self, name, organization, remaining, actor)
+                handler_result = handler.has_for_batch(batch)
+                for (obj, flag) in handler_result.items():
+                    if flag is not None:
+                        remaining.remove(obj)
+                        result[obj] = flag
+                span.set_data("Flags Found", batch_size - len(remaining))
+
+        return result, remaining
+
     @abc.abstractmethod
     def _get_feature_class(self, name: str) -> Type[Feature]:
         """
@@ -93,30 +140,7 @@ class RegisteredFeatureManager:
         >>> FeatureManager.has_for_batch('projects:feature', organization, [project1, project2], actor=request.user)
         """
 
-        result = dict()
-        remaining = set(objects)
-
-        handlers = self._handler_registry[name]
-        for handler in handlers:
-            if not remaining:
-                break
-
-            with sentry_sdk.start_span(
-                op="feature.has_for_batch.handler",
-                description=f"{type(handler).__name__} ({name})",
-            ) as span:
-                batch_size = len(remaining)
-                span.set_data("Batch Size", batch_size)
-                span.set_data("Feature Name", name)
-                span.set_data("Handler Type", type(handler).__name__)
-
-                batch = FeatureCheckBatch(self, name, organization, remaining, actor)
-                handler_result = handler.has_for_batch(batch)
-                for (obj, flag) in handler_result.items():
-                    if flag is not None:
-                        remaining.remove(obj)
-                        result[obj] = flag
-                span.set_data("Flags Found", batch_size - len(remaining))
+        result, remaining = self._get_handlers_for_batch(name, organization, objects, actor)
 
         default_flag = settings.SENTRY_FEATURES.get(name, False)
         for obj in remaining:
@@ -132,6 +156,7 @@ class FeatureManager(RegisteredFeatureManager):
         self._feature_registry: MutableMapping[str, Type[Feature]] = {}
         self.entity_features: MutableSet[str] = set()
         self._entity_handler: Optional["FeatureHandler"] = None
+        self._memo = threading.local()
 
     def all(self, feature_type: Type[Feature] = Feature) -> Mapping[str, Type[Feature]]:
         """
@@ -204,10 +229,38 @@ class FeatureManager(RegisteredFeatureManager):
         Depending on the Feature class, additional arguments may need to be
         provided to assign organization or project context to the feature.
 
+        Within a request or task, results are memoized per feature, entity and
+        actor (see ``enable_memoization``).
+
         >>> FeatureManager.has('organizations:feature', organization, actor=request.user)
 
         """
         actor = kwargs.pop("actor", None)
+
+        memo = self._get_memo()
+        if memo is None:
+            return self._has(name, args, kwargs, actor, skip_entity)
+
+        key = _make_memo_key(name, args, kwargs, actor, skip_entity)
+        try:
+            return memo[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Some argument is unhashable (e.g. an unsaved model instance)
+            return self._has(name, args, kwargs, actor, skip_entity)
+
+        rv = memo[key] = self._has(name, args, kwargs, actor, skip_entity)
+        return rv
+
+    def _has(
+        self,
+        name: str,
+        args: Sequence[Any],
+        kwargs: Mapping[str, Any],
+        actor: Optional["User"],
+        skip_entity: Optional[bool],
+    ) -> bool:
         feature = self.get(name, *args, **kwargs)
 
         # Check registered feature handlers
@@ -248,6 +301,185 @@ class FeatureManager(RegisteredFeatureManager):
         else:
             return None
 
+    def prefetch(
+        self,
+        feature_names: Sequence[str],
+        objects: Sequence[Union["Organization", "Project"]],
+        actor: Optional["User"] = None,
+        skip_entity: Optional[bool] = False,
+    ) -> None:
+        """
+        Evaluate features for many objects at once, filling the memo that
+        ``has`` reads from for the current request or task.
+
+        The objects are the entities that would be passed to ``has``
+        individually, i.e. projects for project features and organizations
+        for organization features. Registered handlers are run once per
+        feature through ``has_for_batch``, for the projects of each
+        organization or for all organizations at once. The entity handler is
+        then asked once per organization through ``batch_has`` about all the
+        features that no handler had an answer for, in the same order of
+        precedence as ``has``. Serializers declare the features they check
+        (see ``Serializer.feature_flags``) so that the per-item ``has`` calls
+        in ``serialize`` are memo hits.
+
+        Does nothing if memoization isn't enabled.
+
+        >>> FeatureManager.prefetch(['projects:feature'], [project1, project2], actor=request.user)
+        """
+        memo = self._get_memo()
+        if memo is None or not objects:
+            return
+
+        project_features = []
+        organization_features = []
+        for name in feature_names:
+            cls = self._get_feature_class(name)
+            if issubclass(cls, ProjectFeature):
+                project_features.append(name)
+            elif issubclass(cls, OrganizationFeature):
+                organization_features.append(name)
+
+        if project_features:
+            by_organization = defaultdict(list)
+            for obj in objects:
+                by_organization[obj.organization].append(obj)
+            for organization, batch in by_organization.items():
+                self._prefetch_batch(
+                    memo, project_features, organization, batch, actor, skip_entity
+                )
+
+        if organization_features:
+            self._prefetch_batch(memo, organization_features, None, objects, actor, skip_entity)
+
+    def _prefetch_batch(
+        self,
+        memo: MutableMapping[Hashable, bool],
+        feature_names: Sequence[str],
+        organization: Optional["Organization"],
+        objects: Sequence[Union["Organization", "Project"]],
+        actor: Optional["User"],
+        skip_entity: Optional[bool],
+    ) -> None:
+        results = {}
+        remaining = {}
+        for name in feature_names:
+            results[name], remaining[name] = self._get_handlers_for_batch(
+                name, organization, objects, actor
+            )
+
+        if self._entity_handler and not skip_entity:
+            for name, flags in self._get_entity_handler_for_batch(
+                organization, remaining, actor
+            ).items():
+                results[name].update(flags)
+
+        for name in feature_names:
+            default_flag = settings.SENTRY_FEATURES.get(name, False)
+            if default_flag is None:
+                default_flag = False
+
+            for obj in objects:
+                memo[_make_memo_key(name, (obj,), {}, actor, skip_entity)] = results[name].get(
+                    obj, default_flag
+                )
+
+    def _get_entity_handler_for_batch(
+        self,
+        organization: Optional["Organization"],
+        remaining: Mapping[str, Set[Union["Organization", "Project"]]],
+        actor: Optional["User"],
+    ) -> Mapping[str, Mapping[Any, bool]]:
+        """
+        Asks the entity handler about the objects that are left for each
+        feature, once for the projects of ``organization``, or once per
+        organization if ``organization`` is None.
+        """
+        assert self._entity_handler is not None
+
+        result: MutableMapping[str, MutableMapping[Any, bool]] = defaultdict(dict)
+        if organization is not None:
+            names = [name for name, objects in remaining.items() if objects]
+            if not names:
+                return result
+
+            projects = list(set().union(*(remaining[name] for name in names)))
+            entity_result = self._entity_handler.batch_has(
+                names, actor, projects=projects, organization=organization
+            )
+            for name in names:
+                for project in remaining[name]:
+                    flag = (entity_result or {}).get(f"project:{project.id}", {}).get(name)
+                    if flag is not None:
+                        result[name][project] = flag
+            return result
+
+        names_by_organization = defaultdict(list)
+        for name, objects in remaining.items():
+            for obj in objects:
+                names_by_organization[obj].append(name)
+
+        for org, names in names_by_organization.items():
+            entity_result = self._entity_handler.batch_has(names, actor, organization=org)
+            for name in names:
+                flag = (entity_result or {}).get(f"organization:{org.id}", {}).get(name)
+                if flag is not None:
+                    result[name][org] = flag
+        return result
+
+    def _get_memo(self) -> Optional[MutableMapping[Hashable, bool]]:
+        return getattr(self._memo, "results", None)
+
+    def enable_memoization(self, **kwargs: Any) -> None:
+        """
+        Start memoizing results of ``has`` on the current thread.
+        """
+        self._memo.results = {}
+
+    def disable_memoization(self, **kwargs: Any) -> None:
+        """
+        Stop memoizing results of ``has`` on the current thread, discarding
+        everything memoized so far.
+        """
+        self._memo.results = None
+
+    @contextmanager
+    def memoized(self) -> Iterator[None]:
+        """
+        Memoize results of ``has`` on the current thread within the block,
+        unless they already are, e.g. for the current request or task.
+        """
+        if self._get_memo() is not None:
+            yield
+            return
+
+        self.enable_memoization()
+        try:
+            yield
+        finally:
+            self.disable_memoization()
+
+    def connect_signals(self) -> None:
+        # Scope memoized results to a single request or task, so that
+        # changes to feature flags are picked up by the next one.
+        from celery.signals import task_postrun, task_prerun
+        from django.core.signals import request_finished, request_started
+
+        request_started.connect(self.enable_memoization)
+        request_finished.connect(self.disable_memoization)
+        task_prerun.connect(self.enable_memoization)
+        task_postrun.connect(self.disable_memoization)
+
+
+def _make_memo_key(
+    name: str,
+    args: Sequence[Any],
+    kwargs: Mapping[str, Any],
+    actor: Optional["User"],
+    skip_entity: Optional[bool],
+) -> Hashable:
+    return (name, tuple(args), tuple(sorted(kwargs.items())), actor, bool(skip_entity))
+
 
 class FeatureCheckBatch:
     """
@@ -255,14 +487,16 @@ class FeatureCheckBatch:
 
     An instance of this class encapsulates a call to
     ``FeatureManager.has_for_batch``. The objects (such as projects) have a
-    common parent organization.
+    common parent organization. When ``FeatureManager.prefetch`` checks an
+    organization feature for many organizations at once, the objects are the
+    organizations and ``organization`` is None.
     """
 
     def __init__(
         self,
         manager: RegisteredFeatureManager,
         name: str,
-        organization: "Organization",
+        organization: Optional["Organization"],
         objects: Iterable["Project"],
         actor: "User",
     ) -> None:
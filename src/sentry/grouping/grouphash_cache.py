@@ -0,0 +1,161 @@
+"""
+A cache of the ``GroupHash`` rows of projects, used when saving events to
+resolve their hashes to an existing group without querying the database.
+
+Entries are versioned per project. Whatever changes the group, tombstone or
+state of the hashes of a project (merging, unmerging, reprocessing, deleting
+or discarding groups) must call ``invalidate`` afterwards, which bumps the
+version of the project and thereby orphans all of its entries.
+
+Entries are stored in Redis and in a bounded local cache. The version of a
+project is read from Redis at most once every
+``SENTRY_GROUPHASH_CACHE_LOCAL_TTL`` seconds per process, which is how long
+other processes may keep resolving hashes the way they did before an
+invalidation.
+"""
+
+import time
+from collections import namedtuple
+from threading import Lock
+
+from django.conf import settings
+
+from sentry.utils.cache import LRUCache
+from sentry.utils.redis import redis_clusters
+
+CachedGroupHash = namedtuple("CachedGroupHash", ["id", "group_id", "state"])
+
+
+def _encode_entry(entry):
+    return "{}:{}:{}".format(entry.id, entry.group_id, "" if entry.state is None else entry.state)
+
+
+def _decode_entry(value):
+    id, group_id, state = value.split(":")
+    return CachedGroupHash(int(id), int(group_id), int(state) if state else None)
+
+
+class GroupHashCache:
+    def __init__(self, cluster, ttl, local_ttl, local_cache_size):
+        self.cluster = cluster
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self._versions = LRUCache(local_cache_size)
+        self._entries = LRUCache(local_cache_size)
+        self._lock = Lock()
+
+    def _get_client(self):
+        return redis_clusters.get(self.cluster)
+
+    def _get_version_key(self, project_id):
+        return f"gh:{{{project_id}}}:v"
+
+    def _get_entry_key(self, project_id, version, hash):
+        return f"gh:{{{project_id}}}:{version}:{hash}"
+
+    def get_version(self, project_id):
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(project_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        version = int(self._get_client().get(self._get_version_key(project_id)) or 0)
+        with self._lock:
+            self._versions.set(project_id, (version, now + self.local_ttl))
+        return version
+
+    def get_many(self, project_id, hashes):
+        """
+        Returns the current version of the project, and the cached entries of
+        the given hashes as a mapping of hash to ``CachedGroupHash``. Hashes
+        that are not cached are missing from the mapping.
+
+        Entries for rows read from the database afterwards must be stored with
+        the version returned here, so that they are orphaned if the project is
+        invalidated in the meantime.
+        """
+        version = self.get_version(project_id)
+
+        rv = {}
+        missing = []
+        with self._lock:
+            for hash in hashes:
+                entry = self._entries.get((project_id, version, hash))
+                if entry is None:
+                    missing.append(hash)
+                else:
+                    rv[hash] = entry
+
+        if missing:
+            values = self._get_client().mget(
+                [self._get_entry_key(project_id, version, hash) for hash in missing]
+            )
+            found = {
+                hash: _decode_entry(value)
+                for hash, value in zip(missing, values)
+                if value is not None
+            }
+            with self._lock:
+                for hash, entry in found.items():
+                    self._entries.set((project_id, version, hash), entry)
+            rv.update(found)
+
+        return version, rv
+
+    def set_many(self, project_id, version, grouphashes):
+        """
+        Caches ``GroupHash`` rows of the project that are associated with a
+        group.
+        """
+        entries = {
+            grouphash.hash: CachedGroupHash(grouphash.id, grouphash.group_id, grouphash.state)
+            for grouphash in grouphashes
+            if grouphash.group_id is not None and grouphash.group_tombstone_id is None
+        }
+        if not entries:
+            return
+
+        pipeline = self._get_client().pipeline()
+        for hash, entry in entries.items():
+            pipeline.set(
+                self._get_entry_key(project_id, version, hash), _encode_entry(entry), ex=self.ttl
+            )
+        pipeline.execute()
+
+        with self._lock:
+            for hash, entry in entries.items():
+                self._entries.set((project_id, version, hash), entry)
+
+    def invalidate(self, project_ids):
+        """
+        Orphans all cached entries of the given projects.
+        """
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+
+        # The version keys don't expire: if a version was reset, entries
+        # stored with an earlier version of the same number would be used again.
+        pipeline = self._get_client().pipeline()
+        for project_id in project_ids:
+            pipeline.incr(self._get_version_key(project_id))
+        versions = pipeline.execute()
+
+        expires_at = time.monotonic() + self.local_ttl
+        with self._lock:
+            for project_id, version in zip(project_ids, versions):
+                self._versions.set(project_id, (version, expires_at))
+
+    def clear_local_cache(self):
+        with self._lock:
+            self._versions.clear()
+            self._entries.clear()
+
+
+grouphash_cache = GroupHashCache(
+    cluster=settings.SENTRY_GROUPHASH_CACHE_REDIS_CLUSTER,
+    ttl=settings.SENTRY_GROUPHASH_CACHE_TTL,
+    local_ttl=settings.SENTRY_GROUPHASH_CACHE_LOCAL_TTL,
+    local_cache_size=settings.SENTRY_GROUPHASH_CACHE_LOCAL_SIZE,
+)
@@ -44,6 +44,9 @@ logger = logging.getLogger(__name__)
 
 CACHE_TIMEOUT = 3600
 
+# The number of attachment chunks that are written to the cache at once.
+ATTACHMENT_CHUNK_BATCH_SIZE = 16
+
 
 T = TypeVar("T")
 
@@ -94,6 +97,10 @@ class IngestConsumerWorker(AbstractBatchWorker):
             ]
         ] = []
 
+        # Events that are processed synchronously are stored in the processing
+        # store at once.
+        event_messages: MutableSequence[Message] = []
+
         projects_to_fetch = set()
 
         with metrics.timer("ingest_consumer.prepare_messages"):
@@ -102,7 +109,10 @@ class IngestConsumerWorker(AbstractBatchWorker):
                 projects_to_fetch.add(message["project_id"])
 
                 if message_type == "event":
-                    other_messages.append((self.__process_event, message))
+                    if self.__process_event_executor is None:
+                        event_messages.append(message)
+                    else:
+                        other_messages.append((self.__process_event, message))
                 elif message_type == "attachment_chunk":
                     attachment_chunks.append(message)
                 elif message_type == "attachment":
@@ -121,8 +131,11 @@ class IngestConsumerWorker(AbstractBatchWorker):
         if attachment_chunks:
             # attachment_chunk messages need to be processed before attachment/event messages.
             with metrics.timer("ingest_consumer.process_attachment_chunk_batch"):
-                for attachment_chunk in attachment_chunks:
-                    process_attachment_chunk(attachment_chunk, projects=projects)
+                process_attachment_chunks(attachment_chunks, projects=projects)
+
+        if event_messages:
+            with metrics.timer("ingest_consumer.process_events_batch"):
+                process_events(event_messages, projects)
 
         if other_messages:
             with metrics.timer("ingest_consumer.process_other_messages_batch"):
@@ -315,11 +328,45 @@ def _store_event(data) -> str:
     return event_processing_store.store(data)
 
 
+def _store_events(data: Sequence[Any]) -> Sequence[str]:
+    return event_processing_store.store_many(data)
+
+
 @trace_func(name="ingest_consumer.process_event")
 def process_event(message: Message, projects: Mapping[int, Project]) -> None:
     return _do_process_event(message, projects)
 
 
+@trace_func(name="ingest_consumer.process_events")
+@metrics.wraps("ingest_consumer.process_events")
+def process_events(messages: Sequence[Message], projects: Mapping[int, Project]) -> None:
+    """
+    Processes the event messages like ``process_event``, but stores all of
+    their payloads in the processing store at once before resuming processing
+    in order.
+    """
+    results = []
+    seen = set()
+    for message in messages:
+        # Duplicates within the batch are only marked as processed once the
+        # first one was stored, so they have to be skipped here.
+        key = (int(message["project_id"]), message["event_id"])
+        if key in seen:
+            continue
+        seen.add(key)
+
+        result = _load_event(message, projects)
+        if result is not None:
+            results.append(result)
+
+    if not results:
+        return
+
+    cache_keys = _store_events([data for data, callback in results])
+    for (data, callback), cache_key in zip(results, cache_keys):
+        callback(cache_key)
+
+
 def process_event_async(
     executor: ThreadPoolExecutor, message: Message, projects: Mapping[int, Project]
 ) -> Optional["AsyncResult[str]"]:
@@ -348,6 +395,31 @@ def process_attachment_chunk(message, projects):
     )
 
 
+@trace_func(name="ingest_consumer.process_attachment_chunks")
+@metrics.wraps("ingest_consumer.process_attachment_chunks")
+def process_attachment_chunks(messages, projects):
+    """
+    Stores the chunks of the attachment chunk messages like
+    ``process_attachment_chunk``, writing up to ``ATTACHMENT_CHUNK_BATCH_SIZE``
+    of them to the attachment cache at once.
+    """
+    for start in range(0, len(messages), ATTACHMENT_CHUNK_BATCH_SIZE):
+        attachment_cache.set_chunks(
+            [
+                (
+                    cache_key_for_event(
+                        {"event_id": message["event_id"], "project": message["project_id"]}
+                    ),
+                    message["id"],
+                    message["chunk_index"],
+                    message["payload"],
+                )
+                for message in messages[start : start + ATTACHMENT_CHUNK_BATCH_SIZE]
+            ],
+            timeout=CACHE_TIMEOUT,
+        )
+
+
 @trace_func(name="ingest_consumer.process_individual_attachment")
 @metrics.wraps("ingest_consumer.process_individual_attachment")
 def process_individual_attachment(message, projects) -> None:
@@ -35,4 +35,6 @@ all = default_manager.all
 get = default_manager.get
 exists = default_manager.exists
 register = default_manager.register
+register_lazy = default_manager.register_lazy
+load = default_manager.load
 unregister = default_manager.unregister
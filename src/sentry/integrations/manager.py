@@ -1,7 +1,12 @@
 __all__ = ["IntegrationManager"]
 
+import logging
+import threading
 
 from sentry.exceptions import NotRegistered
+from sentry.utils.imports import import_string
+
+logger = logging.getLogger("sentry.integrations")
 
 
 # Ideally this and PluginManager abstracted from the same base, but
@@ -9,17 +14,22 @@ from sentry.exceptions import NotRegistered
 class IntegrationManager:
     def __init__(self):
         self.__values = {}
+        self.__pending = []
+        self.__loading = False
+        self.__lock = threading.RLock()
 
     def __iter__(self):
         return iter(self.all())
 
     def all(self):
+        self.load()
         for key in self.__values.keys():
             integration = self.get(key)
             if integration.visible:
                 yield integration
 
     def get(self, key, **kwargs):
+        self.load()
         try:
             cls = self.__values[key]
         except KeyError:
@@ -27,12 +37,64 @@ class IntegrationManager:
         return cls(**kwargs)
 
     def exists(self, key):
+        self.load()
         return key in self.__values
 
     def register(self, cls):
         self.__values[cls.key] = cls
 
+    def register_lazy(self, path):
+        """
+        Registers the integration provider at the given import path without
+        importing it. Pending providers are imported and set up the first
+        time the registry is used.
+        """
+        with self.__lock:
+            self.__pending.append(path)
+
+    def load(self):
+        """
+        Imports and sets up the providers registered with ``register_lazy``.
+
+        Pending providers are only cleared once all of them are registered and
+        set up, so other threads wait for the registry to be complete.
+        """
+        if not self.__pending:
+            return
+
+        with self.__lock:
+            # The registry is used by the loading thread itself while setting up
+            if not self.__pending or self.__loading:
+                return
+
+            pending = list(self.__pending)
+            self.__loading = True
+            try:
+                loaded = []
+                for path in pending:
+                    try:
+                        cls = import_string(path)
+                    except Exception:
+                        logger.exception("Failed to load integration %r", path)
+                        continue
+
+                    self.register(cls)
+                    loaded.append(cls)
+
+                for cls in loaded:
+                    integration = cls()
+                    if not integration.visible:
+                        continue
+                    try:
+                        integration.setup()
+                    except AttributeError:
+                        pass
+            finally:
+                self.__loading = False
+                del self.__pending[: len(pending)]
+
     def unregister(self, cls):
+        self.load()
         try:
             if self.__values[cls.key] != cls:
                 # don't allow unregistering of arbitrary provider
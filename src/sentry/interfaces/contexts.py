@@ -148,6 +148,11 @@ class Contexts(Interface):
 
     @classmethod
     def to_python(cls, data, **kwargs):
+        from sentry.plugins.base import plugins
+
+        # Plugins can register context types when they are loaded
+        plugins.load()
+
         rv = {}
         for alias, value in data.items():
             # XXX(markus): The `None`-case should be handled in the UI and
@@ -1,4 +1,5 @@
 import random
+from threading import Lock
 
 from django.conf import settings
 from django.db import connections, transaction
@@ -6,6 +7,12 @@ from django.db.models.signals import post_migrate
 
 from sentry import options
 from sentry.db.models import BoundedBigIntegerField, FlexibleForeignKey, Model, sane_repr
+from sentry.utils.cache import LRUCache
+
+# The values left in the blocks this process allocated, by project id, as a
+# pair of the next and the last value of the block.
+_blocks = LRUCache(settings.SENTRY_PROJECT_COUNTER_LOCAL_BLOCKS)
+_blocks_lock = Lock()
 
 
 class Counter(Model):
@@ -25,6 +32,47 @@ class Counter(Model):
         """Increments a counter.  This can never decrement."""
         return increment_project_counter(project, delta)
 
+    @classmethod
+    def next_value(cls, project):
+        """
+        Returns the next value of the counter, taken from a block of values
+        allocated by this process. See ``next_project_counter_value``.
+        """
+        return next_project_counter_value(project)
+
+
+def next_project_counter_value(project, using="default"):
+    """
+    Returns a new value of the project counter. The counter is incremented by
+    ``store.projectcounter-block-size`` at once, and the rest of that block is
+    handed out by later calls in this process without touching the database.
+
+    Values are unique but not sequential across processes, and the values left
+    in a block when the process exits are never used. A block is only kept
+    once the transaction it was allocated in commits, since the counter is
+    reset if the transaction is rolled back.
+    """
+    with _blocks_lock:
+        block = _blocks.get(project.id)
+        if block is not None and block[0] <= block[1]:
+            value, last = block
+            _blocks.set(project.id, (value + 1, last))
+            return value
+
+    block_size = options.get("store.projectcounter-block-size")
+    last = increment_project_counter(project, block_size, using=using)
+    first = last - block_size + 1
+
+    if block_size > 1:
+
+        def keep_block():
+            with _blocks_lock:
+                _blocks.set(project.id, (first + 1, last))
+
+        transaction.on_commit(keep_block, using=using)
+
+    return first
+
 
 def increment_project_counter(project, delta=1, using="default"):
     """This method primarily exists so that south code can use it."""
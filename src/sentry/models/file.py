@@ -66,6 +66,26 @@ def _get_size_and_checksum(fileobj, logger=nooplogger):
     return size, checksum.hexdigest()
 
 
+def _read_blobs(fileobj, blob_size):
+    while True:
+        contents = fileobj.read(blob_size)
+        if not contents:
+            return
+        yield contents
+
+
+def _join_blobs(chunks, blob_size):
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= blob_size:
+            yield bytes(buffer[:blob_size])
+            del buffer[:blob_size]
+
+    if buffer:
+        yield bytes(buffer)
+
+
 @contextmanager
 def _locked_blob(checksum, logger=nooplogger):
     logger.debug("_locked_blob.start", extra={"checksum": checksum})
@@ -394,14 +414,25 @@ class File(Model):
 
         >>> indexes = file.putfile(fileobj)
         """
+        return self._putblobs(_read_blobs(fileobj, blob_size), commit=commit, logger=logger)
+
+    def putchunks(self, chunks, blob_size=DEFAULT_BLOB_SIZE, commit=True, logger=nooplogger):
+        """
+        Save an iterable of byte chunks of any size into a number of blobs,
+        holding no more than a single blob in memory at once.
+
+        Returns a list of `FileBlobIndex` items.
+
+        >>> indexes = file.putchunks(iter_chunks())
+        """
+        return self._putblobs(_join_blobs(chunks, blob_size), commit=commit, logger=logger)
+
+    def _putblobs(self, blobs, commit=True, logger=nooplogger):
         results = []
         offset = 0
         checksum = sha1(b"")
 
-        while True:
-            contents = fileobj.read(blob_size)
-            if not contents:
-                break
+        for contents in blobs:
             checksum.update(contents)
 
             blob_fileobj = ContentFile(contents)
@@ -159,7 +159,7 @@ class Project(Model, PendingDeletionMixin):
         ):
             span.set_data("project_id", self.id)
             span.set_data("project_slug", self.slug)
-            return Counter.increment(self)
+            return Counter.next_value(self)
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -1,7 +1,9 @@
 import logging
+from uuid import uuid4
 
 from django.db import models
 from django.db.models import Subquery
+from django.db.models.signals import post_delete, post_save
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
@@ -39,6 +41,14 @@ class ProjectCodeOwners(DefaultFieldsModel):
     def get_cache_key(self, project_id):
         return f"projectcodeowners_project_id:1:{project_id}"
 
+    @classmethod
+    def get_version_cache_key(self, project_id):
+        return f"projectcodeowners_version:1:{project_id}"
+
+    @classmethod
+    def bump_version(cls, project_id):
+        cache.set(cls.get_version_cache_key(project_id), uuid4().hex, READ_CACHE_DURATION)
+
     @classmethod
     def get_codeowners_cached(self, project_id):
         """
@@ -176,3 +186,13 @@ class ProjectCodeOwners(DefaultFieldsModel):
                 self.save()
         except ValidationError:
             return
+
+
+def process_codeowners_change(instance, **kwargs):
+    # The cached CODEOWNERS are merged from all of the project's, read them again.
+    cache.delete(ProjectCodeOwners.get_cache_key(instance.project_id))
+    ProjectCodeOwners.bump_version(instance.project_id)
+
+
+post_save.connect(process_codeowners_change, sender=ProjectCodeOwners, weak=False)
+post_delete.connect(process_codeowners_change, sender=ProjectCodeOwners, weak=False)
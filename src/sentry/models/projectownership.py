@@ -1,4 +1,5 @@
 from typing import Any, Mapping, Optional, Sequence, Tuple, Union
+from uuid import uuid4
 
 from django.db import models
 from django.db.models.signals import post_delete, post_save
@@ -40,6 +41,14 @@ class ProjectOwnership(Model):
     def get_cache_key(self, project_id):
         return f"projectownership_project_id:1:{project_id}"
 
+    @classmethod
+    def get_version_cache_key(self, project_id):
+        return f"projectownership_version:1:{project_id}"
+
+    @classmethod
+    def bump_version(cls, project_id):
+        cache.set(cls.get_version_cache_key(project_id), uuid4().hex, READ_CACHE_DURATION)
+
     @classmethod
     def get_combined_schema(self, ownership, codeowners):
         if codeowners and codeowners.schema:
@@ -204,18 +213,16 @@ class ProjectOwnership(Model):
         return rules
 
 
+def process_ownership_save(instance, **kwargs):
+    cache.set(ProjectOwnership.get_cache_key(instance.project_id), instance, READ_CACHE_DURATION)
+    ProjectOwnership.bump_version(instance.project_id)
+
+
+def process_ownership_delete(instance, **kwargs):
+    cache.set(ProjectOwnership.get_cache_key(instance.project_id), False, READ_CACHE_DURATION)
+    ProjectOwnership.bump_version(instance.project_id)
+
+
 # Signals update the cached reads used in post_processing
-post_save.connect(
-    lambda instance, **kwargs: cache.set(
-        ProjectOwnership.get_cache_key(instance.project_id), instance, READ_CACHE_DURATION
-    ),
-    sender=ProjectOwnership,
-    weak=False,
-)
-post_delete.connect(
-    lambda instance, **kwargs: cache.set(
-        ProjectOwnership.get_cache_key(instance.project_id), False, READ_CACHE_DURATION
-    ),
-    sender=ProjectOwnership,
-    weak=False,
-)
+post_save.connect(process_ownership_save, sender=ProjectOwnership, weak=False)
+post_delete.connect(process_ownership_delete, sender=ProjectOwnership, weak=False)
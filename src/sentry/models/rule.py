@@ -51,9 +51,13 @@ class Rule(Model):
 
     __repr__ = sane_repr("project_id", "label")
 
+    @classmethod
+    def get_project_cache_key(cls, project_id):
+        return f"project:{project_id}:rules"
+
     @classmethod
     def get_for_project(cls, project_id):
-        cache_key = f"project:{project_id}:rules"
+        cache_key = cls.get_project_cache_key(project_id)
         rules_list = cache.get(cache_key)
         if rules_list is None:
             rules_list = list(cls.objects.filter(project=project_id, status=RuleStatus.ACTIVE))
@@ -74,13 +78,13 @@ class Rule(Model):
 
     def delete(self, *args, **kwargs):
         rv = super().delete(*args, **kwargs)
-        cache_key = f"project:{self.project_id}:rules"
+        cache_key = self.get_project_cache_key(self.project_id)
         cache.delete(cache_key)
         return rv
 
     def save(self, *args, **kwargs):
         rv = super().save(*args, **kwargs)
-        cache_key = f"project:{self.project_id}:rules"
+        cache_key = self.get_project_cache_key(self.project_id)
         cache.delete(cache_key)
         return rv
 
@@ -93,6 +93,8 @@ register(
 )
 
 register("api.rate-limit.org-create", default=5, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
+# Names of endpoint classes whose list responses are serialized lazily and streamed
+register("api.streaming-responses.endpoints", type=Sequence, default=[])
 
 # Beacon
 register("beacon.anonymous", type=Bool, flags=FLAG_REQUIRED)
@@ -336,6 +338,10 @@ register("post_process.get-autoassign-owners", type=Sequence, default=[])
 # Switch for more performant project counter incr
 register("store.projectcounter-modern-upsert-sample-rate", default=0.0)
 
+# Number of short IDs a process allocates at once for the groups of a project.
+# Blocks are served from memory, IDs left when a process exits are skipped.
+register("store.projectcounter-block-size", default=1)
+
 # Run an experimental grouping config in background for performance analysis
 register("store.background-grouping-config-id", default=None)
 
@@ -366,6 +372,13 @@ register("eventstream:kafka-headers", default=False)
 register("post-process-forwarder:kafka-headers", default=False)
 # Number of threads to use for post processing
 register("post-process-forwarder:concurrency", default=1)
+# Maximum number of messages of a partition in flight with the partitioned forwarder
+register("post-process-forwarder:partition-window", default=100)
+# Number of times the partitioned forwarder retries dispatching a task
+register("post-process-forwarder:max-retries", default=3)
+# Maximum number of events of a project that are post processed by a single task, events are
+# post processed by a task each unless this is greater than 1
+register("post-process-forwarder:task-batch-size", default=1)
 
 # Subscription queries sampling rate
 register("subscriptions-query.sample-rate", default=0.01)
@@ -385,5 +398,12 @@ register("performance.suspect-spans-ingestion.rollout-rate", default=0)
 # special save_event task for transactions avoiding the preprocess.
 register("store.save-transactions-ingest-consumer-rate", default=0.0)
 
+# Rate at which DuplexReleaseHealthBackend compares results with the metrics
+# backend, by method name. Methods that aren't listed are always compared.
+register("release-health.duplex.sample-rates", default={})
+
+# Fraction of events scrubbed by Sentry for which the size of the PII configs is recorded.
+register("datascrubbing.config-metrics.sample-rate", default=0.01)
+
 # Drop delete_old_primary_hash messages for a particular project.
 register("reprocessing2.drop-delete-old-primary-hash", default=[])
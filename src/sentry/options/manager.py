@@ -272,6 +272,26 @@ class OptionsManager:
         """
         return self.registry.values()
 
+    def stored_keys(self):
+        """
+        Return an iterator for all keys in the registry that are backed by the store.
+        """
+        return (k for k in self.all() if not (k.flags & FLAG_NOSTORE))
+
+    def warm_cache(self, silent=True):
+        """
+        Load every stored option into the store's local cache in bulk, instead
+        of fetching them one at a time on first use.
+        """
+        return self.store.warm_local_cache(self.stored_keys(), silent=silent)
+
+    def start_background_refresh(self, interval):
+        """
+        Keep the store's local cache warm by reloading every stored option in
+        the background every ``interval`` seconds.
+        """
+        self.store.start_background_refresh(lambda: list(self.stored_keys()), interval)
+
     def filter(self, flag=None):
         """
         Return an iterator that's filtered by which flags are set on a key.
@@ -1,4 +1,6 @@
 import logging
+import os
+import threading
 from collections import namedtuple
 from random import random
 from time import time
@@ -16,6 +18,11 @@ CACHE_UPDATE_ERR = "Unable to update option cache for %s"
 
 logger = logging.getLogger("sentry")
 
+# Placed in the local cache for keys that were confirmed to be unset in both
+# the network cache and the database during a bulk warm-up, so that reads
+# for those keys don't fall through to the network either.
+_UNSET = object()
+
 
 def _make_cache_key(key):
     return "o:%s" % md5_text(key).hexdigest()
@@ -41,6 +48,8 @@ class OptionsStore:
     def __init__(self, cache=None, ttl=None):
         self.cache = cache
         self.ttl = ttl
+        self._refresh = None
+        self._refresh_after_fork_registered = False
         self.flush_local_cache()
 
     @cached_property
@@ -57,6 +66,8 @@ class OptionsStore:
         Fetches a value from the options store.
         """
         result = self.get_cache(key, silent=silent)
+        if result is _UNSET:
+            return None
         if result is not None:
             return result
 
@@ -66,7 +77,10 @@ class OptionsStore:
 
         # As a last ditch effort, let's hope we have a key
         # in local cache that's possibly stale
-        return self.get_local_cache(key, force_grace=True)
+        result = self.get_local_cache(key, force_grace=True)
+        if result is _UNSET:
+            return None
+        return result
 
     def get_cache(self, key, silent=False):
         """
@@ -91,8 +105,141 @@ class OptionsStore:
         if value is not None and key.ttl > 0:
             self._local_cache[cache_key] = _make_cache_value(key, value)
 
+        if key.ttl > 0:
+            from sentry.utils import metrics
+
+            metrics.incr("options.local_cache.miss", tags={"cache_hit": value is not None})
+
         return value
 
+    def get_many(self, keys, silent=False):
+        """
+        Fetches the values of many keys at once, bypassing the local cache.
+
+        Values are looked up in the network cache with a single ``get_many``,
+        and whatever is left is looked up in the database with a single query,
+        writing those values back into the network cache. Returns a mapping of
+        cache key to value for every key that has a value in either tier.
+        """
+        return self._get_many(keys, silent=silent)[0]
+
+    def _get_many(self, keys, silent=False):
+        """
+        Like ``get_many``, but also returns the cache keys that the database
+        showed to have no value, or None if the database couldn't be queried.
+        """
+        keys = {key.cache_key: key for key in keys}
+        if not keys:
+            return {}, set()
+
+        results = {}
+        if self.cache is not None:
+            try:
+                results = self.cache.get_many(list(keys))
+            except Exception:
+                if not silent:
+                    logger.warning(CACHE_FETCH_ERR, "<bulk>", exc_info=True)
+                results = {}
+        results = {k: v for k, v in results.items() if v is not None}
+
+        missing = {keys[k].name: k for k in keys if k not in results}
+        if not missing:
+            return results, set()
+
+        try:
+            from_store = {
+                missing[name]: value
+                for name, value in self.model.objects.filter(key__in=list(missing)).values_list(
+                    "key", "value"
+                )
+                if value is not None
+            }
+        except (ProgrammingError, OperationalError):
+            return results, None
+        except Exception:
+            if not silent:
+                logger.exception("option.failed-lookup", extra={"key": "<bulk>"})
+            return results, None
+
+        if from_store and self.cache is not None:
+            try:
+                self.cache.set_many(from_store, self.ttl)
+            except Exception:
+                if not silent:
+                    logger.warning(CACHE_UPDATE_ERR, "<bulk>", exc_info=True)
+
+        results.update(from_store)
+        return results, set(missing.values()) - set(from_store)
+
+    def warm_local_cache(self, keys, silent=False):
+        """
+        Bulk load ``keys`` into the local cache with one network cache
+        round trip and at most one database query.
+
+        Keys which the database showed to have no value are remembered as
+        unset in the local cache for their TTL, so reads for them fall through
+        to the defaults without touching the network. If the database can't
+        be queried, the local cache keeps what it had for the keys that
+        weren't found, so that reads can still fall back to stale values.
+        Returns the number of keys that were loaded.
+        """
+        keys = [key for key in keys if key.ttl > 0]
+        if not keys:
+            return 0
+
+        values, unset = self._get_many(keys, silent=silent)
+        loaded = 0
+        for key in keys:
+            if key.cache_key in values:
+                value = values[key.cache_key]
+            elif unset is not None and key.cache_key in unset:
+                value = _UNSET
+            else:
+                continue
+            self._local_cache[key.cache_key] = _make_cache_value(key, value)
+            loaded += 1
+        return loaded
+
+    def start_background_refresh(self, get_keys, interval):
+        """
+        Start a daemon thread that calls ``warm_local_cache`` with the keys
+        returned by ``get_keys`` every ``interval`` seconds.
+
+        As long as ``interval`` is shorter than the TTL of the keys, reads
+        are always served from the local cache. The thread is restarted in
+        forked children (e.g. prefork Celery workers), since threads do not
+        survive a fork.
+        """
+        self.stop_background_refresh()
+
+        stop = threading.Event()
+
+        def refresh():
+            while not stop.wait(interval):
+                try:
+                    self.warm_local_cache(get_keys(), silent=True)
+                except Exception:
+                    logger.exception("option.failed-refresh")
+
+        thread = threading.Thread(target=refresh, name="sentry.options.refresh", daemon=True)
+        thread.start()
+        self._refresh = (stop, get_keys, interval)
+
+        if not self._refresh_after_fork_registered:
+            os.register_at_fork(after_in_child=self._restart_background_refresh)
+            self._refresh_after_fork_registered = True
+
+    def stop_background_refresh(self):
+        if self._refresh is not None:
+            self._refresh[0].set()
+            self._refresh = None
+
+    def _restart_background_refresh(self):
+        if self._refresh is not None:
+            _, get_keys, interval = self._refresh
+            self._refresh = None
+            self.start_background_refresh(get_keys, interval)
+
     def get_local_cache(self, key, force_grace=False):
         """
         Attempt to fetch a key out of the local cache.
@@ -39,9 +39,19 @@ class BindingManager:
 
     def __init__(self):
         self._bindings = {k: v() for k, v in self.BINDINGS.items()}
+        self._loaders = []
 
     def add(self, name, binding, **kwargs):
         self._bindings[name].add(binding, **kwargs)
 
+    def add_loader(self, loader):
+        """
+        Adds a callable that is called before any binding is looked up, so
+        that lazily loaded plugins and integrations can add their bindings.
+        """
+        self._loaders.append(loader)
+
     def get(self, name):
+        for loader in self._loaders:
+            loader()
         return self._bindings[name]
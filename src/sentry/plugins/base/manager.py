@@ -1,12 +1,25 @@
 __all__ = ("PluginManager",)
 
 import logging
+import threading
 
 from sentry.utils.managers import InstanceManager
 from sentry.utils.safe import safe_execute
 
+logger = logging.getLogger("sentry.plugins")
+
 
 class PluginManager(InstanceManager):
+    def __init__(self, class_list=None, instances=True):
+        super().__init__(class_list, instances)
+        self._pending = []
+        self._loading = False
+        self._lock = threading.RLock()
+
+    def get_class_list(self):
+        self.load()
+        return super().get_class_list()
+
     def __iter__(self):
         return iter(self.all())
 
@@ -73,6 +86,53 @@ class PluginManager(InstanceManager):
         self.add(f"{cls.__module__}.{cls.__name__}")
         return cls
 
+    def register_lazy(self, name, load, setup=None):
+        """
+        Registers the plugin class returned by ``load`` without calling it.
+        Pending plugins are loaded, and their instances passed to ``setup``,
+        the first time the registry is used.
+        """
+        with self._lock:
+            self._pending.append((name, load, setup))
+
+    def load(self):
+        """
+        Loads the plugins registered with ``register_lazy``.
+
+        Pending plugins are only cleared once all of them are registered and
+        set up, so other threads wait for the registry to be complete.
+        """
+        if not self._pending:
+            return
+
+        with self._lock:
+            # The registry is used by the loading thread itself while setting up
+            if not self._pending or self._loading:
+                return
+
+            pending = list(self._pending)
+            self._loading = True
+            try:
+                loaded = {}
+                for name, load, setup in pending:
+                    try:
+                        cls = load()
+                    except Exception:
+                        logger.exception("Failed to load plugin %r", name)
+                        continue
+
+                    self.register(cls)
+                    if setup is not None:
+                        loaded[cls] = setup
+
+                for plugin in self.all(version=None):
+                    setup = loaded.get(type(plugin))
+                    if setup is not None:
+                        setup(plugin)
+            finally:
+                self._loading = False
+                del self._pending[: len(pending)]
+
     def unregister(self, cls):
         self.remove(f"{cls.__module__}.{cls.__name__}")
         return cls
@@ -1,6 +1,9 @@
+import atexit
 import logging
-from itertools import chain
-from typing import Iterable, Sequence, Set
+import threading
+import time
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, Optional, Sequence, Set
 
 from sentry.exceptions import InvalidConfiguration
 from sentry.utils import redis
@@ -12,6 +15,8 @@ LPQ_MEMBERS_KEY = "store.symbolicate-event-lpq-selected"
 
 logger = logging.getLogger(__name__)
 
+mark_projects_active_script = redis.load_script("processing/mark_projects_active.lua")
+
 
 class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
     """An implementation of RealtimeMetricsStore based on a Redis backend."""
@@ -24,6 +29,7 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
         duration_bucket_size: int,
         duration_time_window: int,
         backoff_timer: int,
+        flush_interval: float = 0,
     ) -> None:
         """Creates a RedisRealtimeMetricsStore.
 
@@ -34,6 +40,10 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
 
         "duration_bucket_size" and "duration_time_window" function like their "counter*" siblings,
         but for processing duration metrics.
+
+        "flush_interval" is the number of seconds increments are buffered in memory for before
+        they're written to Redis in a single pipeline. A value of 0 writes every increment
+        right away.
         """
 
         self.cluster = redis.redis_clusters.get(cluster)
@@ -43,9 +53,22 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
         self._duration_time_window = duration_time_window
         self._prefix = "symbolicate_event_low_priority"
         self._backoff_timer = backoff_timer
+        self._flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._counters: DefaultDict[str, int] = defaultdict(int)
+        self._durations: DefaultDict[str, DefaultDict[int, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        # Latest bucket timestamp of buffered metrics per project
+        self._active_projects: Dict[int, int] = {}
 
         self.validate()
 
+        if self._flush_interval > 0:
+            atexit.register(self.flush)
+
     def validate(self) -> None:
         if not 0 < self._counter_bucket_size <= 60:
             raise InvalidConfiguration("counter bucket size must be 1-60 seconds")
@@ -59,6 +82,9 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
         if self._duration_time_window < 60:
             raise InvalidConfiguration("duration time window must be at least a minute")
 
+        if self._flush_interval < 0:
+            raise InvalidConfiguration("flush interval must not be negative")
+
     def _counter_key_prefix(self) -> str:
         return f"{self._prefix}:counter:{self._counter_bucket_size}"
 
@@ -68,6 +94,57 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
     def _backoff_key_prefix(self) -> str:
         return f"{self._prefix}:backoff"
 
+    def _projects_key(self) -> str:
+        # Sorted set of project IDs scored by the timestamp of their latest metrics
+        return f"{self._prefix}:projects:{self._counter_bucket_size}:{self._duration_bucket_size}"
+
+    def _projects_time_window(self) -> int:
+        # Metrics of a project are kept for at most this long, see the expiries in flush()
+        return max(
+            self._counter_time_window + self._counter_bucket_size,
+            self._duration_time_window + self._duration_bucket_size,
+        )
+
+    def _mark_active(self, project_id: int, timestamp: int) -> None:
+        if self._active_projects.get(project_id, timestamp) <= timestamp:
+            self._active_projects[project_id] = timestamp
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes all buffered increments to Redis in a single pipeline.
+
+        Buffered increments are dropped if writing them fails.
+        """
+        with self._lock:
+            counters, self._counters = self._counters, defaultdict(int)
+            durations, self._durations = self._durations, defaultdict(lambda: defaultdict(int))
+            active_projects, self._active_projects = self._active_projects, {}
+            self._last_flush = time.monotonic()
+
+        if not active_projects:
+            return
+
+        with self.cluster.pipeline(transaction=False) as pipeline:
+            for key, count in counters.items():
+                pipeline.incrby(key, count)
+                pipeline.expire(key, self._counter_time_window + self._counter_bucket_size)
+
+            for key, histogram in durations.items():
+                for duration, count in histogram.items():
+                    pipeline.hincrby(key, duration, count)
+                pipeline.expire(key, self._duration_time_window + self._duration_bucket_size)
+
+            pipeline.execute()
+
+        args = []
+        for project_id, timestamp in active_projects.items():
+            args.extend([project_id, timestamp])
+        mark_projects_active_script(self.cluster, [self._projects_key()], args)
+
     def _register_backoffs(self, project_ids: Sequence[int]) -> None:
         if len(project_ids) == 0 or self._backoff_timer == 0:
             return
@@ -101,10 +178,11 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
 
         key = f"{self._counter_key_prefix()}:{project_id}:{timestamp}"
 
-        with self.cluster.pipeline() as pipeline:
-            pipeline.incr(key)
-            pipeline.expire(key, self._counter_time_window + self._counter_bucket_size)
-            pipeline.execute()
+        with self._lock:
+            self._counters[key] += 1
+            self._mark_active(project_id, timestamp)
+
+        self._maybe_flush()
 
     def increment_project_duration_counter(
         self, project_id: int, timestamp: int, duration: int
@@ -120,39 +198,33 @@ class RedisRealtimeMetricsStore(base.RealtimeMetricsStore):
         key = f"{self._duration_key_prefix()}:{project_id}:{timestamp}"
         duration -= duration % 10
 
-        with self.cluster.pipeline() as pipeline:
-            pipeline.hincrby(key, duration, 1)
-            pipeline.expire(key, self._duration_time_window + self._duration_bucket_size)
-            pipeline.execute()
+        with self._lock:
+            self._durations[key][duration] += 1
+            self._mark_active(project_id, timestamp)
 
-    def projects(self) -> Iterable[int]:
+        self._maybe_flush()
+
+    def projects(self, now: Optional[int] = None) -> Iterable[int]:
         """
         Returns IDs of all projects for which metrics have been recorded in the store.
 
-        This may throw an exception if there is some sort of issue scanning the redis store for
-        projects.
+        Projects are looked up in an index of projects with recent metrics rather than by
+        scanning the keyspace, so this is proportional to the number of active projects.
+        Projects whose metrics have all expired by "now" (the current time by default) are
+        pruned from the index.
+
+        This may throw an exception if there is some sort of issue reading the index.
         """
+        if now is None:
+            now = int(time.time())
 
-        already_seen = set()
-        # Normally if there's a duration entry for a project then there should be a counter
-        # entry for it as well, but double check both to be safe
-        all_keys = chain(
-            self.cluster.scan_iter(
-                match=self._counter_key_prefix() + ":*",
-            ),
-            self.cluster.scan_iter(
-                match=self._duration_key_prefix() + ":*",
-            ),
-        )
+        cutoff = now - self._projects_time_window()
+        with self.cluster.pipeline(transaction=False) as pipeline:
+            pipeline.zremrangebyscore(self._projects_key(), "-inf", f"({cutoff}")
+            pipeline.zrange(self._projects_key(), 0, -1)
+            _removed, project_ids = pipeline.execute()
 
-        for item in all_keys:
-            # Because this could be one of two patterns, this splits based on the most basic
-            # delimiter ":" instead of splitting on known prefixes
-            _prefix, _metric_type, _bucket_size, project_id_raw, _else = item.split(":", maxsplit=4)
-            project_id = int(project_id_raw)
-            if project_id not in already_seen:
-                already_seen.add(project_id)
-                yield project_id
+        return [int(project_id) for project_id in project_ids]
 
     def get_counts_for_project(self, project_id: int, timestamp: int) -> base.BucketedCounts:
         """Returns a sorted list of bucketed timestamps paired with the count of symbolicator requests
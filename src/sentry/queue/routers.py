@@ -1,11 +1,13 @@
 import itertools
 
 from celery import current_app
+from django.conf import settings
 
 COUNTER_TASKS = {"sentry.tasks.process_buffer.process_incr"}
 
 TRIGGER_TASKS = {
     "sentry.tasks.post_process.post_process_group",
+    "sentry.tasks.post_process.post_process_group_batch",
     "sentry.tasks.post_process.plugin_post_process_group",
 }
 
@@ -27,3 +29,34 @@ class SplitQueueRouter:
         if task in TRIGGER_TASKS:
             return {"queue": next(self.trigger_queues)}
         return None
+
+
+def get_task_serializer(task, queue=None):
+    """
+    Returns the serializer configured in `SENTRY_CELERY_QUEUE_SERIALIZERS`
+    for the queue the task is sent to, if any. The serializer can't be set by
+    routes, as Celery prefers the task's own serializer over the route's.
+    """
+    if queue is None:
+        if task.name in COUNTER_TASKS:
+            queue = "counters"
+        elif task.name in TRIGGER_TASKS:
+            queue = "triggers"
+        else:
+            queue = getattr(task, "queue", None)
+    return get_queue_serializer(getattr(queue, "name", queue))
+
+
+def get_queue_serializer(queue):
+    """
+    Returns the serializer configured for the queue in
+    `SENTRY_CELERY_QUEUE_SERIALIZERS`, if any. Partitioned queues are
+    configured by the name they are created with, e.g. `counters`.
+    """
+    if queue is None:
+        return None
+
+    serializers = settings.SENTRY_CELERY_QUEUE_SERIALIZERS
+    if queue in serializers:
+        return serializers[queue]
+    return serializers.get(queue.rsplit("-", 1)[0])
@@ -0,0 +1,160 @@
+"""
+Compact serializers for Celery task messages.
+
+Task messages are encoded with msgpack. Values msgpack has no representation
+for are encoded as extension types: datetimes, Django model classes and
+instances (by their concrete field values), and everything else is pickled,
+so any message that can be pickled can be encoded. Unlike pickle, tuples are
+decoded as lists and subclasses of builtin types as the builtin type.
+
+Two serializers are registered with kombu:
+
+- ``sentry-msgpack`` never compresses messages.
+- ``sentry-msgpack-zstd`` compresses messages with zstd once they are larger
+  than ``SENTRY_CELERY_COMPRESSION_THRESHOLD`` bytes.
+
+Both decode messages of either kind. Serializers are picked per queue through
+``SENTRY_CELERY_QUEUE_SERIALIZERS``, see ``sentry.queue.routers``.
+"""
+
+import pickle
+import struct
+from datetime import datetime, timedelta
+
+import msgpack
+import zstandard
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Model
+from django.utils import timezone
+from kombu.serialization import register
+
+SERIALIZER = "sentry-msgpack"
+COMPRESSED_SERIALIZER = "sentry-msgpack-zstd"
+
+# msgpack extension type codes
+EXT_DATETIME = 1
+EXT_MODEL = 2
+EXT_MODEL_INSTANCE = 3
+EXT_PICKLE = 4
+
+# The first byte of a message tells whether the rest is compressed
+FORMAT_PLAIN = b"\x00"
+FORMAT_ZSTD = b"\x01"
+
+EPOCH = datetime(1970, 1, 1)
+
+# Microseconds since the epoch and whether the datetime is aware (in UTC)
+_datetime_struct = struct.Struct(">q?")
+
+
+def _encode_datetime(value):
+    aware = value.tzinfo is not None
+    if aware:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - EPOCH
+    microseconds = (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+    return _datetime_struct.pack(microseconds, aware)
+
+
+def _decode_datetime(data):
+    microseconds, aware = _datetime_struct.unpack(data)
+    value = EPOCH + timedelta(microseconds=microseconds)
+    if aware:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return msgpack.ExtType(EXT_DATETIME, _encode_datetime(value))
+
+    if isinstance(value, type) and issubclass(value, Model):
+        return msgpack.ExtType(EXT_MODEL, value._meta.label.encode("utf-8"))
+
+    if isinstance(value, Model):
+        # Only the fields that were loaded, deferred fields stay deferred.
+        fields = [f for f in value._meta.concrete_fields if f.attname in value.__dict__]
+        data = [
+            value._meta.label,
+            value._state.db,
+            [f.attname for f in fields],
+            [value.__dict__[f.attname] for f in fields],
+        ]
+        return msgpack.ExtType(EXT_MODEL_INSTANCE, _packb(data))
+
+    return _pickled(value)
+
+
+def _pickled(value):
+    return msgpack.ExtType(EXT_PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _ext_hook(code, data):
+    if code == EXT_DATETIME:
+        return _decode_datetime(data)
+
+    if code == EXT_MODEL:
+        return apps.get_model(data.decode("utf-8"))
+
+    if code == EXT_MODEL_INSTANCE:
+        label, db, field_names, values = _unpackb(data)
+        model = apps.get_model(label)
+        values_by_name = dict(zip(field_names, values))
+        # `from_db` expects the loaded values in the order of the concrete fields
+        field_names = [
+            f.attname for f in model._meta.concrete_fields if f.attname in values_by_name
+        ]
+        return model.from_db(db, field_names, [values_by_name[name] for name in field_names])
+
+    if code == EXT_PICKLE:
+        return pickle.loads(data)
+
+    return msgpack.ExtType(code, data)
+
+
+def _packb(value):
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+
+def _unpackb(data):
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def dumps(value, compression_threshold=None):
+    """
+    Encodes a value, compressing it if its encoded size is larger than
+    ``compression_threshold`` bytes.
+    """
+    try:
+        data = _packb(value)
+    except OverflowError:
+        # Integers msgpack can't represent, fall back to pickling the whole value
+        data = _packb(_pickled(value))
+    if compression_threshold is not None and len(data) > compression_threshold:
+        return FORMAT_ZSTD + zstandard.ZstdCompressor().compress(data)
+    return FORMAT_PLAIN + data
+
+
+def loads(data):
+    data = memoryview(data)
+    if data[:1] == FORMAT_ZSTD:
+        return _unpackb(zstandard.ZstdDecompressor().decompress(data[1:]))
+    return _unpackb(data[1:])
+
+
+def register_serializers():
+    register(
+        SERIALIZER,
+        dumps,
+        loads,
+        content_type="application/x-sentry-msgpack",
+        content_encoding="binary",
+    )
+    register(
+        COMPRESSED_SERIALIZER,
+        lambda value: dumps(value, settings.SENTRY_CELERY_COMPRESSION_THRESHOLD),
+        loads,
+        content_type="application/x-sentry-msgpack-zstd",
+        content_encoding="binary",
+    )
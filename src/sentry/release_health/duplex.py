@@ -1,5 +1,10 @@
 import collections.abc
 import math
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from enum import Enum
@@ -19,10 +24,11 @@ from typing import (
 
 import pytz
 from dateutil import parser
-from sentry_sdk import capture_exception, capture_message, push_scope, set_context, set_tag
+from django.db import close_old_connections
+from sentry_sdk import Hub, capture_exception, capture_message, push_scope, set_context, set_tag
 from typing_extensions import Literal
 
-from sentry import features
+from sentry import features, options
 from sentry.models import Organization, Project
 from sentry.release_health.base import (
     CrashFreeBreakdown,
@@ -430,11 +436,26 @@ def compare_results(
 
 
 class DuplexReleaseHealthBackend(ReleaseHealthBackend):
+    """
+    Serves release health from the sessions backend, and for organizations
+    with ``organizations:release-health-check-metrics`` also runs the same
+    call against the metrics backend to compare the results.
+
+    The metrics ("shadow") call and the comparison run in a bounded thread
+    pool off the request thread, so the result of the sessions backend is
+    returned as soon as it is ready. Shadow calls are dropped when the pool
+    is saturated, when they take longer than ``shadow_timeout`` seconds, or
+    when they are not sampled (``release-health.duplex.sample-rates``). With
+    ``shadow_workers=0`` they run inline after the sessions call.
+    """
+
     DEFAULT_ROLLUP = 60 * 60  # 1h
 
     def __init__(
         self,
         metrics_start: datetime,
+        shadow_workers: int = 4,
+        shadow_timeout: float = 30.0,
     ):
         self.sessions = SessionsReleaseHealthBackend()
         self.metrics = MetricsReleaseHealthBackend()
@@ -448,6 +469,14 @@ class DuplexReleaseHealthBackend(ReleaseHealthBackend):
             # processes
             datetime.now(timezone.utc) - timedelta(days=89),
         )
+        self.shadow_timeout = shadow_timeout
+        self._shadow_executor = (
+            ThreadPoolExecutor(max_workers=shadow_workers, thread_name_prefix="releasehealth")
+            if shadow_workers
+            else None
+        )
+        # Bounds running and queued shadow calls, anything beyond is dropped
+        self._shadow_slots = threading.BoundedSemaphore(max(shadow_workers, 1) * 2)
 
     @staticmethod
     def _org_from_projects(projects_list: Sequence[ProjectOrRelease]) -> Optional[Organization]:
@@ -470,6 +499,121 @@ class DuplexReleaseHealthBackend(ReleaseHealthBackend):
     def _org_from_id(org_id: OrganizationId) -> Organization:
         return Organization.objects.get_from_cache(id=org_id)
 
+    @staticmethod
+    def _should_sample(fn_name: str) -> bool:
+        sample_rate = options.get("release-health.duplex.sample-rates").get(fn_name, 1.0)
+        return sample_rate >= 1.0 or random.random() < sample_rate
+
+    def _start_shadow(
+        self,
+        fn_name: str,
+        tags: Mapping[str, str],
+        rollup: int,
+        schema: Optional[Schema],
+        args: Sequence[Any],
+    ) -> Optional["Future[ReleaseHealthResult]"]:
+        """
+        Start calling ``fn_name`` on the metrics backend.
+
+        Returns a future that the caller must resolve with a copy of the
+        sessions result (or cancel), to which the metrics result is then
+        compared. Returns None if the shadow call was dropped.
+        """
+        primary: "Future[ReleaseHealthResult]" = Future()
+        hub = Hub(Hub.current)
+        started_at = time.monotonic()
+
+        def run_shadow() -> None:
+            self._run_shadow(hub, fn_name, tags, rollup, schema, args, primary, started_at)
+
+        if self._shadow_executor is None:
+            # Run inline on the calling thread as soon as the sessions result is set
+            primary.add_done_callback(lambda future: future.cancelled() or run_shadow())
+            return primary
+
+        if not self._shadow_slots.acquire(blocking=False):
+            incr(
+                "releasehealth.metrics.shadow",
+                tags={"result": "dropped", "reason": "saturated", **tags},
+                sample_rate=1.0,
+            )
+            return None
+
+        def run() -> None:
+            try:
+                run_shadow()
+            finally:
+                self._shadow_slots.release()
+                # The metrics backend queries the database through the
+                # indexer, don't leak connections from the pool's threads.
+                close_old_connections()
+
+        self._shadow_executor.submit(run)
+        return primary
+
+    def _run_shadow(
+        self,
+        hub: Hub,
+        fn_name: str,
+        tags: Mapping[str, str],
+        rollup: int,
+        schema: Optional[Schema],
+        args: Sequence[Any],
+        primary: "Future[ReleaseHealthResult]",
+        started_at: float,
+    ) -> None:
+        with hub, hub.push_scope():
+            try:
+                metrics_fn = getattr(self.metrics, fn_name)
+                with timer("releasehealth.metrics.duration", tags=tags, sample_rate=1.0):
+                    metrics_val = metrics_fn(*args)
+
+                try:
+                    remaining = self.shadow_timeout - (time.monotonic() - started_at)
+                    sessions_val = primary.result(timeout=max(remaining, 0))
+                except CancelledError:
+                    # The sessions call failed or decided not to compare
+                    return
+
+                if time.monotonic() - started_at > self.shadow_timeout:
+                    raise FutureTimeoutError()
+
+                set_context("release-health-duplex-sessions", {"sessions": sessions_val})
+                set_context("release-health-duplex-metrics", {"metrics": metrics_val})
+
+                with timer("releasehealth.results-diff.duration", tags=tags, sample_rate=1.0):
+                    errors = compare_results(sessions_val, metrics_val, rollup, None, schema)
+
+                set_context("release-health-duplex-errors", {"errors": errors})
+
+                incr(
+                    "releasehealth.metrics.compare",
+                    tags={"has_errors": str(bool(errors)), **tags},
+                    sample_rate=1.0,
+                )
+                if errors:
+                    # We heavily rely on Sentry's message sanitization to properly deduplicate this
+                    capture_message(f"{fn_name} - Release health metrics mismatch: {errors[0]}")
+
+                incr(
+                    "releasehealth.metrics.shadow",
+                    tags={"result": "completed", **tags},
+                    sample_rate=1.0,
+                )
+            except FutureTimeoutError:
+                incr(
+                    "releasehealth.metrics.shadow",
+                    tags={"result": "dropped", "reason": "timeout", **tags},
+                    sample_rate=1.0,
+                )
+            except Exception:
+                capture_exception()
+                incr(
+                    "releasehealth.metrics.crashed",
+                    tags=tags,
+                    sample_rate=1.0,
+                )
+
     def _dispatch_call_inner(
         self,
         fn_name: str,
@@ -488,21 +632,31 @@ class DuplexReleaseHealthBackend(ReleaseHealthBackend):
         set_tag("releasehealth.duplex.org_id", str(getattr(organization, "id")))
 
         tags = {"method": fn_name, "rollup": str(rollup)}
-        with timer("releasehealth.sessions.duration", tags=tags, sample_rate=1.0):
-            ret_val = sessions_fn(*args)
 
-        if organization is None or not features.has(
-            "organizations:release-health-check-metrics", organization
-        ):
-            return ret_val  # cannot check feature without organization
-
-        set_context(
-            "release-health-duplex-sessions",
-            {
-                "sessions": ret_val,
-            },
+        check_metrics = (
+            organization is not None
+            and should_compare is not False
+            and features.has("organizations:release-health-check-metrics", organization)
+            and self._should_sample(fn_name)
         )
 
+        # If the decision to compare doesn't depend on the sessions result,
+        # query the metrics backend concurrently with the sessions backend.
+        primary = None
+        if check_metrics and should_compare is True:
+            primary = self._start_shadow(fn_name, tags, rollup, schema, args)
+
+        try:
+            with timer("releasehealth.sessions.duration", tags=tags, sample_rate=1.0):
+                ret_val = sessions_fn(*args)
+        except Exception:
+            if primary is not None:
+                primary.cancel()
+            raise
+
+        if not check_metrics:
+            return ret_val
+
         try:
             if not isinstance(should_compare, bool):
                 # should compare depends on the session result
@@ -516,32 +670,20 @@ class DuplexReleaseHealthBackend(ReleaseHealthBackend):
             )
 
             if not should_compare:
+                if primary is not None:
+                    primary.cancel()
                 return ret_val
 
-            copy = deepcopy(ret_val)
-
-            metrics_fn = getattr(self.metrics, fn_name)
-            with timer("releasehealth.metrics.duration", tags=tags, sample_rate=1.0):
-                metrics_val = metrics_fn(*args)
-
-            set_context("release-health-duplex-metrics", {"metrics": metrics_val})
+            if primary is None:
+                primary = self._start_shadow(fn_name, tags, rollup, schema, args)
 
-            with timer("releasehealth.results-diff.duration", tags=tags, sample_rate=1.0):
-                errors = compare_results(copy, metrics_val, rollup, None, schema)
-
-            set_context("release-health-duplex-errors", {"errors": errors})
-
-            incr(
-                "releasehealth.metrics.compare",
-                tags={"has_errors": str(bool(errors)), **tags},
-                sample_rate=1.0,
-            )
-            if errors:
-                # We heavily rely on Sentry's message sanitization to properly deduplicate this
-                capture_message(f"{fn_name} - Release health metrics mismatch: {errors[0]}")
+            if primary is not None:
+                # The caller may mutate the result while it's being compared
+                primary.set_result(deepcopy(ret_val))
         except Exception:
             capture_exception()
-            should_compare = False
+            if primary is not None and not primary.done():
+                primary.cancel()
             incr(
                 "releasehealth.metrics.crashed",
                 tags=tags,
@@ -93,6 +93,7 @@ from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.deletions.defaults.group import DIRECT_GROUP_RELATED_MODELS
 from sentry.eventstore.models import Event
 from sentry.eventstore.processing import event_processing_store
+from sentry.grouping.grouphash_cache import grouphash_cache
 from sentry.utils import json, metrics, snuba
 from sentry.utils.cache import cache_key_for_event
 from sentry.utils.dates import to_datetime, to_timestamp
@@ -611,6 +612,8 @@ def start_group_reprocessing(
         for model in GROUP_MODELS_TO_MIGRATE:
             model.objects.filter(group_id=group_id).update(group_id=new_group.id)
 
+    grouphash_cache.invalidate([project_id])
+
     # Get event counts of issue (for all environments etc). This was copypasted
     # and simplified from groupserializer.
     event_count = sync_count = snuba.aliased_query(
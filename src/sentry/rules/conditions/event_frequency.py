@@ -1,5 +1,6 @@
 import logging
 import re
+from collections import defaultdict, namedtuple
 from datetime import timedelta
 
 from django import forms
@@ -36,6 +37,10 @@ comparison_types = {
     COMPARISON_TYPE_PERCENT: COMPARISON_TYPE_PERCENT,
 }
 
+# A TSDB query a frequency condition makes for the group of an event, see
+# `BaseEventFrequencyCondition.get_tsdb_queries`.
+TSDBQuery = namedtuple("TSDBQuery", ["method", "model", "start", "end", "environment_id"])
+
 
 class EventFrequencyForm(forms.Form):
     intervals = standard_intervals
@@ -82,8 +87,17 @@ class BaseEventFrequencyCondition(EventCondition):
     form_cls = EventFrequencyForm
     label = NotImplemented  # subclass must implement
 
+    #: The TSDB method and model (by name) counting what the condition
+    #: compares against its value.
+    tsdb_method = "get_sums"
+    tsdb_model = "group"
+
     def __init__(self, *args, **kwargs):
         self.tsdb = kwargs.pop("tsdb", tsdb)
+        # Results of TSDB queries fetched ahead of time with `fetch_tsdb_queries`,
+        # and the time they were fetched for.
+        self.tsdb_results = kwargs.pop("tsdb_results", None)
+        self.now = kwargs.pop("now", None)
         self.form_fields = {
             "value": {"type": "number", "placeholder": 100},
             "interval": {
@@ -128,9 +142,45 @@ class BaseEventFrequencyCondition(EventCondition):
         """ """
         raise NotImplementedError  # subclass must implement
 
+    def query_tsdb(self, event, start, end, environment_id):
+        """
+        Counts what the condition compares against in the given range, taking
+        the count from the prefetched results if possible.
+        """
+        query = TSDBQuery(
+            self.tsdb_method, getattr(self.tsdb.models, self.tsdb_model), start, end, environment_id
+        )
+        if self.tsdb_results is not None and query in self.tsdb_results:
+            return self.tsdb_results[query]
+        return _run_tsdb_query(self.tsdb, query, event.group_id)
+
+    def get_tsdb_queries(self, event):
+        """
+        Returns the TSDB queries evaluating the condition makes, so they can be
+        fetched at once with those of other conditions by `fetch_tsdb_queries`.
+        The ranges end at ``self.now``.
+        """
+        interval = self.get_option("interval")
+        if not interval or interval not in self.intervals or self.now is None:
+            return []
+
+        _, duration = self.intervals[interval]
+        ranges = [(self.now - duration, self.now)]
+        if self.get_option("comparisonType", COMPARISON_TYPE_COUNT) == COMPARISON_TYPE_PERCENT:
+            comparison_interval = comparison_intervals.get(self.get_option("comparisonInterval"))
+            if comparison_interval is not None:
+                comparison_end = self.now - comparison_interval[1]
+                ranges.append((comparison_end - duration, comparison_end))
+
+        model = getattr(self.tsdb.models, self.tsdb_model)
+        return [
+            TSDBQuery(self.tsdb_method, model, start, end, self.rule.environment_id)
+            for start, end in ranges
+        ]
+
     def get_rate(self, event, interval, environment_id):
         _, duration = self.intervals[interval]
-        end = timezone.now()
+        end = self.now if self.now is not None else timezone.now()
         result = self.query(event, end - duration, end, environment_id=environment_id)
         comparison_type = self.get_option("comparisonType", COMPARISON_TYPE_COUNT)
         if comparison_type == COMPARISON_TYPE_PERCENT:
@@ -162,32 +212,60 @@ class BaseEventFrequencyCondition(EventCondition):
         return delta.total_seconds() < 30 and self.rule.label == DEFAULT_RULE_LABEL
 
 
+def _run_tsdb_query(tsdb, query, group_id):
+    return getattr(tsdb, query.method)(
+        model=query.model,
+        keys=[group_id],
+        start=query.start,
+        end=query.end,
+        environment_id=query.environment_id,
+        use_cache=True,
+    )[group_id]
+
+
+def fetch_tsdb_queries(tsdb, group_id, queries):
+    """
+    Runs the TSDB queries of several frequency conditions for a group, and
+    returns a mapping of query to result. Each distinct query runs once, and
+    the sums of all ranges of a model and environment are fetched by a single
+    `get_sums_for_ranges` call.
+    """
+    results = {}
+    sums = defaultdict(list)
+    for query in set(queries):
+        if query.method == "get_sums":
+            sums[(query.model, query.environment_id)].append(query)
+        else:
+            results[query] = _run_tsdb_query(tsdb, query, group_id)
+
+    for (model, environment_id), queries in sums.items():
+        values = tsdb.get_sums_for_ranges(
+            model=model,
+            keys=[group_id],
+            ranges=[(query.start, query.end) for query in queries],
+            environment_id=environment_id,
+            use_cache=True,
+        )
+        for query, value in zip(queries, values):
+            results[query] = value[group_id]
+
+    return results
+
+
 class EventFrequencyCondition(BaseEventFrequencyCondition):
     label = "The issue is seen more than {value} times in {interval}"
 
     def query_hook(self, event, start, end, environment_id):
-        return self.tsdb.get_sums(
-            model=self.tsdb.models.group,
-            keys=[event.group_id],
-            start=start,
-            end=end,
-            environment_id=environment_id,
-            use_cache=True,
-        )[event.group_id]
+        return self.query_tsdb(event, start, end, environment_id)
 
 
 class EventUniqueUserFrequencyCondition(BaseEventFrequencyCondition):
     label = "The issue is seen by more than {value} users in {interval}"
+    tsdb_method = "get_distinct_counts_totals"
+    tsdb_model = "users_affected_by_group"
 
     def query_hook(self, event, start, end, environment_id):
-        return self.tsdb.get_distinct_counts_totals(
-            model=self.tsdb.models.users_affected_by_group,
-            keys=[event.group_id],
-            start=start,
-            end=end,
-            environment_id=environment_id,
-            use_cache=True,
-        )[event.group_id]
+        return self.query_tsdb(event, start, end, environment_id)
 
 
 percent_intervals = {
@@ -273,14 +351,7 @@ class EventFrequencyPercentCondition(BaseEventFrequencyCondition):
                 percent_intervals[self.get_option("interval")][1].total_seconds() // 60
             )
             avg_sessions_in_interval = session_count_last_hour / (60 / interval_in_minutes)
-            issue_count = self.tsdb.get_sums(
-                model=self.tsdb.models.group,
-                keys=[event.group_id],
-                start=start,
-                end=end,
-                environment_id=environment_id,
-                use_cache=True,
-            )[event.group_id]
+            issue_count = self.query_tsdb(event, start, end, environment_id)
             if issue_count > avg_sessions_in_interval:
                 # We want to better understand when and why this is happening, so we're logging it for now
                 self.logger.info(
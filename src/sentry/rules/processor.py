@@ -2,14 +2,17 @@ import logging
 from collections import namedtuple
 from datetime import timedelta
 from random import randrange
-from typing import Mapping, Sequence, Set
+from typing import Mapping, Sequence, Set, Union
 
+from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 
-from sentry import analytics
+from sentry import analytics, tsdb
 from sentry.models import GroupRuleStatus, Rule
 from sentry.rules import EventState, rules
+from sentry.rules.conditions.event_frequency import BaseEventFrequencyCondition, fetch_tsdb_queries
+from sentry.rules.status import StoredRuleStatus, rule_status_store
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import safe_execute
 
@@ -20,7 +23,9 @@ SLOW_CONDITION_MATCHES = ["event_frequency"]
 class RuleProcessor:
     logger = logging.getLogger("sentry.rules")
 
-    def __init__(self, event, is_new, is_regression, is_new_group_environment, has_reappeared):
+    def __init__(
+        self, event, is_new, is_regression, is_new_group_environment, has_reappeared, rules=None
+    ):
         self.event = event
         self.group = event.group
         self.project = event.project
@@ -30,20 +35,37 @@ class RuleProcessor:
         self.is_new_group_environment = is_new_group_environment
         self.has_reappeared = has_reappeared
 
+        # The rules of the project if they were fetched already, see `get_rules`
+        self.rules = rules
+
         self.grouped_futures = {}
 
+        # Rules whose frequency conditions are fetched on the first evaluation
+        # of any of them, and the results of their TSDB queries, see
+        # `fetch_frequency_conditions`
+        self.frequency_rules = None
+        self.tsdb_results = None
+        self.tsdb_results_time = None
+
     def get_rules(self):
         """
         Get all of the rules for this project from the DB (or cache).
 
         :return: a list of `Rule`s
         """
+        if self.rules is not None:
+            return self.rules
         return Rule.get_for_project(self.project.id)
 
     def _build_rule_status_cache_key(self, rule_id: int) -> str:
         return "grouprulestatus:1:%s" % hash_values([self.group.id, rule_id])
 
-    def bulk_get_rule_status(self, rules: Sequence[Rule]) -> Mapping[int, GroupRuleStatus]:
+    def bulk_get_rule_status(
+        self, rules: Sequence[Rule]
+    ) -> Mapping[int, Union[GroupRuleStatus, StoredRuleStatus]]:
+        if settings.SENTRY_RULE_STATUS_REDIS_ENABLED:
+            return rule_status_store.get_many(self.group, [rule.id for rule in rules])
+
         keys = [self._build_rule_status_cache_key(rule.id) for rule in rules]
         cache_results: Mapping[str, GroupRuleStatus] = cache.get_many(keys)
         missing_rule_ids: Set[int] = set()
@@ -101,13 +123,71 @@ class RuleProcessor:
 
         return rule_statuses
 
+    def is_rule_active(self, rule, status, now):
+        """
+        Whether the rule applies to the event's environment and hasn't fired
+        for the group within its frequency.
+        """
+        if (
+            rule.environment_id is not None
+            and self.event.get_environment().id != rule.environment_id
+        ):
+            return False
+
+        frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
+        freq_offset = now - timedelta(minutes=frequency)
+        return not (status.last_active and status.last_active > freq_offset)
+
+    def fetch_frequency_conditions(self, rule_list):
+        """
+        Fetches what the frequency conditions of the given rules compare
+        against in as few TSDB queries as possible. This is done when the
+        first frequency condition is evaluated, so that no queries are made if
+        cheaper conditions or filters already decide every rule.
+        """
+        self.tsdb_results = self.tsdb_results_time = None
+
+        now = timezone.now()
+        queries = []
+        for rule in rule_list:
+            for condition in rule.data.get("conditions", ()):
+                condition_cls = rules.get(condition["id"])
+                if condition_cls is None:
+                    continue
+                if not issubclass(condition_cls, BaseEventFrequencyCondition):
+                    continue
+
+                condition_inst = condition_cls(self.project, data=condition, rule=rule, now=now)
+                queries.extend(condition_inst.get_tsdb_queries(self.event))
+
+        if not queries:
+            return
+
+        # If fetching fails, every condition queries on its own
+        self.tsdb_results = safe_execute(
+            fetch_tsdb_queries,
+            tsdb,
+            self.group.id,
+            queries,
+            _with_transaction=False,
+        )
+        self.tsdb_results_time = now
+
     def condition_matches(self, condition, state, rule):
         condition_cls = rules.get(condition["id"])
         if condition_cls is None:
             self.logger.warning("Unregistered condition %r", condition["id"])
             return
 
-        condition_inst = condition_cls(self.project, data=condition, rule=rule)
+        kwargs = {}
+        if issubclass(condition_cls, BaseEventFrequencyCondition):
+            if self.frequency_rules is not None:
+                rule_list, self.frequency_rules = self.frequency_rules, None
+                self.fetch_frequency_conditions(rule_list)
+            if self.tsdb_results is not None:
+                kwargs = {"tsdb_results": self.tsdb_results, "now": self.tsdb_results_time}
+
+        condition_inst = condition_cls(self.project, data=condition, rule=rule, **kwargs)
         return safe_execute(condition_inst.passes, self.event, state, _with_transaction=False)
 
     def get_rule_type(self, condition):
@@ -147,16 +227,11 @@ class RuleProcessor:
         rule_condition_list = rule.data.get("conditions", ())
         frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
 
-        if (
-            rule.environment_id is not None
-            and self.event.get_environment().id != rule.environment_id
-        ):
+        now = timezone.now()
+        if not self.is_rule_active(rule, status, now):
             return
 
-        now = timezone.now()
         freq_offset = now - timedelta(minutes=frequency)
-        if status.last_active and status.last_active > freq_offset:
-            return
 
         state = self.get_state()
 
@@ -192,11 +267,14 @@ class RuleProcessor:
                 )
                 return
 
-        updated = (
-            GroupRuleStatus.objects.filter(id=status.id)
-            .exclude(last_active__gt=freq_offset)
-            .update(last_active=now)
-        )
+        if settings.SENTRY_RULE_STATUS_REDIS_ENABLED:
+            updated = rule_status_store.mark_active(self.group, rule.id, now, freq_offset)
+        else:
+            updated = (
+                GroupRuleStatus.objects.filter(id=status.id)
+                .exclude(last_active__gt=freq_offset)
+                .update(last_active=now)
+            )
 
         if not updated:
             return
@@ -241,6 +319,11 @@ class RuleProcessor:
         self.grouped_futures.clear()
         rules = self.get_rules()
         rule_statuses = self.bulk_get_rule_status(rules)
+        now = timezone.now()
+        self.frequency_rules = [
+            rule for rule in rules if self.is_rule_active(rule, rule_statuses[rule.id], now)
+        ]
+        self.tsdb_results = self.tsdb_results_time = None
         for rule in rules:
             self.apply_rule(rule, rule_statuses[rule.id])
         return self.grouped_futures.values()
@@ -0,0 +1,186 @@
+"""
+The state of the rules of groups that decides how often their actions fire,
+kept in Redis rather than in ``GroupRuleStatus`` rows.
+
+The statuses of all rules of a group are kept in a single hash, which is
+seeded from ``GroupRuleStatus`` rows the first time a rule is evaluated for
+the group. Marking a rule as active is a compare-and-set on the hash, which
+replaces the conditional update of the row. Rules that were marked as active
+are queued, and written to ``GroupRuleStatus`` rows in batches by the
+``sentry.tasks.rule_status.persist_rule_statuses`` task.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from typing import Mapping, Sequence
+
+from django.conf import settings
+from django.utils import timezone
+
+from sentry.models import Group, GroupRuleStatus, Rule
+from sentry.utils.redis import load_script, redis_clusters
+
+StoredRuleStatus = namedtuple("StoredRuleStatus", ["rule_id", "status", "last_active"])
+
+mark_active_script = load_script("rules/mark_active.lua")
+
+
+def _to_timestamp(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+def _encode_status(status: StoredRuleStatus) -> str:
+    last_active = "" if status.last_active is None else _to_timestamp(status.last_active)
+    return f"{status.status}:{last_active}"
+
+
+def _decode_status(rule_id: int, value: str) -> StoredRuleStatus:
+    status, last_active = value.split(":")
+    return StoredRuleStatus(
+        rule_id,
+        int(status),
+        datetime.fromtimestamp(int(last_active) / 1000.0, timezone.utc) if last_active else None,
+    )
+
+
+class RedisRuleStatusStore:
+    def __init__(self, cluster: str, ttl: int) -> None:
+        self.cluster = cluster
+        self.ttl = ttl
+
+    def _get_client(self):
+        return redis_clusters.get(self.cluster)
+
+    def _get_key(self, group_id: int) -> str:
+        return f"grs:{{{group_id}}}"
+
+    def _get_pending_key(self) -> str:
+        return "grs:pending"
+
+    def get_many(self, group: Group, rule_ids: Sequence[int]) -> Mapping[int, StoredRuleStatus]:
+        """
+        Returns the statuses of the given rules for the group as a mapping of
+        rule ID to ``StoredRuleStatus``.
+        """
+        client = self._get_client()
+        key = self._get_key(group.id)
+
+        statuses = {}
+        missing = []
+        values = client.hmget(key, rule_ids) if rule_ids else []
+        for rule_id, value in zip(rule_ids, values):
+            if value is None:
+                missing.append(rule_id)
+            else:
+                statuses[rule_id] = _decode_status(rule_id, value)
+
+        if missing:
+            seeded = {
+                rule_id: StoredRuleStatus(rule_id, status, last_active)
+                for rule_id, status, last_active in GroupRuleStatus.objects.filter(
+                    group_id=group.id, rule_id__in=missing
+                ).values_list("rule_id", "status", "last_active")
+            }
+            for rule_id in missing:
+                if rule_id not in seeded:
+                    seeded[rule_id] = StoredRuleStatus(rule_id, GroupRuleStatus.ACTIVE, None)
+
+            # Fields that were set in the meantime were set by marking the rule
+            # as active, and are newer than the rows.
+            pipeline = client.pipeline()
+            for rule_id, status in seeded.items():
+                pipeline.hsetnx(key, rule_id, _encode_status(status))
+            pipeline.expire(key, self.ttl)
+            pipeline.execute()
+
+            statuses.update(seeded)
+
+        return statuses
+
+    def mark_active(
+        self, group: Group, rule_id: int, now: datetime, window_start: datetime
+    ) -> bool:
+        """
+        Marks the rule as active for the group unless it has been active since
+        ``window_start``. Returns whether the rule was marked as active.
+        """
+        client = self._get_client()
+        updated = mark_active_script(
+            client,
+            [self._get_key(group.id)],
+            [rule_id, _to_timestamp(window_start), _to_timestamp(now), self.ttl],
+        )
+        if not updated:
+            return False
+
+        client.sadd(self._get_pending_key(), f"{group.project_id}:{group.id}:{rule_id}")
+        return True
+
+    def persist_pending(self, batch_size: int) -> int:
+        """
+        Writes the statuses of up to ``batch_size`` rules that were marked as
+        active to ``GroupRuleStatus`` rows, and returns how many there were.
+        """
+        client = self._get_client()
+        members = client.spop(self._get_pending_key(), batch_size)
+        if not members:
+            return 0
+
+        pending = [tuple(int(i) for i in member.split(":")) for member in members]
+
+        pipeline = client.pipeline()
+        for project_id, group_id, rule_id in pending:
+            pipeline.hget(self._get_key(group_id), rule_id)
+        values = pipeline.execute()
+
+        # Statuses that expired in the meantime can't be newer than the rows.
+        statuses = {
+            (group_id, rule_id): (project_id, _decode_status(rule_id, value))
+            for (project_id, group_id, rule_id), value in zip(pending, values)
+            if value is not None
+        }
+        if not statuses:
+            return len(pending)
+
+        group_ids = {group_id for group_id, rule_id in statuses}
+        rule_ids = {rule_id for group_id, rule_id in statuses}
+
+        rows = []
+        for row in GroupRuleStatus.objects.filter(group_id__in=group_ids, rule_id__in=rule_ids):
+            project_id, status = statuses.pop((row.group_id, row.rule_id), (None, None))
+            if status is not None:
+                row.status = status.status
+                row.last_active = status.last_active
+                rows.append(row)
+        GroupRuleStatus.objects.bulk_update(rows, ["status", "last_active"])
+
+        if statuses:
+            # Skip groups and rules that were deleted in the meantime
+            existing_group_ids = set(
+                Group.objects.filter(id__in=group_ids).values_list("id", flat=True)
+            )
+            existing_rule_ids = set(
+                Rule.objects.filter(id__in=rule_ids).values_list("id", flat=True)
+            )
+            GroupRuleStatus.objects.bulk_create(
+                [
+                    GroupRuleStatus(
+                        project_id=project_id,
+                        group_id=group_id,
+                        rule_id=rule_id,
+                        status=status.status,
+                        last_active=status.last_active,
+                    )
+                    for (group_id, rule_id), (project_id, status) in statuses.items()
+                    if group_id in existing_group_ids and rule_id in existing_rule_ids
+                ],
+                ignore_conflicts=True,
+            )
+
+        return len(pending)
+
+
+rule_status_store = RedisRuleStatusStore(
+    cluster=settings.SENTRY_RULE_STATUS_REDIS_CLUSTER,
+    ttl=settings.SENTRY_RULE_STATUS_TTL,
+)
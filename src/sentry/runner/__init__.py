@@ -62,6 +62,7 @@ for cmd in map(
         "sentry.runner.commands.killswitches.killswitches",
         "sentry.runner.commands.migrations.migrations",
         "sentry.runner.commands.plugins.plugins",
+        "sentry.runner.commands.profile_imports.profile_imports",
         "sentry.runner.commands.queues.queues",
         "sentry.runner.commands.repair.repair",
         "sentry.runner.commands.run.run",
@@ -0,0 +1,75 @@
+import re
+import resource
+import subprocess
+import sys
+import time
+
+import click
+
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+BOOT_SCRIPT = """
+from sentry.runner import configure
+
+configure()
+"""
+
+
+def parse_import_times(lines):
+    """
+    Parses the output of ``python -X importtime`` into a list of
+    ``(module, self_us, cumulative_us)`` tuples. Unrelated lines are skipped.
+    """
+    rv = []
+    for line in lines:
+        match = IMPORT_TIME_RE.match(line)
+        if match is not None:
+            self_us, cumulative_us, _, module = match.groups()
+            rv.append((module, int(self_us), int(cumulative_us)))
+    return rv
+
+
+@click.command("profile-imports")
+@click.option("--limit", "-n", default=30, show_default=True, help="Number of imports to report.")
+@click.option(
+    "--sort",
+    type=click.Choice(["cumulative", "self"]),
+    default="cumulative",
+    show_default=True,
+    help="Whether to rank imports including the modules they import, or by themselves.",
+)
+@click.argument("modules", nargs=-1)
+def profile_imports(limit, sort, modules):
+    """Report the slowest imports when starting Sentry.
+
+    Sentry is configured in a separate interpreter with import time profiling
+    enabled. Any MODULES given are imported afterwards, which is useful to
+    profile what a service imports on top of the initialization.
+    """
+    script = BOOT_SCRIPT + "".join(f"import {module}\n" for module in modules)
+
+    start = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    duration = time.monotonic() - start
+    if result.returncode != 0:
+        click.echo(result.stderr, err=True)
+        raise click.ClickException("Failed to start Sentry.")
+
+    import_times = parse_import_times(result.stderr.splitlines())
+    index = 1 if sort == "self" else 2
+    import_times.sort(key=lambda item: item[index], reverse=True)
+
+    click.echo(f"{'cumulative (ms)':>16} {'self (ms)':>10}  module")
+    for module, self_us, cumulative_us in import_times[:limit]:
+        click.echo(f"{cumulative_us / 1000:>16.1f} {self_us / 1000:>10.1f}  {module}")
+
+    # ru_maxrss is in kilobytes on Linux
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    click.echo(
+        f"\n{len(import_times)} modules imported, "
+        f"started in {duration:.2f}s using {max_rss / 1024:.0f} MB"
+    )
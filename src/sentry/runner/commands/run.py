@@ -219,6 +219,11 @@ def run_worker(**options):
 def worker(ignore_unknown_queues, **options):
     """Run background worker instance and autoreload if necessary."""
 
+    from sentry.plugins.base import plugins
+
+    # Plugins can contribute queues and task imports
+    plugins.load()
+
     from sentry.celery import app
 
     known_queues = frozenset(c_queue.name for c_queue in app.conf.CELERY_QUEUES)
@@ -282,6 +287,11 @@ def cron(**options):
             "Disable CELERY_ALWAYS_EAGER in your settings file to spawn workers."
         )
 
+    from sentry.plugins.base import plugins
+
+    # Plugins can contribute periodic tasks
+    plugins.load()
+
     from sentry.celery import app
 
     with managed_bgtasks(role="cron"):
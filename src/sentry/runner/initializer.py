@@ -16,7 +16,11 @@ logger = logging.getLogger("sentry.runner.initializer")
 def register_plugins(settings, raise_on_plugin_load_failure=False):
     from pkg_resources import iter_entry_points
 
-    from sentry.plugins.base import plugins
+    from sentry import integrations
+    from sentry.plugins.base import bindings, plugins
+
+    # Failures can only be raised here if plugins are imported up front
+    lazy = settings.SENTRY_LAZY_PLUGINS and not raise_on_plugin_load_failure
 
     # entry_points={
     #    'sentry.plugins': [
@@ -24,6 +28,10 @@ def register_plugins(settings, raise_on_plugin_load_failure=False):
     #     ],
     # },
     for ep in iter_entry_points("sentry.plugins"):
+        if lazy:
+            plugins.register_lazy(ep.name, ep.load, init_plugin)
+            continue
+
         try:
             plugin = ep.load()
         except Exception:
@@ -35,13 +43,17 @@ def register_plugins(settings, raise_on_plugin_load_failure=False):
         else:
             plugins.register(plugin)
 
-    for plugin in plugins.all(version=None):
-        init_plugin(plugin)
+    if not lazy:
+        for plugin in plugins.all(version=None):
+            init_plugin(plugin)
 
-    from sentry import integrations
     from sentry.utils.imports import import_string
 
     for integration_path in settings.SENTRY_DEFAULT_INTEGRATIONS:
+        if lazy:
+            integrations.register_lazy(integration_path)
+            continue
+
         try:
             integration_cls = import_string(integration_path)
         except Exception:
@@ -54,11 +66,16 @@ def register_plugins(settings, raise_on_plugin_load_failure=False):
         else:
             integrations.register(integration_cls)
 
-    for integration in integrations.all():
-        try:
-            integration.setup()
-        except AttributeError:
-            pass
+    if not lazy:
+        for integration in integrations.all():
+            try:
+                integration.setup()
+            except AttributeError:
+                pass
+
+    # Lazily loaded plugins and integrations add their bindings when loaded
+    bindings.add_loader(plugins.load)
+    bindings.add_loader(integrations.load)
 
 
 def init_plugin(plugin):
@@ -208,6 +225,12 @@ def bootstrap_options(settings, config=None):
                 setattr(settings, options_mapper[k], v)
 
 
+def configure_json_backend(settings):
+    from sentry.utils import json
+
+    json.set_backend(settings.SENTRY_JSON_BACKEND)
+
+
 def configure_structlog():
     """
     Make structlog comply with all of our options.
@@ -306,6 +329,8 @@ def initialize_app(config, skip_service_validation=False):
 
     bootstrap_options(settings, config["options"])
 
+    configure_json_backend(settings)
+
     configure_structlog()
 
     # Commonly setups don't correctly configure themselves for production envs
@@ -358,6 +383,8 @@ def initialize_app(config, skip_service_validation=False):
 
     bind_cache_to_option_store()
 
+    warm_option_store(settings)
+
     register_plugins(settings)
 
     initialize_receivers()
@@ -521,6 +548,20 @@ def bind_cache_to_option_store():
     default_store.cache = default_cache
 
 
+def warm_option_store(settings):
+    # Cold processes otherwise pay one cache round trip (and possibly a
+    # database query) per option on first use. Optionally load all of them
+    # in bulk up front, and keep them fresh from a background thread so
+    # option reads on hot paths never block on the network.
+    from sentry.options import default_manager
+
+    if settings.SENTRY_OPTIONS_PREFETCH:
+        default_manager.warm_cache()
+
+    if settings.SENTRY_OPTIONS_REFRESH_INTERVAL:
+        default_manager.start_background_refresh(settings.SENTRY_OPTIONS_REFRESH_INTERVAL)
+
+
 def apply_legacy_settings(settings):
     from sentry import options
 
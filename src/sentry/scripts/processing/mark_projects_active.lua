@@ -0,0 +1,14 @@
+-- Record the times at which projects were last active in the index of active
+-- projects, only ever moving the score of a project forward. A worker that
+-- flushes late must not replace a newer score with an older one. This is the
+-- equivalent of ``ZADD GT``, which requires Redis 6.2.
+--
+-- KEYS = {active projects}
+-- ARGV = {project id, timestamp, project id, timestamp, ...}
+for i = 1, #ARGV, 2 do
+    local timestamp = tonumber(ARGV[i + 1])
+    local current = redis.call('ZSCORE', KEYS[1], ARGV[i])
+    if not current or tonumber(current) < timestamp then
+        redis.call('ZADD', KEYS[1], timestamp, ARGV[i])
+    end
+end
@@ -0,0 +1,31 @@
+-- Mark a rule as active for a group, unless it has already been active since
+-- the start of its frequency window. This is the Redis equivalent of updating
+-- ``GroupRuleStatus.last_active`` only where it is not after the start of the
+-- window.
+--
+-- The statuses of all rules of a group are stored in a hash, with the ID of the
+-- rule as the field and "<status>:<last active>" as the value, where the last
+-- active time is in milliseconds since the epoch and empty if the rule has
+-- never been active.
+--
+-- KEYS = {group statuses}
+-- ARGV = {rule id, start of the window, now, expiration of the hash in seconds}
+--
+-- Returns 1 if the rule was marked as active, and 0 otherwise.
+local rule_id = ARGV[1]
+local window_start = tonumber(ARGV[2])
+
+local status = "0"
+local value = redis.call('HGET', KEYS[1], rule_id)
+if value then
+    local separator = string.find(value, ":", 1, true)
+    status = string.sub(value, 1, separator - 1)
+    local last_active = tonumber(string.sub(value, separator + 1))
+    if last_active ~= nil and last_active > window_start then
+        return 0
+    end
+end
+
+redis.call('HSET', KEYS[1], rule_id, status .. ":" .. ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
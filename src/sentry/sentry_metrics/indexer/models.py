@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List, Sequence, Tuple
 
 from django.conf import settings
 from django.db import connections, models, router
@@ -32,3 +32,23 @@ class MetricsKeyIndexer(Model):  # type: ignore
             "SELECT nextval('sentry_metricskeyindexer_id_seq') from generate_series(1,%s)", [num]
         )
         return connection.fetchall()
+
+    @classmethod
+    def insert_with_ids(cls, rows: Sequence[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """
+        Insert ``(id, string)`` rows in a single statement, skipping strings
+        that already exist. Returns the rows that were actually inserted.
+        """
+        using = router.db_for_write(cls)
+        connection = connections[using].cursor()
+
+        connection.execute(
+            """
+            INSERT INTO sentry_metricskeyindexer (id, string, date_added)
+            SELECT id, string, %s FROM unnest(%s::bigint[], %s::varchar[]) AS t (id, string)
+            ON CONFLICT (string) DO NOTHING
+            RETURNING id, string
+            """,
+            [timezone.now(), [id for id, _ in rows], [string for _, string in rows]],
+        )
+        return connection.fetchall()
@@ -1,62 +1,133 @@
-from typing import Any, List, Mapping, MutableMapping, Optional, Sequence, Set
+import threading
+from collections import deque
+from typing import Any, Deque, List, Mapping, MutableMapping, Optional, Sequence, Set
+
+from django.conf import settings
 
 from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer
 from sentry.utils import metrics
+from sentry.utils.cache import LRUCache
 from sentry.utils.services import Service
 
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
 _INDEXER_CACHE_HIT_METRIC = "sentry_metrics.indexer.memcache.hit"
 _INDEXER_CACHE_MISS_METRIC = "sentry_metrics.indexer.memcache.miss"
+_INDEXER_LOCAL_CACHE_HIT_METRIC = "sentry_metrics.indexer.local_cache.hit"
+_INDEXER_LOCAL_CACHE_MISS_METRIC = "sentry_metrics.indexer.local_cache.miss"
+
+# Minimum number of IDs reserved from the sequence at once
+_ID_RESERVATION_SIZE = 1000
 
 
 class PGStringIndexer(Service):  # type: ignore
     """
     Provides integer IDs for metric names, tag keys and tag values
     and the corresponding reverse lookup.
+
+    Since the mapping between a string and its ID never changes, up to
+    ``local_cache_size`` of them (``SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE``
+    by default) are kept in process memory in front of the shared cache.
+    Each consumer process has its own local cache, which is shared by its
+    threads.
     """
 
     __all__ = ("record", "resolve", "reverse_resolve", "bulk_record")
 
-    def _bulk_record(self, unmapped_strings: Set[str]) -> Any:
-        records = [MetricsKeyIndexer(string=string) for string in unmapped_strings]
-        # We use `ignore_conflicts=True` here to avoid race conditions where metric indexer
-        # records might have be created between when we queried in `bulk_record` and the
-        # attempt to create the rows down below.
+    def __init__(self, local_cache_size: Optional[int] = None) -> None:
+        if local_cache_size is None:
+            local_cache_size = settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE
+        self._ids: LRUCache[str, int] = LRUCache(local_cache_size)
+        self._strings: LRUCache[int, str] = LRUCache(local_cache_size)
+        self._local_cache_lock = threading.Lock()
+        self._reserved_ids: Deque[int] = deque()
+        self._reserved_ids_lock = threading.Lock()
+
+    def _get_id_locally(self, string: str) -> Optional[int]:
+        with self._local_cache_lock:
+            return self._ids.get(string)
+
+    def _get_string_locally(self, id: int) -> Optional[str]:
+        with self._local_cache_lock:
+            return self._strings.get(id)
+
+    def _cache_locally(self, string: str, id: int) -> None:
+        with self._local_cache_lock:
+            self._ids.set(string, id)
+            self._strings.set(id, string)
+
+    def _reserve_ids(self, num: int) -> List[int]:
+        """
+        Take ``num`` IDs from the ones reserved by this process, reserving a
+        new range from the sequence when they run out.
+        """
+        with self._reserved_ids_lock:
+            missing = num - len(self._reserved_ids)
+            if missing > 0:
+                with metrics.timer("sentry_metrics.indexer.pg_reserve_ids"):
+                    ids = MetricsKeyIndexer.get_next_values(max(missing, _ID_RESERVATION_SIZE))
+                self._reserved_ids.extend(id for (id,) in ids)
+            return [self._reserved_ids.popleft() for _ in range(num)]
+
+    def _bulk_record(self, unmapped_strings: Set[str]) -> Mapping[str, int]:
+        # IDs are assigned up front so that the rows can be inserted and their
+        # IDs known in a single round trip.
+        rows = list(zip(self._reserve_ids(len(unmapped_strings)), unmapped_strings))
         with metrics.timer("sentry_metrics.indexer.pg_bulk_create"):
-            MetricsKeyIndexer.objects.bulk_create(records, ignore_conflicts=True)
-        # Using `ignore_conflicts=True` prevents the pk from being set on the model
-        # instances.
-        #
-        # Using `get_many_from_cache` will not only re-query the database to fetch the rows
-        # (which should all exist point at this point), but also cache the results
-        return MetricsKeyIndexer.objects.get_many_from_cache(list(unmapped_strings), key="string")
+            inserted = MetricsKeyIndexer.insert_with_ids(rows)
+        mapped_result: MutableMapping[str, int] = {string: id for id, string in inserted}
+
+        # Strings that were created between when we queried in `bulk_record` and
+        # the insert conflict and aren't returned. Their reserved IDs are lost.
+        conflicting = unmapped_strings.difference(mapped_result.keys())
+        if conflicting:
+            metrics.incr("sentry_metrics.indexer.pg_bulk_create.conflict", amount=len(conflicting))
+            mapped_result.update(
+                MetricsKeyIndexer.objects.filter(string__in=conflicting).values_list("string", "id")
+            )
+        return mapped_result
 
     def bulk_record(self, strings: List[str]) -> Mapping[str, int]:
+        mapped_result: MutableMapping[str, int] = {}
+        uncached: List[str] = []
+        for string in strings:
+            id = self._get_id_locally(string)
+            if id is None:
+                uncached.append(string)
+            else:
+                mapped_result[string] = id
+
+        metrics.incr(_INDEXER_LOCAL_CACHE_HIT_METRIC, amount=len(mapped_result))
+        metrics.incr(_INDEXER_LOCAL_CACHE_MISS_METRIC, amount=len(uncached))
+        if not uncached:
+            return mapped_result
 
         cache_results: Sequence[Any] = MetricsKeyIndexer.objects.get_many_from_cache(
-            strings, key="string"
+            uncached, key="string"
         )
 
-        mapped_result: MutableMapping[str, int] = {r.string: r.id for r in cache_results}
+        for r in cache_results:
+            mapped_result[r.string] = r.id
+            self._cache_locally(r.string, r.id)
 
-        metrics.incr(_INDEXER_CACHE_FETCH_METRIC, amount=len(strings))
-        unmapped = set(strings).difference(mapped_result.keys())
+        metrics.incr(_INDEXER_CACHE_FETCH_METRIC, amount=len(uncached))
+        unmapped = set(uncached).difference(mapped_result.keys())
         if not unmapped:
             # This will probably be very rare in practice since for each batch of strings
             # it's almost certain there would be a value we haven't seen before
-            metrics.incr(_INDEXER_CACHE_HIT_METRIC, amount=len(strings))
+            metrics.incr(_INDEXER_CACHE_HIT_METRIC, amount=len(uncached))
             metrics.incr(_INDEXER_CACHE_MISS_METRIC, amount=0)
             return mapped_result
 
-        mapped = len(strings) - len(unmapped)
+        mapped = len(uncached) - len(unmapped)
         metrics.incr(_INDEXER_CACHE_HIT_METRIC, amount=mapped)
         metrics.incr(_INDEXER_CACHE_MISS_METRIC, amount=len(unmapped))
 
         with metrics.timer("sentry_metrics.indexer._bulk_record"):
             new_mapped = self._bulk_record(unmapped)
 
-        for new in new_mapped:
-            mapped_result[new.string] = new.id
+        for string, id in new_mapped.items():
+            mapped_result[string] = id
+            self._cache_locally(string, id)
 
         return mapped_result
 
@@ -70,11 +141,16 @@ class PGStringIndexer(Service):  # type: ignore
 
         Returns None if the entry cannot be found.
         """
+        cached_id = self._get_id_locally(string)
+        if cached_id is not None:
+            return cached_id
+
         try:
             id: int = MetricsKeyIndexer.objects.get_from_cache(string=string).id
         except MetricsKeyIndexer.DoesNotExist:
             return None
 
+        self._cache_locally(string, id)
         return id
 
     def reverse_resolve(self, id: int) -> Optional[str]:
@@ -82,9 +158,14 @@ class PGStringIndexer(Service):  # type: ignore
 
         Returns None if the entry cannot be found.
         """
+        cached_string = self._get_string_locally(id)
+        if cached_string is not None:
+            return cached_string
+
         try:
             string: str = MetricsKeyIndexer.objects.get_from_cache(pk=id).string
         except MetricsKeyIndexer.DoesNotExist:
             return None
 
+        self._cache_locally(string, id)
         return string
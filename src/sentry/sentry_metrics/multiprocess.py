@@ -3,7 +3,6 @@ import logging
 import time
 from collections import deque
 from concurrent.futures import Future
-from copy import deepcopy
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -378,23 +377,21 @@ def process_messages(
 
     with metrics.timer("process_messages.reconstruct_messages"):
         for message in outer_message.payload:
-            parsed_payload_value = parsed_payloads_by_offset[message.offset]
-            new_payload_value = deepcopy(parsed_payload_value)
-
-            metric_name = parsed_payload_value["name"]
-            tags = parsed_payload_value.get("tags", {})
-
-            new_tags: Mapping[int, int] = {mapping[k]: mapping[v] for k, v in tags.items()}
-
-            new_payload_value["tags"] = new_tags
-            new_payload_value["metric_id"] = mapping[metric_name]
+            # The parsed payloads aren't used anywhere else, so they are
+            # rewritten in place rather than copied.
+            new_payload_value = parsed_payloads_by_offset[message.offset]
+
+            # Tag keys are encoded as strings anyway, doing it here keeps the
+            # rapidjson encoder from falling back on non-string keys.
+            new_payload_value["tags"] = {
+                str(mapping[k]): mapping[v] for k, v in new_payload_value.get("tags", {}).items()
+            }
+            new_payload_value["metric_id"] = mapping[new_payload_value.pop("name")]
             new_payload_value["retention_days"] = 90
 
-            del new_payload_value["name"]
-
             new_payload = KafkaPayload(
                 key=message.payload.key,
-                value=json.dumps(new_payload_value).encode(),
+                value=json.dumps(new_payload_value, use_rapid_json=True).encode(),
                 headers=message.payload.headers,
             )
             new_message = Message(
@@ -16,7 +16,7 @@ from sentry.similarity.features import (
     get_application_chunks,
 )
 from sentry.similarity.featuresv2 import GroupingBasedFeatureSet
-from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.similarity.signatures import MinHashSignatureBuilder, SlicedMinHashSignatureBuilder
 from sentry.utils import redis
 from sentry.utils.compat import map
 from sentry.utils.datastructures import BidirectionalMapping
@@ -59,7 +59,10 @@ def get_frame_attributes(frame):
     return attributes
 
 
-def _make_index_backend(cluster, namespace="sim:1"):
+def _make_index_backend(cluster, namespace="sim:1", signature_builder=None):
+    if signature_builder is None:
+        signature_builder = MinHashSignatureBuilder(16, 0xFFFF)
+
     if isinstance(cluster, str):
         cluster_id = cluster
 
@@ -72,16 +75,24 @@ def _make_index_backend(cluster, namespace="sim:1"):
 
     return MetricsWrapper(
         RedisScriptMinHashIndexBackend(
-            cluster, namespace, MinHashSignatureBuilder(16, 0xFFFF), 8, 60 * 60 * 24 * 30, 3, 5000
+            cluster, namespace, signature_builder, 8, 60 * 60 * 24 * 30, 3, 5000
         ),
         scope_tag_name=None,
     )
 
 
+if getattr(settings, "SENTRY_SIMILARITY_SLICED_HASHING", False):
+    _signature_builder = SlicedMinHashSignatureBuilder(16, 0xFFFF)
+    _namespaces = ("sim:3", "sim:4")
+else:
+    _signature_builder = MinHashSignatureBuilder(16, 0xFFFF)
+    _namespaces = ("sim:1", "sim:2")
+
 features = FeatureSet(
     _make_index_backend(
         getattr(settings, "SENTRY_SIMILARITY_INDEX_REDIS_CLUSTER", None) or "similarity",
-        namespace="sim:1",
+        namespace=_namespaces[0],
+        signature_builder=_signature_builder,
     ),
     Encoder({Frame: get_frame_attributes}),
     BidirectionalMapping(
@@ -115,7 +126,8 @@ features2 = GroupingBasedFeatureSet(
         getattr(settings, "SENTRY_SIMILARITY2_INDEX_REDIS_CLUSTER", None)
         or getattr(settings, "SENTRY_SIMILARITY_INDEX_REDIS_CLUSTER", None)
         or "similarity",
-        namespace="sim:2",
+        namespace=_namespaces[1],
+        signature_builder=_signature_builder,
     )
 )
 
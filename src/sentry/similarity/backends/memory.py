@@ -0,0 +1,449 @@
+import fnmatch
+import threading
+import time
+from collections import defaultdict
+
+import msgpack
+from django.utils.encoding import force_text
+
+from sentry.similarity.backends.abstract import AbstractIndexBackend
+from sentry.similarity.backends.redis import as_search_result, get_buckets
+
+
+class _Frequencies:
+    """
+    How often each bucket of every band has been recorded for a key, and when
+    that record expires.
+    """
+
+    __slots__ = ("bands", "expiration")
+
+    def __init__(self, bands, expiration):
+        self.bands = [{} for _ in range(bands)]
+        self.expiration = expiration
+
+    def add(self, bands, expiration):
+        for counts, other_counts in zip(self.bands, bands):
+            for bucket, count in other_counts.items():
+                counts[bucket] = counts.get(bucket, 0) + count
+        self.expiration = expiration
+
+
+def _scale_to_total(counts):
+    total = sum(counts.values())
+    return {bucket: count / total for bucket, count in counts.items()}
+
+
+def _calculate_similarity(item_bands, candidate_bands):
+    item_empty = not item_bands[0]
+    candidate_empty = not candidate_bands[0]
+    if item_empty and candidate_empty:
+        return -1.0
+    elif item_empty or candidate_empty:
+        return -2.0
+
+    similarities = []
+    for item_counts, candidate_counts in zip(item_bands, candidate_bands):
+        # The similarity of two items is how often their contents exist in the
+        # same buckets for a band, normalized to the [0, 1] scale.
+        item_counts = _scale_to_total(item_counts)
+        candidate_counts = _scale_to_total(candidate_counts)
+        distance = sum(
+            abs(item_counts.get(bucket, 0) - candidate_counts.get(bucket, 0))
+            for bucket in item_counts.keys() | candidate_counts.keys()
+        )
+        similarities.append(1 - distance / 2)
+    # Scores are rounded the same way as the ones returned by the Redis script
+    return round(sum(similarities) / len(similarities), 6)
+
+
+class InMemoryMinHashIndexBackend(AbstractIndexBackend):
+    """
+    An index backend that keeps the index in process memory, with the same
+    behavior and scoring as ``RedisScriptMinHashIndexBackend``. The exported
+    data of both backends is interchangeable.
+
+    Members of a bucket are sampled in insertion order rather than at random
+    when a bucket has more than ``candidate_set_limit`` members. Expired data
+    is discarded when it's accessed, and by a sweep over the whole index at
+    most once per interval while recording (see ``expire``). When
+    results are limited, candidates are ranked by their average number of hits
+    over all queried indices. The script's ranking is only well-defined when
+    candidates are hit in every index, in which case both are the same.
+
+    The whole index can be persisted with ``snapshot`` and ``restore``.
+    """
+
+    def __init__(self, signature_builder, bands, interval, retention, candidate_set_limit):
+        self.signature_builder = signature_builder
+        self.bands = bands
+        self.interval = interval
+        self.retention = retention
+        self.candidate_set_limit = candidate_set_limit
+
+        self._lock = threading.RLock()
+        # (scope, index) -> {key: _Frequencies}
+        self._frequencies = defaultdict(dict)
+        # (scope, index, band, bucket) -> {interval: {key}}
+        self._members = defaultdict(lambda: defaultdict(set))
+        self._last_sweep = None
+
+    def _sweep(self, timestamp):
+        for frequencies_key, keys in list(self._frequencies.items()):
+            for key in [key for key, f in keys.items() if f.expiration <= timestamp]:
+                del keys[key]
+            if not keys:
+                del self._frequencies[frequencies_key]
+
+        window = self._get_window(timestamp)
+        for members_key, intervals in list(self._members.items()):
+            for i in [i for i, members in intervals.items() if i < window.start or not members]:
+                del intervals[i]
+            if not intervals:
+                del self._members[members_key]
+
+        self._last_sweep = timestamp
+
+    def expire(self, timestamp=None):
+        """
+        Discards all data that has expired at ``timestamp``, rather than only
+        the data that is accessed.
+        """
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        with self._lock:
+            self._sweep(timestamp)
+
+    def _get_window(self, timestamp):
+        current = timestamp // self.interval
+        return range(current - self.retention, current + 1)
+
+    def _get_frequencies(self, scope, index, key, timestamp):
+        frequencies = self._frequencies.get((scope, index), {}).get(key)
+        if frequencies is not None and frequencies.expiration <= timestamp:
+            del self._frequencies[(scope, index)][key]
+            return None
+        return frequencies
+
+    def _get_bands(self, scope, index, key, timestamp):
+        frequencies = self._get_frequencies(scope, index, key, timestamp)
+        if frequencies is None:
+            return [{} for _ in range(self.bands)]
+        return frequencies.bands
+
+    def _add_frequencies(self, scope, index, key, bands, expiration, timestamp):
+        frequencies = self._get_frequencies(scope, index, key, timestamp)
+        if frequencies is None:
+            frequencies = self._frequencies[(scope, index)][key] = _Frequencies(
+                self.bands, expiration
+            )
+        frequencies.add(bands, expiration)
+
+    def _add_member(self, scope, index, band, bucket, key, timestamp):
+        intervals = self._members[(scope, index, band, bucket)]
+        window = self._get_window(timestamp)
+        for expired in [i for i in intervals if i < window.start]:
+            del intervals[expired]
+        intervals[window.stop - 1].add(key)
+
+    def _get_members(self, scope, index, band, bucket, timestamp):
+        intervals = self._members.get((scope, index, band, bucket), {})
+        members = {}
+        for i in self._get_window(timestamp):
+            for member in intervals.get(i, ()):
+                if member not in members:
+                    members[member] = True
+                    if len(members) >= self.candidate_set_limit:
+                        return members
+        return members
+
+    def _iter_buckets(self, bands):
+        for band, counts in enumerate(bands):
+            for bucket in counts:
+                yield band, bucket
+
+    def _fetch_candidates(self, scope, index, bands, timestamp):
+        candidates = defaultdict(set)
+        for band, bucket in self._iter_buckets(bands):
+            for member in self._get_members(scope, index, band, bucket, timestamp):
+                candidates[member].add(band)
+        return {candidate: len(hits) for candidate, hits in candidates.items()}
+
+    def _search(self, scope, parameters, limit, timestamp):
+        possible_candidates = defaultdict(list)
+        for index, threshold, bands in parameters:
+            for candidate, hits in self._fetch_candidates(scope, index, bands, timestamp).items():
+                if hits >= threshold:
+                    possible_candidates[candidate].append(hits)
+
+        candidates = list(possible_candidates)
+        if limit is not None and limit >= 0 and len(candidates) > limit:
+            # Indices without hits count as 0 towards the average, see the class docstring
+            candidates.sort(
+                key=lambda candidate: (
+                    -sum(possible_candidates[candidate]) / len(parameters),
+                    -len(possible_candidates[candidate]),
+                    candidate,
+                )
+            )
+            candidates = candidates[:limit]
+
+        return as_search_result(
+            [
+                (
+                    candidate,
+                    [
+                        _calculate_similarity(
+                            bands, self._get_bands(scope, index, candidate, timestamp)
+                        )
+                        for index, _, bands in parameters
+                    ],
+                )
+                for candidate in candidates
+            ]
+        )
+
+    def _as_bands(self, buckets):
+        bands = [{} for _ in range(self.bands)]
+        if buckets is not None:
+            for counts, bucket in zip(bands, buckets):
+                counts[bucket] = 1
+        return bands
+
+    def classify(self, scope, items, limit=None, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        all_buckets = get_buckets(
+            self.signature_builder, self.bands, [features for _, _, features in items]
+        )
+        parameters = [
+            (index, threshold, self._as_bands(buckets))
+            for (index, threshold, _), buckets in zip(items, all_buckets)
+        ]
+        with self._lock:
+            return self._search(scope, parameters, limit, timestamp)
+
+    def compare(self, scope, key, items, limit=None, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        key = force_text(key)
+        with self._lock:
+            parameters = [
+                (index, threshold, self._get_bands(scope, index, key, timestamp))
+                for index, threshold in items
+            ]
+            return self._search(scope, parameters, limit, timestamp)
+
+    def record(self, scope, key, items, timestamp=None):
+        return self.record_many(scope, [(key, items)], timestamp=timestamp)
+
+    def record_many(self, scope, entries, timestamp=None):
+        """
+        Record the features of several keys at once, as ``(key, items)``
+        pairs where ``items`` are the ones that would be passed to ``record``.
+        """
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        flattened = [
+            (force_text(key), index, features)
+            for key, items in entries
+            for index, features in items
+        ]
+        all_buckets = get_buckets(
+            self.signature_builder, self.bands, [features for _, _, features in flattened]
+        )
+        expiration = timestamp + self.interval * self.retention
+
+        with self._lock:
+            if self._last_sweep is None or timestamp - self._last_sweep >= self.interval:
+                self._sweep(timestamp)
+
+            for (key, index, _), buckets in zip(flattened, all_buckets):
+                if buckets is None:
+                    # Only refreshes the expiration of existing data
+                    frequencies = self._get_frequencies(scope, index, key, timestamp)
+                    if frequencies is not None:
+                        frequencies.expiration = expiration
+                    continue
+
+                self._add_frequencies(
+                    scope, index, key, self._as_bands(buckets), expiration, timestamp
+                )
+                for band, bucket in enumerate(buckets):
+                    self._add_member(scope, index, band, bucket, key, timestamp)
+        return []
+
+    def merge(self, scope, destination, items, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        destination = force_text(destination)
+        with self._lock:
+            for index, source in items:
+                source = force_text(source)
+                assert source != destination, "cannot merge destination into itself"
+
+                frequencies = self._get_frequencies(scope, index, source, timestamp)
+                if frequencies is None:
+                    continue
+
+                del self._frequencies[(scope, index)][source]
+                destination_frequencies = self._get_frequencies(
+                    scope, index, destination, timestamp
+                )
+                expiration = frequencies.expiration
+                if destination_frequencies is not None:
+                    expiration = max(expiration, destination_frequencies.expiration)
+                self._add_frequencies(
+                    scope, index, destination, frequencies.bands, expiration, timestamp
+                )
+
+                for band, bucket in self._iter_buckets(frequencies.bands):
+                    intervals = self._members.get((scope, index, band, bucket), {})
+                    for i in self._get_window(timestamp):
+                        members = intervals.get(i)
+                        if members is not None and source in members:
+                            members.discard(source)
+                            members.add(destination)
+
+    def delete(self, scope, items, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        with self._lock:
+            for index, key in items:
+                key = force_text(key)
+                frequencies = self._get_frequencies(scope, index, key, timestamp)
+                if frequencies is None:
+                    continue
+
+                del self._frequencies[(scope, index)][key]
+                for band, bucket in self._iter_buckets(frequencies.bands):
+                    intervals = self._members.get((scope, index, band, bucket), {})
+                    for i in self._get_window(timestamp):
+                        intervals.get(i, set()).discard(key)
+
+    def scan(self, scope, indices, batch=1000, timestamp=None):
+        """
+        Yields the keys recorded in each of the indices in batches, as
+        ``(index, [(scope, key), ...])`` pairs. ``scope`` may be a glob pattern.
+        """
+        with self._lock:
+            keys = {
+                index: [
+                    (frequencies_scope, key)
+                    for (frequencies_scope, frequencies_index), frequencies in list(
+                        self._frequencies.items()
+                    )
+                    if frequencies_index == index and fnmatch.fnmatchcase(frequencies_scope, scope)
+                    for key in frequencies
+                ]
+                for index in indices
+            }
+
+        for index in indices:
+            for i in range(0, len(keys[index]), batch):
+                yield index, keys[index][i : i + batch]
+
+    def flush(self, scope, indices, batch=1000, timestamp=None):
+        indices = set(indices)
+        with self._lock:
+            for frequencies_scope, index in list(self._frequencies):
+                if index in indices and fnmatch.fnmatchcase(frequencies_scope, scope):
+                    del self._frequencies[(frequencies_scope, index)]
+
+            for members_scope, index, band, bucket in list(self._members):
+                if index in indices and fnmatch.fnmatchcase(members_scope, scope):
+                    del self._members[(members_scope, index, band, bucket)]
+
+    def export(self, scope, items, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        results = []
+        with self._lock:
+            for index, key in items:
+                key = force_text(key)
+                frequencies = self._get_frequencies(scope, index, key, timestamp)
+                if frequencies is None:
+                    results.append(msgpack.packb({}))
+                    continue
+
+                data = []
+                for band, counts in enumerate(frequencies.bands):
+                    result = {}
+                    for bucket, count in counts.items():
+                        intervals = self._members.get((scope, index, band, bucket), {})
+                        result[bucket] = [
+                            count,
+                            [i for i in self._get_window(timestamp) if key in intervals.get(i, ())],
+                        ]
+                    data.append(result)
+                results.append(msgpack.packb([data, frequencies.expiration]))
+        return results
+
+    def import_(self, scope, items, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        with self._lock:
+            for index, key, data in items:
+                key = force_text(key)
+                data = msgpack.unpackb(data, raw=False)
+                if not data:
+                    continue
+
+                data, expiration = data
+                bands = []
+                for band, counts in enumerate(data):
+                    # Empty bands may have been encoded as arrays
+                    counts = dict(counts or {})
+                    bands.append({bucket: count for bucket, (count, _) in counts.items()})
+                    for bucket, (_, intervals) in counts.items():
+                        for i in intervals:
+                            self._members[(scope, index, band, bucket)][i].add(key)
+
+                self._add_frequencies(scope, index, key, bands, expiration, timestamp)
+        return []
+
+    def snapshot(self):
+        """
+        Returns the whole index serialized, to be loaded with ``restore``.
+        """
+        with self._lock:
+            return msgpack.packb(
+                {
+                    "frequencies": [
+                        [scope, index, key, frequencies.bands, frequencies.expiration]
+                        for (scope, index), keys in self._frequencies.items()
+                        for key, frequencies in keys.items()
+                    ],
+                    "members": [
+                        [scope, index, band, bucket, i, sorted(members)]
+                        for (scope, index, band, bucket), intervals in self._members.items()
+                        for i, members in intervals.items()
+                        if members
+                    ],
+                }
+            )
+
+    def restore(self, data):
+        """
+        Replaces the index with one serialized by ``snapshot``.
+        """
+        data = msgpack.unpackb(data, raw=False, strict_map_key=False)
+        with self._lock:
+            self._frequencies.clear()
+            self._members.clear()
+
+            for scope, index, key, bands, expiration in data["frequencies"]:
+                frequencies = _Frequencies(self.bands, expiration)
+                frequencies.bands = bands
+                self._frequencies[(scope, index)][key] = frequencies
+
+            for scope, index, band, bucket, i, members in data["members"]:
+                self._members[(scope, index, band, bucket)][i] = set(members)
@@ -20,6 +20,50 @@ def flatten(value):
     return list(itertools.chain.from_iterable(value))
 
 
+def get_buckets(signature_builder, bands, feature_sets):
+    """
+    Returns the buckets of each feature set, one per band, or None for feature
+    sets without features. All signatures are built in one go.
+    """
+    feature_sets = [list(features) for features in feature_sets]
+    signatures = iter(
+        signature_builder.build_many([features for features in feature_sets if features])
+    )
+    return [
+        [",".join(map("{}".format, bucket)) for bucket in band(bands, next(signatures))]
+        if features
+        else None
+        for features in feature_sets
+    ]
+
+
+def as_search_result(results):
+    score_replacements = {
+        -1.0: None,  # both items don't have the feature (no comparison)
+        -2.0: 0,  # one item doesn't have the feature (totally dissimilar)
+    }
+
+    def decode_search_result(result):
+        key, scores = result
+        return (
+            force_text(key),
+            map(lambda score: score_replacements.get(score, score), map(float, scores)),
+        )
+
+    def get_comparison_key(result):
+        key, scores = result
+
+        scores = [score for score in scores if score is not None]
+
+        return (
+            sum(scores) / len(scores) * -1,  # average score, descending
+            len(scores) * -1,  # number of indexes with scores, descending
+            key,  # lexicographical sort on key, ascending
+        )
+
+    return sorted(map(decode_search_result, results), key=get_comparison_key)
+
+
 class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
     def __init__(
         self, cluster, namespace, signature_builder, bands, interval, retention, candidate_set_limit
@@ -32,14 +76,18 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
         self.retention = retention
         self.candidate_set_limit = candidate_set_limit
 
-    def _build_signature_arguments(self, features):
-        if not features:
-            return [0] * self.bands
+    def _build_signature_arguments(self, feature_sets):
+        all_arguments = []
+        for buckets in get_buckets(self.signature_builder, self.bands, feature_sets):
+            if buckets is None:
+                all_arguments.append([0] * self.bands)
+                continue
 
-        arguments = []
-        for bucket in band(self.bands, self.signature_builder(features)):
-            arguments.extend([1, ",".join(map("{}".format, bucket)), 1])
-        return arguments
+            arguments = []
+            for bucket in buckets:
+                arguments.extend([1, bucket, 1])
+            all_arguments.append(arguments)
+        return all_arguments
 
     def __index(self, scope, args):
         # scope must be passed into the script call as a key to allow the
@@ -48,32 +96,6 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
         # all redis operations.
         return index(self.cluster, [scope], args)
 
-    def _as_search_result(self, results):
-        score_replacements = {
-            -1.0: None,  # both items don't have the feature (no comparison)
-            -2.0: 0,  # one item doesn't have the feature (totally dissimilar)
-        }
-
-        def decode_search_result(result):
-            key, scores = result
-            return (
-                force_text(key),
-                map(lambda score: score_replacements.get(score, score), map(float, scores)),
-            )
-
-        def get_comparison_key(result):
-            key, scores = result
-
-            scores = [score for score in scores if score is not None]
-
-            return (
-                sum(scores) / len(scores) * -1,  # average score, descending
-                len(scores) * -1,  # number of indexes with scores, descending
-                key,  # lexicographical sort on key, ascending
-            )
-
-        return sorted(map(decode_search_result, results), key=get_comparison_key)
-
     def classify(self, scope, items, limit=None, timestamp=None):
         if timestamp is None:
             timestamp = int(time.time())
@@ -90,11 +112,12 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             limit if limit is not None else -1,
         ]
 
-        for idx, threshold, features in items:
+        signature_arguments = self._build_signature_arguments(features for _, _, features in items)
+        for (idx, threshold, _), signature in zip(items, signature_arguments):
             arguments.extend([idx, threshold])
-            arguments.extend(self._build_signature_arguments(features))
+            arguments.extend(signature)
 
-        return self._as_search_result(self.__index(scope, arguments))
+        return as_search_result(self.__index(scope, arguments))
 
     def compare(self, scope, key, items, limit=None, timestamp=None):
         if timestamp is None:
@@ -116,7 +139,7 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
         for idx, threshold in items:
             arguments.extend([idx, threshold])
 
-        return self._as_search_result(self.__index(scope, arguments))
+        return as_search_result(self.__index(scope, arguments))
 
     def record(self, scope, key, items, timestamp=None):
         if not items:
@@ -137,9 +160,10 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             key,
         ]
 
-        for idx, features in items:
+        signature_arguments = self._build_signature_arguments(features for _, features in items)
+        for (idx, _), signature in zip(items, signature_arguments):
             arguments.append(idx)
-            arguments.extend(self._build_signature_arguments(features))
+            arguments.extend(signature)
 
         return self.__index(scope, arguments)
 
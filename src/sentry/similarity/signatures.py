@@ -1,3 +1,5 @@
+import struct
+
 import mmh3
 
 from sentry.utils.compat import map
@@ -15,3 +17,63 @@ class MinHashSignatureBuilder:
             ),
             range(self.columns),
         )
+
+    def build_many(self, feature_sets):
+        return [self(features) for features in feature_sets]
+
+
+class SlicedMinHashSignatureBuilder:
+    """
+    Builds MinHash signatures by hashing every feature once with 128-bit
+    MurmurHash3 (repeated with further seeds when there are more columns than
+    fit in one hash) and slicing the digest into one fixed-width value per
+    column, rather than hashing it again per column.
+
+    The signatures are not compatible with the ones of ``MinHashSignatureBuilder``
+    and must be indexed under a different namespace.
+    """
+
+    def __init__(self, columns, rows, seed=0):
+        if rows > 1 << 32:
+            raise ValueError("rows must not exceed 2 ** 32")
+
+        self.columns = columns
+        self.rows = rows
+
+        width = 2 if rows <= 1 << 16 else 4
+        self._shift = width * 8
+        self._struct = struct.Struct("<{}{}".format(columns, "H" if width == 2 else "I"))
+        digests = -(-columns * width // 16)
+        self._seeds = range(seed * digests, (seed + 1) * digests)
+
+    def __call__(self, features):
+        return self.build_many([features])[0]
+
+    def build_many(self, feature_sets):
+        """
+        Build the signatures of several feature sets at once, hashing features
+        that occur in more than one of them only once.
+        """
+        hashes = {}
+        signatures = []
+        for features in feature_sets:
+            values = []
+            for feature in set(features):
+                value = hashes.get(feature)
+                if value is None:
+                    value = hashes[feature] = self._get_hashes(feature)
+                values.append(value)
+            signatures.append(self._get_signature(values))
+        return signatures
+
+    def _get_hashes(self, feature):
+        return self._struct.unpack_from(
+            b"".join([mmh3.hash_bytes(feature, seed) for seed in self._seeds])
+        )
+
+    def _get_signature(self, values):
+        # Scaling preserves order, so the minimum of every column can be taken
+        # before mapping it into ``range(rows)``.
+        rows = self.rows
+        shift = self._shift
+        return [min(column) * rows >> shift for column in zip(*values)]
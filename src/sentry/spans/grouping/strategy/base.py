@@ -1,9 +1,14 @@
 import re
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, Sequence, TypedDict
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypedDict
 from urllib.parse import urlparse
 
 from sentry.spans.grouping.utils import Hash, parse_fingerprint_var
+from sentry.utils.cache import LRUCache
+
+# Maximum number of span groups each strategy remembers across events
+SPAN_GROUP_CACHE_SIZE = 10000
 
 
 class Span(TypedDict):
@@ -25,8 +30,13 @@ class Span(TypedDict):
 # should return `None` to indicate that the strategy should not be used
 # and to try a different strategy. If the strategy does apply, it should
 # return a list of strings that will serve as the span fingerprint.
+#
+# The fingerprint must only depend on the op and the description of the
+# span, as span groups are cached by these.
 CallableStrategy = Callable[[Span], Optional[Sequence[str]]]
 
+SpanGroupKey = Tuple[Optional[str], Optional[str], Optional[Tuple[str, ...]]]
+
 
 @dataclass(frozen=True)
 class SpanGroupingStrategy:
@@ -34,9 +44,35 @@ class SpanGroupingStrategy:
     # The strategies to use with the default fingerprint
     strategies: Sequence[CallableStrategy]
 
+    _strategies_by_op: Dict[str, List[CallableStrategy]] = field(
+        init=False, repr=False, compare=False
+    )
+    _any_op_strategies: List[CallableStrategy] = field(init=False, repr=False, compare=False)
+    _cache: LRUCache[SpanGroupKey, str] = field(init=False, repr=False, compare=False)
+    _cache_lock: threading.Lock = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Only the strategies that apply to the op of a span are tried on it,
+        # in the order they were configured in.
+        ops = {get_span_op(strategy) for strategy in self.strategies}
+        object.__setattr__(
+            self,
+            "_strategies_by_op",
+            {
+                op: [s for s in self.strategies if get_span_op(s) in (op, None)]
+                for op in ops
+                if op is not None
+            },
+        )
+        object.__setattr__(
+            self, "_any_op_strategies", [s for s in self.strategies if get_span_op(s) is None]
+        )
+        object.__setattr__(self, "_cache", LRUCache(SPAN_GROUP_CACHE_SIZE))
+        object.__setattr__(self, "_cache_lock", threading.Lock())
+
     def execute(self, event_data: Any) -> Dict[str, str]:
         spans = event_data.get("spans", [])
-        span_groups = {span["span_id"]: self.get_span_group(span) for span in spans}
+        span_groups = dict(zip([span["span_id"] for span in spans], self.get_span_groups(spans)))
 
         # make sure to get the group id for the transaction root span
         span_id = event_data["contexts"]["trace"]["span_id"]
@@ -49,6 +85,37 @@ class SpanGroupingStrategy:
         result.update(event_data["transaction"])
         return result.hexdigest()
 
+    def get_span_groups(self, spans: Sequence[Span]) -> List[str]:
+        """
+        Returns the span group of every span. Spans with the same op,
+        description and fingerprint are in the same group, so it is computed
+        once per event, and remembered across events.
+        """
+        span_groups: Dict[SpanGroupKey, str] = {}
+        results = []
+
+        for span in spans:
+            fingerprint = span.get("fingerprint")
+            key = (
+                span.get("op"),
+                span.get("description"),
+                tuple(fingerprint) if fingerprint else None,
+            )
+
+            span_group = span_groups.get(key)
+            if span_group is None:
+                with self._cache_lock:
+                    span_group = self._cache.get(key)
+                if span_group is None:
+                    span_group = self.get_span_group(span)
+                    with self._cache_lock:
+                        self._cache.set(key, span_group)
+                span_groups[key] = span_group
+
+            results.append(span_group)
+
+        return results
+
     def get_span_group(self, span: Span) -> str:
         fingerprints = span.get("fingerprint") or ["{{ default }}"]
 
@@ -68,10 +135,11 @@ class SpanGroupingStrategy:
     def handle_default_fingerprint(self, span: Span) -> Sequence[str]:
         span_group = None
 
-        # Try using all of the strategies in order to generate
-        # the appropriate span group. The first strategy that
-        # successfully generates a span group will be chosen.
-        for strategy in self.strategies:
+        # Try using all of the strategies for the op in order to
+        # generate the appropriate span group. The first strategy
+        # that successfully generates a span group will be chosen.
+        strategies = self._strategies_by_op.get(span.get("op"), self._any_op_strategies)
+        for strategy in strategies:
             span_group = strategy(span)
             if span_group is not None:
                 break
@@ -86,11 +154,20 @@ class SpanGroupingStrategy:
 
 def span_op(op_name: str) -> Callable[[CallableStrategy], CallableStrategy]:
     def wrapped(fn: CallableStrategy) -> CallableStrategy:
-        return lambda span: fn(span) if span.get("op") == op_name else None
+        def strategy(span: Span) -> Optional[Sequence[str]]:
+            return fn(span) if span.get("op") == op_name else None
+
+        strategy.span_op = op_name  # type: ignore
+        return strategy
 
     return wrapped
 
 
+def get_span_op(strategy: CallableStrategy) -> Optional[str]:
+    """Returns the op a strategy is restricted to by `span_op`, if any."""
+    return getattr(strategy, "span_op", None)
+
+
 def raw_description_strategy(span: Span) -> Sequence[str]:
     """The catch-all strategy to use if all other strategies fail. This
     strategy is only effective if the span description is a fixed string.
@@ -5,6 +5,7 @@ from django.db.models import F
 
 from sentry import eventstream, similarity
 from sentry.app import tsdb
+from sentry.grouping.grouphash_cache import grouphash_cache
 from sentry.tasks.base import instrumented_task, track_group_async_operation
 
 logger = logging.getLogger("sentry.merge")
@@ -104,6 +105,7 @@ def merge_groups(
         has_more = merge_objects(
             model_list, group, new_group, logger=logger, transaction_id=transaction_id
         )
+        grouphash_cache.invalidate([group.project_id])
 
         if not has_more:
             # There are no more objects to merge for *this* "from" group, remove it
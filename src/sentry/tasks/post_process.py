@@ -1,6 +1,8 @@
 import logging
 
 import sentry_sdk
+from django.conf import settings
+from django.db import router, transaction
 
 from sentry import analytics, features
 from sentry.app import locks
@@ -17,30 +19,155 @@ from sentry.utils.sdk import bind_organization_context, set_current_event_projec
 logger = logging.getLogger("sentry")
 
 
-def _get_service_hooks(project_id):
+class PostProcessContext:
+    """
+    What the stages of post processing share for an event.
+
+    ``fetch_many`` binds the group of every event with its buffered stats,
+    and reads every value that the stages look up in the cache in a single
+    ``cache.get_many``. The stages take the context as input, and only fetch
+    (and cache) the values that were missing. Contexts that are fetched
+    together share what they fetched, such as the rules of their project.
+    With ``skip_missing_groups``, events whose group was deleted get no
+    context, without affecting the others.
+    """
+
+    def __init__(self, event, cached=None, plugins=None):
+        from sentry.models import GroupSnooze, ProjectCodeOwners, ProjectOwnership, Rule
+
+        self.event = event
+        self.project = event.project
+        self.organization = event.project.organization
+        self.group = event.group
+
+        self.cache_keys = {
+            "snooze": GroupSnooze.get_cache_key(self.group.id),
+            "rules": Rule.get_project_cache_key(self.project.id),
+            "service_hooks": f"servicehooks:1:{self.project.id}",
+            "error_created_hooks": f"servicehooks-error-created:1:{self.project.id}",
+            "org_has_commit": f"w-o:{self.organization.id}-h-c",
+            "suspect_commits": f"w-o-i:g-{self.group.id}",
+            "owner_exists": f"owner_exists:1:{self.group.id}",
+            "assignee_exists": f"assignee_exists:1:{self.group.id}",
+            "owner_evaluation": f"owner_evaluation:1:{self.group.id}",
+            "ownership_version": ProjectOwnership.get_version_cache_key(self.project.id),
+            "codeowners_version": ProjectCodeOwners.get_version_cache_key(self.project.id),
+        }
+        self.cached = cached if cached is not None else {}
+        # The plugins that are enabled, by project ID
+        self.plugins = plugins if plugins is not None else {}
+
+    @classmethod
+    def fetch_many(cls, events, skip_missing_groups=False):
+        from sentry.models import Group
+        from sentry.models.group import get_group_with_redirect
+
+        # Events of the same group share it, so that they see each other's
+        # changes to it.
+        groups = {}
+        bound = []
+        for event in events:
+            group = groups.get(event.group_id)
+            if group is None:
+                try:
+                    # Re-bind Group since we're reading the Event object
+                    # from cache, which may contain a stale group and project
+                    group, _ = get_group_with_redirect(event.group_id)
+                    # We fetch buffered updates to group aggregates here and populate them on the
+                    # Group. This helps us avoid problems with processing group ignores and alert
+                    # rules that rely on these stats.
+                    fetch_buffered_group_stats(group)
+                except Group.DoesNotExist:
+                    if not skip_missing_groups:
+                        raise
+                    logger.info(
+                        "post_process.skipped",
+                        extra={"group_id": event.group_id, "reason": "missing_group"},
+                    )
+                    bound.append(None)
+                    continue
+
+                group.project = event.project
+                group.project.set_cached_field_value("organization", event.project.organization)
+                groups[event.group_id] = group
+
+            event.group = group
+            event.group_id = group.id
+            bound.append(event)
+
+        cached = {}
+        plugins = {}
+        contexts = [cls(event, cached, plugins) if event is not None else None for event in bound]
+        keys = {
+            key
+            for context in contexts
+            if context is not None
+            for key in context.cache_keys.values()
+        }
+        with sentry_sdk.start_span(op="tasks.post_process_group.fetch_context"):
+            cached.update(cache.get_many(list(keys)))
+        return contexts
+
+    def get_cached(self, name):
+        """
+        Returns the cached value of the key of the given name, or None if it
+        was missing.
+        """
+        return self.cached.get(self.cache_keys[name])
+
+    def set_cached(self, name, value, timeout):
+        key = self.cache_keys[name]
+        cache.set(key, value, timeout)
+        self.cached[key] = value
+
+    def discard_cached(self, name):
+        """
+        Forgets the value of the key of the given name, so that it is read
+        from the cache again.
+        """
+        self.cached.pop(self.cache_keys[name], None)
+
+    def get_plugins(self):
+        from sentry.plugins.base import plugins
+
+        project_plugins = self.plugins.get(self.project.id)
+        if project_plugins is None:
+            project_plugins = self.plugins[self.project.id] = list(
+                plugins.for_project(self.project)
+            )
+        return project_plugins
+
+    def get_rules(self):
+        from sentry.models import Rule
+
+        rules = self.get_cached("rules")
+        if rules is None:
+            rules = Rule.get_for_project(self.project.id)
+        return rules
+
+
+def _get_service_hooks(context):
     from sentry.models import ServiceHook
 
-    cache_key = f"servicehooks:1:{project_id}"
-    result = cache.get(cache_key)
+    result = context.get_cached("service_hooks")
 
     if result is None:
-        hooks = ServiceHook.objects.filter(servicehookproject__project_id=project_id)
+        hooks = ServiceHook.objects.filter(servicehookproject__project_id=context.project.id)
         result = [(h.id, h.events) for h in hooks]
-        cache.set(cache_key, result, 60)
+        context.set_cached("service_hooks", result, 60)
     return result
 
 
-def _should_send_error_created_hooks(project):
-    from sentry.models import Organization, ServiceHook
+def _should_send_error_created_hooks(context):
+    from sentry.models import ServiceHook
 
-    cache_key = f"servicehooks-error-created:1:{project.id}"
-    result = cache.get(cache_key)
+    result = context.get_cached("error_created_hooks")
 
     if result is None:
 
-        org = Organization.objects.get_from_cache(id=project.organization_id)
+        org = context.organization
         if not features.has("organizations:integrations-event-hooks", organization=org):
-            cache.set(cache_key, 0, 60)
+            context.set_cached("error_created_hooks", 0, 60)
             return False
 
         result = (
@@ -50,7 +177,7 @@ def _should_send_error_created_hooks(project):
         )
 
         cache_value = 1 if result else 0
-        cache.set(cache_key, cache_value, 60)
+        context.set_cached("error_created_hooks", cache_value, 60)
 
     return result
 
@@ -79,30 +206,49 @@ def _capture_stats(event, is_new):
             metrics.incr("events.platform_mismatch", tags=tags)
 
 
-def handle_owner_assignment(project, group, event):
+def handle_owner_assignment(context):
     from sentry.models import GroupAssignee, ProjectOwnership
 
+    project = context.project
+    group = context.group
+    event = context.event
+
     with metrics.timer("post_process.handle_owner_assignment"):
+        # Owners of the group were evaluated recently, for the same ownership
+        # rules and CODEOWNERS.
+        debounce = settings.SENTRY_OWNER_EVALUATION_DEBOUNCE
+        versions = (
+            context.get_cached("ownership_version"),
+            context.get_cached("codeowners_version"),
+        )
+        if debounce and context.get_cached("owner_evaluation") == versions:
+            metrics.incr(
+                "post_process.handle_owner_assignment.debounce", tags={"result": "skipped"}
+            )
+            return
+
         with sentry_sdk.start_span(op="post_process.handle_owner_assignment.cache_set_owner"):
-            owner_key = "owner_exists:1:%s" % group.id
-            owners_exists = cache.get(owner_key)
+            owners_exists = context.get_cached("owner_exists")
             if owners_exists is None:
                 owners_exists = group.groupowner_set.exists()
                 # Cache for an hour if it's assigned. We don't need to move that fast.
-                cache.set(owner_key, owners_exists, 3600 if owners_exists else 60)
+                context.set_cached("owner_exists", owners_exists, 3600 if owners_exists else 60)
 
         with sentry_sdk.start_span(op="post_process.handle_owner_assignment.cache_set_assignee"):
             # Is the issue already assigned to a team or user?
-            assignee_key = "assignee_exists:1:%s" % group.id
-            assignees_exists = cache.get(assignee_key)
+            assignees_exists = context.get_cached("assignee_exists")
             if assignees_exists is None:
                 assignees_exists = group.assignee_set.exists()
                 # Cache for an hour if it's assigned. We don't need to move that fast.
-                cache.set(assignee_key, assignees_exists, 3600 if assignees_exists else 60)
+                context.set_cached(
+                    "assignee_exists", assignees_exists, 3600 if assignees_exists else 60
+                )
 
         if owners_exists and assignees_exists:
             return
 
+        metrics.incr("post_process.handle_owner_assignment.debounce", tags={"result": "evaluated"})
+
         with sentry_sdk.start_span(op="post_process.handle_owner_assignment.get_autoassign_owners"):
             if killswitch_matches_context(
                 "post_process.get-autoassign-owners",
@@ -137,16 +283,20 @@ def handle_owner_assignment(project, group, event):
         with sentry_sdk.start_span(op="post_process.handle_owner_assignment.handle_group_owners"):
             if owners and not owners_exists:
                 try:
-                    handle_group_owners(project, group, owners)
+                    if handle_group_owners(project, group, owners):
+                        context.set_cached("owner_exists", True, 3600)
                 except Exception:
                     logger.exception("Failed to store group owners")
 
+        if debounce:
+            context.set_cached("owner_evaluation", versions, debounce)
+
 
 def handle_group_owners(project, group, owners):
     """
     Stores group owners generated by `ProjectOwnership.get_autoassign_owners` in the
     `GroupOwner` model, and handles any diffing/changes of which owners we're keeping.
-    :return:
+    :return: Whether the group owners are stored.
     """
     from sentry.models.groupowner import GroupOwner, GroupOwnerType
     from sentry.models.team import Team
@@ -159,16 +309,15 @@ def handle_group_owners(project, group, owners):
         ), lock.acquire():
             current_group_owners = GroupOwner.objects.filter(
                 group=group, type=GroupOwnerType.OWNERSHIP_RULE.value
-            )
+            ).values_list("id", "user_id", "team_id")
             new_owners = {(type(owner), owner.id) for owner in owners}
             # Owners already in the database that we'll keep
             keeping_owners = set()
-            for owner in current_group_owners:
-                lookup_key = (
-                    (Team, owner.team_id) if owner.team_id is not None else (User, owner.user_id)
-                )
+            removed_owner_ids = []
+            for owner_id, user_id, team_id in current_group_owners:
+                lookup_key = (Team, team_id) if team_id is not None else (User, user_id)
                 if lookup_key not in new_owners:
-                    owner.delete()
+                    removed_owner_ids.append(owner_id)
                 else:
                     keeping_owners.add(lookup_key)
 
@@ -193,10 +342,16 @@ def handle_group_owners(project, group, owners):
                             organization=project.organization,
                         )
                     )
-            if new_group_owners:
-                GroupOwner.objects.bulk_create(new_group_owners)
+
+            if removed_owner_ids or new_group_owners:
+                with transaction.atomic(router.db_for_write(GroupOwner)):
+                    if removed_owner_ids:
+                        GroupOwner.objects.filter(id__in=removed_owner_ids).delete()
+                    if new_group_owners:
+                        GroupOwner.objects.bulk_create(new_group_owners)
     except UnableToAcquireLock:
-        pass
+        return False
+    return True
 
 
 def update_existing_attachments(event):
@@ -225,6 +380,38 @@ def fetch_buffered_group_stats(group):
     group.times_seen_pending = result["times_seen"]
 
 
+def _load_event(data, group_id):
+    from sentry.eventstore.models import Event
+    from sentry.models import EventDict
+
+    event = Event(
+        project_id=data["project"], event_id=data["event_id"], group_id=group_id, data=data
+    )
+    # Re-bind node data to avoid renormalization. We only want to
+    # renormalize when loading old data from the database.
+    event.data = EventDict(event.data, skip_renormalization=True)
+    return event
+
+
+def _bind_project(event, projects=None):
+    """
+    Re-binds Project and Org since we're reading the Event object from cache
+    which may contain stale parent models. Projects that were bound before are
+    looked up in ``projects`` if given.
+    """
+    from sentry.models import Organization, Project
+
+    project = projects.get(event.project_id) if projects is not None else None
+    if project is None:
+        project = Project.objects.get_from_cache(id=event.project_id)
+        project.set_cached_field_value(
+            "organization", Organization.objects.get_from_cache(id=project.organization_id)
+        )
+        if projects is not None:
+            projects[event.project_id] = project
+    event.project = project
+
+
 @instrumented_task(
     name="sentry.tasks.post_process.post_process_group",
     time_limit=120,
@@ -236,9 +423,7 @@ def post_process_group(
     """
     Fires post processing hooks for a group.
     """
-    from sentry.eventstore.models import Event
     from sentry.eventstore.processing import event_processing_store
-    from sentry.reprocessing2 import is_reprocessed_event
     from sentry.utils import snuba
 
     with snuba.options_override({"consistent": True}):
@@ -252,136 +437,206 @@ def post_process_group(
                 extra={"cache_key": cache_key, "reason": "missing_cache"},
             )
             return
-        event = Event(
-            project_id=data["project"], event_id=data["event_id"], group_id=group_id, data=data
-        )
+        event = _load_event(data, group_id)
 
         set_current_event_project(event.project_id)
 
-        is_transaction_event = not bool(event.group_id)
-
-        from sentry.models import EventDict, Organization, Project
-
-        # Re-bind node data to avoid renormalization. We only want to
-        # renormalize when loading old data from the database.
-        event.data = EventDict(event.data, skip_renormalization=True)
-
         with metrics.timer("tasks.post_process.delete_event_cache"):
             event_processing_store.delete_by_key(cache_key)
 
-        # Re-bind Project and Org since we're reading the Event object
-        # from cache which may contain stale parent models.
-        event.project = Project.objects.get_from_cache(id=event.project_id)
-        event.project.set_cached_field_value(
-            "organization", Organization.objects.get_from_cache(id=event.project.organization_id)
+        _bind_project(event)
+
+        _post_process_event(
+            event,
+            is_new=is_new,
+            is_regression=is_regression,
+            is_new_group_environment=is_new_group_environment,
+            primary_hash=kwargs.get("primary_hash"),
         )
 
-        # Simplified post processing for transaction events.
-        # This should eventually be completely removed and transactions
-        # will not go through any post processing.
-        if is_transaction_event:
-            transaction_processed.send_robust(
-                sender=post_process_group,
-                project=event.project,
-                event=event,
-            )
 
-            return
+@instrumented_task(
+    name="sentry.tasks.post_process.post_process_group_batch",
+    time_limit=300,
+    soft_time_limit=290,
+)
+def post_process_group_batch(events, **kwargs):
+    """
+    Fires post processing hooks for a batch of events, given as the keyword
+    arguments of ``post_process_group`` for every event.
+
+    The events are loaded at once, and the projects and everything that the
+    stages of post processing look up in the cache are fetched once for the
+    batch. An event that fails to be post processed doesn't affect the others.
+    As in ``post_process_group``, the data of an event is only deleted from
+    the processing store once the event is about to be post processed.
+    """
+    from sentry.eventstore.processing import event_processing_store
+    from sentry.utils import snuba
 
-        is_reprocessed = is_reprocessed_event(event.data)
-        sentry_sdk.set_tag("is_reprocessed", is_reprocessed)
+    with snuba.options_override({"consistent": True}):
+        cache_keys = [task_kwargs["cache_key"] for task_kwargs in events]
+        data = event_processing_store.get_many(cache_keys)
+
+        loaded = []
+        for task_kwargs in events:
+            cache_key = task_kwargs["cache_key"]
+            if not data.get(cache_key):
+                logger.info(
+                    "post_process.skipped",
+                    extra={"cache_key": cache_key, "reason": "missing_cache"},
+                )
+                continue
+            loaded.append((_load_event(data[cache_key], task_kwargs.get("group_id")), task_kwargs))
 
-        # NOTE: we must pass through the full Event object, and not an
-        # event_id since the Event object may not actually have been stored
-        # in the database due to sampling.
-        from sentry.models import Commit, GroupInboxReason
-        from sentry.models.group import get_group_with_redirect
-        from sentry.models.groupinbox import add_group_to_inbox
-        from sentry.rules.processor import RuleProcessor
-        from sentry.tasks.groupowner import process_suspect_commits
-        from sentry.tasks.servicehooks import process_service_hook
+        projects = {}
+        for event, task_kwargs in loaded:
+            _bind_project(event, projects)
 
-        # Re-bind Group since we're reading the Event object
-        # from cache, which may contain a stale group and project
-        event.group, _ = get_group_with_redirect(event.group_id)
-        event.group_id = event.group.id
-        # We fetch buffered updates to group aggregates here and populate them on the Group. This
-        # helps us avoid problems with processing group ignores and alert rules that rely on these
-        # stats.
-        fetch_buffered_group_stats(event.group)
+        contexts = {}
+        try:
+            errors = [event for event, task_kwargs in loaded if event.group_id]
+            for event, context in zip(
+                errors, PostProcessContext.fetch_many(errors, skip_missing_groups=True)
+            ):
+                contexts[event.event_id] = context
+        except Exception:
+            # Every event fetches its own context instead
+            logger.exception("Failed to fetch post process contexts of batch")
 
-        event.group.project = event.project
-        event.group.project.set_cached_field_value("organization", event.project.organization)
+        metrics.timing("tasks.post_process.batch_size", len(loaded))
 
-        bind_organization_context(event.project.organization)
+        for event, task_kwargs in loaded:
+            set_current_event_project(event.project_id)
 
-        _capture_stats(event, is_new)
+            with metrics.timer("tasks.post_process.delete_event_cache"):
+                event_processing_store.delete_by_key(task_kwargs["cache_key"])
 
-        with sentry_sdk.start_span(op="tasks.post_process_group.add_group_to_inbox"):
-            try:
-                if is_reprocessed and is_new:
-                    add_group_to_inbox(event.group, GroupInboxReason.REPROCESSED)
-            except Exception:
-                logger.exception("Failed to add group to inbox for reprocessed groups")
+            if event.event_id in contexts and contexts[event.event_id] is None:
+                # The group of the event was deleted, which was logged
+                continue
 
-        if not is_reprocessed:
-            # we process snoozes before rules as it might create a regression
-            # but not if it's new because you can't immediately snooze a new group
-            has_reappeared = not is_new
             try:
-                if has_reappeared:
-                    has_reappeared = process_snoozes(event.group)
+                _post_process_event(
+                    event,
+                    is_new=task_kwargs["is_new"],
+                    is_regression=task_kwargs["is_regression"],
+                    is_new_group_environment=task_kwargs["is_new_group_environment"],
+                    primary_hash=task_kwargs.get("primary_hash"),
+                    context=contexts.get(event.event_id),
+                )
             except Exception:
-                logger.exception("Failed to process snoozes for group")
+                logger.exception(
+                    "post_process.batch.failed",
+                    extra={"cache_key": task_kwargs["cache_key"]},
+                )
 
-            try:
-                if not has_reappeared:  # If true, we added the .UNIGNORED reason already
-                    if is_new:
-                        add_group_to_inbox(event.group, GroupInboxReason.NEW)
-                    elif is_regression:
-                        add_group_to_inbox(event.group, GroupInboxReason.REGRESSION)
-            except Exception:
-                logger.exception("Failed to add group to inbox for non-reprocessed groups")
 
-            with sentry_sdk.start_span(op="tasks.post_process_group.handle_owner_assignment"):
-                try:
-                    handle_owner_assignment(event.project, event.group, event)
-                except Exception:
-                    logger.exception("Failed to handle owner assignments")
+def _post_process_event(
+    event, is_new, is_regression, is_new_group_environment, primary_hash, context=None
+):
+    from sentry.reprocessing2 import is_reprocessed_event
 
-            rp = RuleProcessor(
-                event, is_new, is_regression, is_new_group_environment, has_reappeared
-            )
-            has_alert = False
-            with sentry_sdk.start_span(op="tasks.post_process_group.rule_processor_callbacks"):
-                # TODO(dcramer): ideally this would fanout, but serializing giant
-                # objects back and forth isn't super efficient
-                for callback, futures in rp.apply():
-                    has_alert = True
-                    safe_execute(callback, event, futures, _with_transaction=False)
+    # Simplified post processing for transaction events.
+    # This should eventually be completely removed and transactions
+    # will not go through any post processing.
+    if not event.group_id:
+        transaction_processed.send_robust(
+            sender=post_process_group,
+            project=event.project,
+            event=event,
+        )
+
+        return
+
+    is_reprocessed = is_reprocessed_event(event.data)
+    sentry_sdk.set_tag("is_reprocessed", is_reprocessed)
+
+    # NOTE: we must pass through the full Event object, and not an
+    # event_id since the Event object may not actually have been stored
+    # in the database due to sampling.
+    from sentry.models import Commit, GroupInboxReason
+    from sentry.models.groupinbox import add_group_to_inbox
+    from sentry.rules.processor import RuleProcessor
+    from sentry.tasks.groupowner import process_suspect_commits
+    from sentry.tasks.servicehooks import process_service_hook
+
+    if context is None:
+        context = PostProcessContext.fetch_many([event])[0]
+
+    bind_organization_context(event.project.organization)
+
+    _capture_stats(event, is_new)
+
+    with sentry_sdk.start_span(op="tasks.post_process_group.add_group_to_inbox"):
+        try:
+            if is_reprocessed and is_new:
+                add_group_to_inbox(event.group, GroupInboxReason.REPROCESSED)
+        except Exception:
+            logger.exception("Failed to add group to inbox for reprocessed groups")
+
+    if not is_reprocessed:
+        # we process snoozes before rules as it might create a regression
+        # but not if it's new because you can't immediately snooze a new group
+        has_reappeared = not is_new
+        try:
+            if has_reappeared:
+                has_reappeared = process_snoozes(context)
+        except Exception:
+            logger.exception("Failed to process snoozes for group")
 
+        try:
+            if not has_reappeared:  # If true, we added the .UNIGNORED reason already
+                if is_new:
+                    add_group_to_inbox(event.group, GroupInboxReason.NEW)
+                elif is_regression:
+                    add_group_to_inbox(event.group, GroupInboxReason.REGRESSION)
+        except Exception:
+            logger.exception("Failed to add group to inbox for non-reprocessed groups")
+
+        with sentry_sdk.start_span(op="tasks.post_process_group.handle_owner_assignment"):
             try:
-                lock = locks.get(
-                    f"w-o:{event.group_id}-d-l",
-                    duration=10,
-                )
-                with lock.acquire():
-                    has_commit_key = f"w-o:{event.project.organization_id}-h-c"
-                    org_has_commit = cache.get(has_commit_key)
-                    if org_has_commit is None:
-                        org_has_commit = Commit.objects.filter(
-                            organization_id=event.project.organization_id
-                        ).exists()
-                        cache.set(has_commit_key, org_has_commit, 3600)
-
-                    if org_has_commit:
-                        group_cache_key = f"w-o-i:g-{event.group_id}"
-                        if cache.get(group_cache_key):
-                            metrics.incr(
-                                "sentry.tasks.process_suspect_commits.debounce",
-                                tags={"detail": "w-o-i:g debounce"},
-                            )
-                        else:
+                handle_owner_assignment(context)
+            except Exception:
+                logger.exception("Failed to handle owner assignments")
+
+        rp = RuleProcessor(
+            event,
+            is_new,
+            is_regression,
+            is_new_group_environment,
+            has_reappeared,
+            rules=context.get_rules(),
+        )
+        has_alert = False
+        with sentry_sdk.start_span(op="tasks.post_process_group.rule_processor_callbacks"):
+            # TODO(dcramer): ideally this would fanout, but serializing giant
+            # objects back and forth isn't super efficient
+            for callback, futures in rp.apply():
+                has_alert = True
+                safe_execute(callback, event, futures, _with_transaction=False)
+
+        try:
+            org_has_commit = context.get_cached("org_has_commit")
+            if org_has_commit is None:
+                org_has_commit = Commit.objects.filter(
+                    organization_id=event.project.organization_id
+                ).exists()
+                context.set_cached("org_has_commit", org_has_commit, 3600)
+
+            if org_has_commit:
+                # Whether suspect commits of the group were processed
+                # recently is checked again while holding the lock.
+                debounced = context.get_cached("suspect_commits")
+                if not debounced:
+                    lock = locks.get(
+                        f"w-o:{event.group_id}-d-l",
+                        duration=10,
+                    )
+                    with lock.acquire():
+                        group_cache_key = context.cache_keys["suspect_commits"]
+                        debounced = cache.get(group_cache_key)
+                        if not debounced:
                             from sentry.utils.committers import get_frame_paths
 
                             cache.set(group_cache_key, True, 604800)  # 1 week in seconds
@@ -393,63 +648,64 @@ def post_process_group(
                                 group_id=event.group_id,
                                 project_id=event.project_id,
                             )
-            except UnableToAcquireLock:
-                pass
-            except Exception:
-                logger.exception("Failed to process suspect commits")
-
-            if features.has("projects:servicehooks", project=event.project):
-                allowed_events = {"event.created"}
-                if has_alert:
-                    allowed_events.add("event.alert")
-
-                if allowed_events:
-                    for servicehook_id, events in _get_service_hooks(project_id=event.project_id):
-                        if any(e in allowed_events for e in events):
-                            process_service_hook.delay(servicehook_id=servicehook_id, event=event)
-
-            from sentry.tasks.sentry_apps import process_resource_change_bound
-
-            if event.get_event_type() == "error" and _should_send_error_created_hooks(
-                event.project
-            ):
-                process_resource_change_bound.delay(
-                    action="created", sender="Error", instance_id=event.event_id, instance=event
-                )
-            if is_new:
-                process_resource_change_bound.delay(
-                    action="created", sender="Group", instance_id=event.group_id
-                )
-
-            from sentry.plugins.base import plugins
+                if debounced:
+                    metrics.incr(
+                        "sentry.tasks.process_suspect_commits.debounce",
+                        tags={"detail": "w-o-i:g debounce"},
+                    )
+        except UnableToAcquireLock:
+            pass
+        except Exception:
+            logger.exception("Failed to process suspect commits")
+
+        if features.has("projects:servicehooks", project=event.project):
+            allowed_events = {"event.created"}
+            if has_alert:
+                allowed_events.add("event.alert")
+
+            if allowed_events:
+                for servicehook_id, events in _get_service_hooks(context):
+                    if any(e in allowed_events for e in events):
+                        process_service_hook.delay(servicehook_id=servicehook_id, event=event)
+
+        from sentry.tasks.sentry_apps import process_resource_change_bound
+
+        if event.get_event_type() == "error" and _should_send_error_created_hooks(context):
+            process_resource_change_bound.delay(
+                action="created", sender="Error", instance_id=event.event_id, instance=event
+            )
+        if is_new:
+            process_resource_change_bound.delay(
+                action="created", sender="Group", instance_id=event.group_id
+            )
 
-            for plugin in plugins.for_project(event.project):
-                plugin_post_process_group(
-                    plugin_slug=plugin.slug, event=event, is_new=is_new, is_regresion=is_regression
-                )
+        for plugin in context.get_plugins():
+            plugin_post_process_group(
+                plugin_slug=plugin.slug, event=event, is_new=is_new, is_regresion=is_regression
+            )
 
-            from sentry import similarity
+        from sentry import similarity
 
-            with sentry_sdk.start_span(op="tasks.post_process_group.similarity"):
-                safe_execute(similarity.record, event.project, [event], _with_transaction=False)
+        with sentry_sdk.start_span(op="tasks.post_process_group.similarity"):
+            safe_execute(similarity.record, event.project, [event], _with_transaction=False)
 
-        # Patch attachments that were ingested on the standalone path.
-        with sentry_sdk.start_span(op="tasks.post_process_group.update_existing_attachments"):
-            try:
-                update_existing_attachments(event)
-            except Exception:
-                logger.exception("Failed to update existing attachments")
-
-        if not is_reprocessed:
-            event_processed.send_robust(
-                sender=post_process_group,
-                project=event.project,
-                event=event,
-                primary_hash=kwargs.get("primary_hash"),
-            )
+    # Patch attachments that were ingested on the standalone path.
+    with sentry_sdk.start_span(op="tasks.post_process_group.update_existing_attachments"):
+        try:
+            update_existing_attachments(event)
+        except Exception:
+            logger.exception("Failed to update existing attachments")
+
+    if not is_reprocessed:
+        event_processed.send_robust(
+            sender=post_process_group,
+            project=event.project,
+            event=event,
+            primary_hash=primary_hash,
+        )
 
 
-def process_snoozes(group):
+def process_snoozes(context):
     """
     Return True if the group is transitioning from "resolved" to "unresolved",
     otherwise return False.
@@ -463,15 +719,15 @@ def process_snoozes(group):
     )
     from sentry.models.grouphistory import GroupHistoryStatus, record_group_history
 
-    key = GroupSnooze.get_cache_key(group.id)
-    snooze = cache.get(key)
+    group = context.group
+    snooze = context.get_cached("snooze")
     if snooze is None:
         try:
             snooze = GroupSnooze.objects.get(group=group)
         except GroupSnooze.DoesNotExist:
             snooze = False
         # This cache is also set in post_save|delete.
-        cache.set(key, snooze, 3600)
+        context.set_cached("snooze", snooze, 3600)
     if not snooze:
         return False
 
@@ -493,6 +749,8 @@ def process_snoozes(group):
         )
 
         snooze.delete()
+        # The cache was updated when the snooze was deleted
+        context.discard_cached("snooze")
         group.update(status=GroupStatus.UNRESOLVED)
         issue_unignored.send_robust(
             project=group.project,
@@ -0,0 +1,25 @@
+from sentry.tasks.base import instrumented_task
+from sentry.utils import metrics
+
+BATCH_SIZE = 1000
+MAX_BATCHES = 10
+
+
+@instrumented_task(
+    name="sentry.tasks.rule_status.persist_rule_statuses",
+    queue="buffers.process_pending",
+    time_limit=65,
+    soft_time_limit=60,
+)
+def persist_rule_statuses():
+    """
+    Write the statuses of rules that were marked as active in Redis to
+    `GroupRuleStatus` rows.
+    """
+    from sentry.rules.status import rule_status_store
+
+    for _ in range(MAX_BATCHES):
+        persisted = rule_status_store.persist_pending(BATCH_SIZE)
+        metrics.incr("rules.status.persisted", amount=persisted)
+        if persisted < BATCH_SIZE:
+            break
@@ -9,6 +9,7 @@ from sentry import eventstore, similarity
 from sentry.app import tsdb
 from sentry.constants import DEFAULT_LOGGER_NAME, LOG_LEVELS_MAP
 from sentry.event_manager import generate_culprit
+from sentry.grouping.grouphash_cache import grouphash_cache
 from sentry.models import (
     Activity,
     Environment,
@@ -209,6 +210,7 @@ def migrate_events(
         )
 
         args.replacement.run_postgres_replacement(project, destination_id, locked_primary_hashes)
+        grouphash_cache.invalidate([project.id])
 
         # Create activity records for the source and destination group.
         Activity.objects.create(
@@ -450,6 +452,8 @@ def lock_hashes(project_id, source_id, fingerprints):
             state=GroupHash.State.LOCKED_IN_MIGRATION
         )
 
+    grouphash_cache.invalidate([project_id])
+
     return [h.hash for h in eligible_hashes]
 
 
@@ -459,6 +463,7 @@ def unlock_hashes(project_id, locked_primary_hashes):
         hash__in=locked_primary_hashes,
         state=GroupHash.State.LOCKED_IN_MIGRATION,
     ).update(state=GroupHash.State.UNLOCKED)
+    grouphash_cache.invalidate([project_id])
 
 
 @instrumented_task(name="sentry.tasks.unmerge", queue="unmerge")
@@ -1,3 +1,4 @@
+import importlib.util
 import os
 import socket
 from urllib.parse import urlparse
@@ -35,6 +36,11 @@ requires_not_arm64 = pytest.mark.skipif(
 )
 
 
+requires_pytest_benchmark = pytest.mark.skipif(
+    importlib.util.find_spec("pytest_benchmark") is None, reason="requires pytest-benchmark"
+)
+
+
 def xfail_if_not_postgres(reason):
     def decorator(function):
         return pytest.mark.xfail(os.environ.get("TEST_SUITE") != "postgres", reason=reason)(
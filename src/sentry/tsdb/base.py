@@ -1,4 +1,4 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from collections.abc import Callable
 from datetime import timedelta
 from enum import Enum
@@ -101,6 +101,7 @@ class BaseTSDB(Service):
         [
             "get_range",
             "get_sums",
+            "get_sums_for_ranges",
             "get_distinct_counts_series",
             "get_distinct_counts_totals",
             "get_distinct_counts_union",
@@ -374,6 +375,38 @@ class BaseTSDB(Service):
         sum_set = {key: sum(p for _, p in points) for (key, points) in range_set.items()}
         return sum_set
 
+    def get_sums_for_ranges(self, model, keys, ranges, environment_id=None, use_cache=False):
+        """
+        Returns the sums of several ranges at once, as a list of mappings of
+        key => sum in the order of ``ranges``, a sequence of ``(start, end)``
+        pairs. Each sum is the same ``get_sums`` returns for its range, but
+        ranges of the same rollup are summed from a single ``get_range`` call
+        covering all of them.
+        """
+        series_by_rollup = defaultdict(dict)
+        for index, (start, end) in enumerate(ranges):
+            rollup, series = self.get_optimal_rollup_series(start, end)
+            series_by_rollup[rollup][index] = (series, end)
+
+        results = [None] * len(ranges)
+        for rollup, series_by_index in series_by_rollup.items():
+            range_set = self.get_range(
+                model,
+                keys,
+                to_datetime(min(series[0] for series, _ in series_by_index.values())),
+                max(end for _, end in series_by_index.values()),
+                rollup,
+                environment_ids=[environment_id] if environment_id is not None else None,
+                use_cache=use_cache,
+            )
+            for index, (series, _) in series_by_index.items():
+                timestamps = set(series)
+                results[index] = {
+                    key: sum(p for timestamp, p in points if timestamp in timestamps)
+                    for key, points in range_set.items()
+                }
+        return results
+
     def rollup(self, values, rollup):
         """
         Given a set of values (as returned from ``get_range``), roll them up
@@ -26,6 +26,7 @@ method_specifications = {
     # method: (type, function(callargs) -> set[model])
     "get_range": (READ, single_model_argument),
     "get_sums": (READ, single_model_argument),
+    "get_sums_for_ranges": (READ, single_model_argument),
     "get_distinct_counts_series": (READ, single_model_argument),
     "get_distinct_counts_totals": (READ, single_model_argument),
     "get_distinct_counts_union": (READ, single_model_argument),
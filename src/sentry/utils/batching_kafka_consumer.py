@@ -94,6 +94,20 @@ class KafkaConsumerFacade(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def pause(self, partitions):
+        """
+        Pause consumption for the supplied list of partitions.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def resume(self, partitions):
+        """
+        Resume consumption for the supplied list of partitions.
+        """
+        raise NotImplementedError
+
 
 class AbstractBatchWorker(metaclass=abc.ABCMeta):
     """The `BatchingKafkaConsumer` requires an instance of this class to
@@ -8,7 +8,8 @@ import datetime
 import decimal
 import uuid
 from enum import Enum
-from typing import Any
+from functools import lru_cache
+from typing import Any, Mapping, Type
 
 import rapidjson
 import sentry_sdk
@@ -90,16 +91,146 @@ _default_escaped_encoder = JSONEncoderForHTML(
 JSONData = Any  # https://github.com/python/typing/issues/182
 
 
+def _escape_html(value: str) -> str:
+    # These characters can only occur inside of JSON strings, so escaping them
+    # in the encoded output is equivalent to escaping them while encoding.
+    return (
+        value.replace("&", "\\u0026")
+        .replace("<", "\\u003c")
+        .replace(">", "\\u003e")
+        .replace("'", "\\u0027")
+    )
+
+
+class JSONBackend:
+    """
+    An implementation of encoding and decoding JSON behind ``dumps`` and
+    ``loads``.
+
+    Backends must produce output that decodes to the same values as
+    ``SimpleJSONBackend``, including the handling of types through
+    ``better_default_encoder``, NaN and infinity encoded as ``null``, and
+    ASCII-only output.
+    """
+
+    name: str
+
+    def dumps(self, value: JSONData, escape: bool = False) -> str:
+        raise NotImplementedError
+
+    def loads(self, value: str) -> JSONData:
+        raise NotImplementedError
+
+
+class SimpleJSONBackend(JSONBackend):
+    name = "simplejson"
+
+    def dumps(self, value: JSONData, escape: bool = False) -> str:
+        if escape:
+            return _default_escaped_encoder.encode(value)
+        return _default_encoder.encode(value)
+
+    def loads(self, value: str) -> JSONData:
+        return _default_decoder.decode(value)
+
+
+class RapidJSONBackend(JSONBackend):
+    """
+    Encodes and decodes with python-rapidjson.
+
+    Values rapidjson can't handle the same way as simplejson (NaN and infinity,
+    non-string keys, lone surrogates) make it fall back to simplejson. Note that
+    named tuples are encoded as lists rather than objects, and that floats may
+    be formatted differently (e.g. ``1e16`` rather than ``1e+16``).
+    """
+
+    name = "rapidjson"
+
+    def dumps(self, value: JSONData, escape: bool = False) -> str:
+        try:
+            rv = rapidjson.dumps(
+                value, default=better_default_encoder, number_mode=rapidjson.NM_NONE
+            )
+        except (ValueError, TypeError, OverflowError, UnicodeEncodeError):
+            return _simplejson_backend.dumps(value, escape)
+        if escape:
+            return _escape_html(rv)
+        return rv
+
+    def loads(self, value: str) -> JSONData:
+        try:
+            return rapidjson.loads(value)
+        except (ValueError, UnicodeDecodeError):
+            # Either invalid, which raises the same error as simplejson would,
+            # or something only simplejson accepts (e.g. escaped lone surrogates).
+            return _simplejson_backend.loads(value)
+
+
+backends: Mapping[str, Type[JSONBackend]] = {
+    SimpleJSONBackend.name: SimpleJSONBackend,
+    RapidJSONBackend.name: RapidJSONBackend,
+}
+
+_simplejson_backend = SimpleJSONBackend()
+_rapidjson_backend = RapidJSONBackend()
+_backend: JSONBackend = _simplejson_backend
+
+
+def set_backend(name: str) -> None:
+    """
+    Select the backend used by ``dumps`` and ``loads``, see
+    ``SENTRY_JSON_BACKEND``.
+    """
+    global _backend
+    try:
+        _backend = backends[name]()
+    except KeyError:
+        raise ValueError(f"Unknown JSON backend: {name!r}")
+
+
+def get_backend() -> JSONBackend:
+    return _backend
+
+
+@lru_cache(maxsize=16)
+def _get_custom_encoder(escape: bool, sort_keys: bool, indent: Any, separators: Any) -> JSONEncoder:
+    cls = JSONEncoderForHTML if escape else JSONEncoder
+    return cls(
+        sort_keys=sort_keys,
+        indent=indent,
+        separators=separators,
+        ignore_nan=True,
+        default=better_default_encoder,
+    )
+
+
 def dump(value: JSONData, fp, **kwargs):
     for chunk in _default_encoder.iterencode(value):
         fp.write(chunk)
 
 
-def dumps(value: JSONData, escape: bool = False, **kwargs) -> str:
+def dumps(
+    value: JSONData,
+    escape: bool = False,
+    sort_keys: bool = False,
+    indent: Any = None,
+    separators: Any = None,
+    use_rapid_json: bool = False,
+    **kwargs,
+) -> str:
     # Legacy use. Do not use. Use dumps_htmlsafe
-    if escape:
-        return _default_escaped_encoder.encode(value)
-    return _default_encoder.encode(value)
+    if sort_keys or indent is not None or separators is not None:
+        if separators is None and indent is None:
+            separators = (",", ":")
+        return _get_custom_encoder(
+            escape,
+            sort_keys,
+            indent,
+            tuple(separators) if separators is not None else None,
+        ).encode(value)
+    if use_rapid_json is True:
+        return _rapidjson_backend.dumps(value, escape)
+    return _backend.dumps(value, escape)
 
 
 def load(fp, **kwargs) -> JSONData:
@@ -111,7 +242,7 @@ def loads(value: str, use_rapid_json: bool = False, **kwargs) -> JSONData:
         if use_rapid_json is True:
             return rapidjson.loads(value)
         else:
-            return _default_decoder.decode(value)
+            return _backend.loads(value)
 
 
 def dumps_htmlsafe(value):
@@ -8,6 +8,7 @@ from typing import Any, Iterator, Mapping, Optional, Sequence, Tuple, cast
 from django.utils import timezone
 from google.api_core import exceptions, retry
 from google.cloud import bigtable
+from google.cloud.bigtable.row import DirectRow
 from google.cloud.bigtable.row_data import PartialRowData
 from google.cloud.bigtable.row_set import RowSet
 from google.cloud.bigtable.table import Table
@@ -170,9 +171,31 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         return value
 
     def set(self, key: str, value: bytes, ttl: Optional[timedelta] = None) -> None:
+        row = self.__build_row(self._get_table(), key, value, ttl)
+
+        status = row.commit()
+        if status.code != 0:
+            raise BigtableError(status.code, status.message)
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], ttl: Optional[timedelta] = None) -> None:
+        table = self._get_table()
+
+        rows = [self.__build_row(table, key, value, ttl) for key, value in items]
+
+        errors = []
+        for status in table.mutate_rows(rows):
+            if status.code != 0:
+                errors.append(BigtableError(status.code, status.message))
+
+        if errors:
+            raise BigtableError(errors)
+
+    def __build_row(
+        self, table: Table, key: str, value: bytes, ttl: Optional[timedelta] = None
+    ) -> DirectRow:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
         # ``bytes`` but we are providing it with ``str``.
-        row = self._get_table().direct_row(key)
+        row = table.direct_row(key)
 
         # Call to delete is just a state mutation, and in this case is just
         # used to clear all columns so the entire row will be replaced.
@@ -230,9 +253,7 @@ class BigtableKVStorage(KVStorage[str, bytes]):
 
         row.set_cell(self.column_family, self.data_column, value, timestamp=ts)
 
-        status = row.commit()
-        if status.code != 0:
-            raise BigtableError(status.code, status.message)
+        return row
 
     def delete(self, key: str) -> None:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
@@ -31,12 +31,21 @@ class CacheKVStorage(KVStorage[Any, Any]):
     def get(self, key: Any) -> Optional[Any]:
         return self.backend.get(key)
 
+    def get_many(self, keys: Sequence[Any]) -> Iterator[Tuple[Any, Any]]:
+        return iter(self.backend.get_many(keys).items())
+
     def set(self, key: Any, value: Any, ttl: Optional[timedelta] = None) -> None:
         self.backend.set(key, value, timeout=int(ttl.total_seconds()) if ttl is not None else None)
 
+    def set_many(self, items: Sequence[Tuple[Any, Any]], ttl: Optional[timedelta] = None) -> None:
+        self.backend.set_many(items, timeout=int(ttl.total_seconds()) if ttl is not None else None)
+
     def delete(self, key: Any) -> None:
         self.backend.delete(key)
 
+    def delete_many(self, keys: Sequence[Any]) -> None:
+        self.backend.delete_many(keys)
+
     def bootstrap(self) -> None:
         # Nothing to do in this method: the backend is expected to either not
         # require any explicit setup action (memcached, Redis) or that setup is
@@ -91,6 +100,12 @@ class CacheKeyWrapper(KVStorage[str, V]):
             ttl,
         )
 
+    def set_many(self, items: Sequence[Tuple[str, V]], ttl: Optional[timedelta] = None) -> None:
+        return self.storage.set_many(
+            [(wrap_key(self.prefix, self.version, key), value) for key, value in items],
+            ttl,
+        )
+
     def delete(self, key: str) -> None:
         self.storage.delete(wrap_key(self.prefix, self.version, key))
 
@@ -100,6 +100,17 @@ def pytest_configure(config):
     settings.CELERY_ALWAYS_EAGER = False
     settings.CELERY_EAGER_PROPAGATES_EXCEPTIONS = True
 
+    # Data created inside test transactions isn't visible from other threads
+    settings.SENTRY_SERIALIZER_ATTRS_PROVIDER_WORKERS = 0
+    # Indexed strings don't outlive the test transaction
+    settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE = 0
+    # Tests register and unregister plugins and integrations of their own
+    settings.SENTRY_LAZY_PLUGINS = False
+    # Tests change GroupHash rows directly, without invalidating the cache
+    settings.SENTRY_GROUPHASH_CACHE_ENABLED = False
+    # Tests evaluate the owners of the same group for different events
+    settings.SENTRY_OWNER_EVALUATION_DEBOUNCE = 0
+
     settings.DEBUG_VIEWS = True
     settings.SERVE_UPLOADED_FILES = True
 
@@ -1,4 +1,10 @@
-from sentry.api.serializers import Serializer, serialize
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from sentry import features
+from sentry.api.serializers import Serializer, serialize, serialize_iter
 from sentry.testutils import TestCase
 
 
@@ -16,6 +22,38 @@ class VariadicSerializer(Serializer):
         return {"kw": kw}
 
 
+class ProvidersSerializer(Serializer):
+    def get_attrs(self, item_list, user):
+        return {item: {"base": threading.get_ident()} for item in item_list}
+
+    def get_attrs_providers(self, item_list, user):
+        def get_a():
+            return {item: {"a": threading.get_ident()} for item in item_list}
+
+        def get_b():
+            return {item: {"b": threading.get_ident()} for item in item_list}
+
+        return {"a": get_a, "b": get_b}
+
+    def serialize(self, obj, attrs, user):
+        return dict(attrs)
+
+
+class FailingProviderSerializer(Serializer):
+    def get_attrs_providers(self, item_list, user):
+        def fail():
+            raise ValueError("provider failed")
+
+        return {"fail": fail}
+
+
+class FeatureFlagsSerializer(Serializer):
+    feature_flags = ("projects:discard-groups",)
+
+    def serialize(self, obj, attrs, user):
+        return features.has("projects:discard-groups", obj, actor=user)
+
+
 class BaseSerializerTest(TestCase):
     def test_serialize(self):
         assert serialize([]) == []
@@ -53,3 +91,59 @@ class BaseSerializerTest(TestCase):
         user = self.create_user()
         result = serialize(foo, user, VariadicSerializer(), kw="keyword")
         assert result["kw"] == "keyword"
+
+    def test_serialize_attrs_providers(self):
+        foo, bar = Foo(), Foo()
+
+        result = serialize([foo, bar], serializer=ProvidersSerializer())
+        assert len(result) == 2
+        for item in result:
+            assert item["base"] == item["a"] == item["b"] == threading.get_ident()
+
+        with self.settings(SENTRY_SERIALIZER_ATTRS_PROVIDER_WORKERS=2):
+            result = serialize([foo, bar], serializer=ProvidersSerializer())
+        assert len(result) == 2
+        for item in result:
+            assert item["base"] == threading.get_ident()
+            assert item["a"] != threading.get_ident()
+            assert item["b"] != threading.get_ident()
+
+    def test_serialize_attrs_providers_error(self):
+        with pytest.raises(ValueError):
+            serialize(Foo(), serializer=FailingProviderSerializer())
+
+        with self.settings(SENTRY_SERIALIZER_ATTRS_PROVIDER_WORKERS=2):
+            with pytest.raises(ValueError):
+                serialize(Foo(), serializer=FailingProviderSerializer())
+
+    def test_serialize_iter(self):
+        assert list(serialize_iter([])) == []
+
+        foo = Foo()
+        assert list(serialize_iter([foo])) == [foo], "should return the objects when unknown"
+
+        serializer = ProvidersSerializer()
+        with patch.object(serializer, "serialize", wraps=serializer.serialize) as serialize_mock:
+            rv = serialize_iter([Foo(), None, Foo()], serializer=serializer)
+            # attrs are fetched up front, objects are serialized lazily
+            assert serialize_mock.call_count == 0
+
+            assert next(rv)["a"] == threading.get_ident()
+            assert serialize_mock.call_count == 1
+            assert list(rv)[0] is None
+            assert serialize_mock.call_count == 2
+
+    def test_serialize_feature_flags(self):
+        projects = [self.project, self.create_project()]
+
+        with patch.object(features, "prefetch", wraps=features.prefetch) as prefetch:
+            manager = features.default_manager
+            with patch.object(manager, "_has", wraps=manager._has) as has:
+                result = serialize(projects, self.user, FeatureFlagsSerializer())
+
+        assert result == [False, False]
+        prefetch.assert_called_once_with(("projects:discard-groups",), projects, actor=self.user)
+        # Every check was a memo hit
+        assert has.call_count == 0
+        # Memoization is scoped to the call
+        assert features.default_manager._get_memo() is None
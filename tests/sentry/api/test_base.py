@@ -1,12 +1,14 @@
 import base64
+from unittest.mock import patch
 
 from django.http import HttpRequest
 from rest_framework.response import Response
 
-from sentry.api.base import Endpoint
+from sentry.api.base import Endpoint, stream_json_list
 from sentry.api.paginator import GenericOffsetPaginator
 from sentry.models import ApiKey
 from sentry.testutils import APITestCase
+from sentry.utils import json
 
 
 class DummyEndpoint(Endpoint):
@@ -33,6 +35,24 @@ class DummyPaginationEndpoint(Endpoint):
         )
 
 
+class DummyStreamingPaginationEndpoint(Endpoint):
+    permission_classes = ()
+
+    def get(self, request):
+        values = [{"value": x} for x in range(0, 100)]
+
+        def data_fn(offset, limit):
+            page_offset = offset * limit
+            return values[page_offset : page_offset + limit]
+
+        return self.paginate(
+            request=request,
+            paginator=GenericOffsetPaginator(data_fn),
+            on_results=lambda results: iter(results),
+            default_per_page=10,
+        )
+
+
 _dummy_endpoint = DummyEndpoint.as_view()
 
 
@@ -114,6 +134,44 @@ class PaginateTest(APITestCase):
         assert response.status_code == 400
 
 
+class StreamingPaginateTest(APITestCase):
+    def test_success(self):
+        request = self.make_request(method="GET")
+        response = DummyStreamingPaginationEndpoint().as_view()(request)
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/json"
+        assert 'rel="next"; results="true"' in response["Link"]
+        assert json.loads(b"".join(response.streaming_content)) == [
+            {"value": x} for x in range(0, 10)
+        ]
+
+    def test_stream_json_list(self):
+        assert b"".join(stream_json_list([])) == b"[]"
+
+        items = [{"a": "b" * 10, "c": [1, None]} for _ in range(100)]
+        chunks = list(stream_json_list(items, chunk_size=100))
+        assert len(chunks) > 1
+        assert json.loads(b"".join(chunks)) == items
+
+    def test_stream_errors(self):
+        def failing_items(count):
+            for i in range(count):
+                yield {"value": "x" * 1024}
+            raise ValueError("serialization failed")
+
+        # An error in the first chunk is raised before responding
+        with self.assertRaises(ValueError):
+            Endpoint().respond_with_stream(failing_items(1))
+
+        # An error in a later chunk truncates the response and is logged
+        response = Endpoint().respond_with_stream(failing_items(200))
+        with patch("sentry.api.base.logger") as mock_logger:
+            with self.assertRaises(ValueError):
+                b"".join(response.streaming_content)
+        mock_logger.exception.assert_called_once_with("api.streaming-response.failed")
+
+
 class EndpointJSONBodyTest(APITestCase):
     def setUp(self):
         super().setUp()
@@ -1,6 +1,8 @@
 import copy
 
-from sentry.attachments.base import BaseAttachmentCache, CachedAttachment
+import pytest
+
+from sentry.attachments.base import BaseAttachmentCache, CachedAttachment, MissingAttachmentChunks
 
 
 class InMemoryCache:
@@ -13,6 +15,7 @@ class InMemoryCache:
         self.data = {}
         #: Used to check for consistent usage of `raw` param
         self.raw_map = {}
+        self.get_many_calls = 0
 
     def get(self, key, raw=False):
         assert key not in self.raw_map or raw == self.raw_map[key]
@@ -28,6 +31,19 @@ class InMemoryCache:
     def delete(self, key):
         del self.data[key]
 
+    def get_many(self, keys, raw=False):
+        self.get_many_calls += 1
+        values = {key: self.get(key, raw=raw) for key in keys}
+        return {key: value for key, value in values.items() if value is not None}
+
+    def set_many(self, items, timeout=None, raw=False):
+        for key, value in items:
+            self.set(key, value, timeout, raw=raw)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.data.pop(key, None)
+
 
 def test_meta_basic():
     att = CachedAttachment(key="c:foo", id=123, name="lol.txt", content_type="text/plain", chunks=3)
@@ -79,6 +95,33 @@ def test_basic_chunked():
     assert not list(cache.get("c:foo"))
 
 
+def test_iter_data_reads_ahead():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunks([("c:foo", 123, i, b"%d," % i) for i in range(5)])
+
+    att = CachedAttachment(key="c:foo", id=123, name="lol.txt", chunks=5, cache=cache)
+    assert list(cache.iter_data(att, read_ahead=2)) == [b"0,", b"1,", b"2,", b"3,", b"4,"]
+    assert data.get_many_calls == 3
+
+    assert b"".join(att.iter_data()) == att.data == b"0,1,2,3,4,"
+
+
+def test_iter_data_missing_chunks():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunks([("c:foo", 123, i, b"%d," % i) for i in (0, 1, 3)])
+
+    att = CachedAttachment(key="c:foo", id=123, name="lol.txt", chunks=4, cache=cache)
+    chunks = cache.iter_data(att, read_ahead=2)
+    assert next(chunks) == b"0,"
+    assert next(chunks) == b"1,"
+    with pytest.raises(MissingAttachmentChunks):
+        next(chunks)
+
+
 def test_basic_unchunked():
     data = InMemoryCache()
     cache = BaseAttachmentCache(data)
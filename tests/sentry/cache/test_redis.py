@@ -19,3 +19,18 @@ class RedisCacheTest(TestCase):
 
         with self.assertRaises(ValueTooLarge):
             self.backend.set("foo", "x" * (RedisCache.max_size + 1), 0)
+
+    def test_many(self):
+        self.backend.set_many([("foo", {"foo": "bar"}), ("bar", [1, 2])], 50)
+
+        assert self.backend.get_many(["foo", "bar", "baz"]) == {
+            "foo": {"foo": "bar"},
+            "bar": [1, 2],
+        }
+
+        self.backend.delete_many(["foo", "baz"])
+
+        assert self.backend.get_many(["foo", "bar", "baz"]) == {"bar": [1, 2]}
+
+        with self.assertRaises(ValueTooLarge):
+            self.backend.set_many([("foo", "x" * (RedisCache.max_size + 1))], 0)
@@ -1,11 +1,16 @@
 import contextlib
 import time
+import uuid
+from datetime import timedelta
 from threading import Thread
+from unittest import mock
 
 import pytest
+from django.utils import timezone
 
 from sentry.event_manager import _save_aggregate
 from sentry.eventstore.models import CalculatedHashes, Event
+from sentry.models import Group, GroupHash, GroupStatus
 
 
 @pytest.mark.django_db(transaction=True)
@@ -87,3 +92,101 @@ def test_group_creation_race(monkeypatch, default_project, is_race_free):
         # assert many groups are new
         assert 1 < len({rv[0].id for rv in return_values}) <= CONCURRENCY
         assert 1 < sum(rv[1] for rv in return_values) <= CONCURRENCY
+
+
+@pytest.fixture
+def grouphash_cache(settings):
+    from sentry.grouping.grouphash_cache import grouphash_cache
+
+    settings.SENTRY_GROUPHASH_CACHE_ENABLED = True
+    grouphash_cache.clear_local_cache()
+    yield grouphash_cache
+    grouphash_cache.clear_local_cache()
+
+
+def save_aggregate(project, hashes, hierarchical_hashes=()):
+    evt = Event(project.id, uuid.uuid4().hex, data={"timestamp": time.time()})
+    return _save_aggregate(
+        evt,
+        hashes=CalculatedHashes(
+            hashes=hashes,
+            hierarchical_hashes=list(hierarchical_hashes),
+            tree_labels=[[{"function": "foo"}] for _ in hierarchical_hashes],
+        ),
+        release=None,
+        metadata={},
+        received_timestamp=None,
+        level=10,
+        culprit="",
+    )
+
+
+@pytest.mark.django_db
+def test_grouphash_cache(default_project, grouphash_cache):
+    group, is_new, _ = save_aggregate(default_project, ["a" * 32, "b" * 32])
+    assert is_new
+
+    # Looked up in the database, and cached
+    assert save_aggregate(default_project, ["a" * 32, "b" * 32])[:2] == (group, False)
+
+    get_or_create = GroupHash.objects.get_or_create
+    with mock.patch.object(GroupHash.objects, "get_or_create", wraps=get_or_create) as mocked:
+        assert save_aggregate(default_project, ["a" * 32, "b" * 32])[:2] == (group, False)
+        assert not mocked.called
+
+        # Events with any hash that isn't cached are looked up
+        assert save_aggregate(default_project, ["a" * 32, "c" * 32])[:2] == (group, False)
+        assert mocked.call_count == 2
+
+
+@pytest.mark.django_db
+def test_grouphash_cache_hierarchical_hashes(default_project, grouphash_cache):
+    hashes = ["a" * 32]
+    group = save_aggregate(default_project, hashes, ["c" * 32, "d" * 32])[0]
+    assert save_aggregate(default_project, hashes, ["c" * 32, "d" * 32])[0] == group
+
+    get_or_create = GroupHash.objects.get_or_create
+    with mock.patch.object(GroupHash.objects, "get_or_create", wraps=get_or_create) as mocked:
+        assert save_aggregate(default_project, hashes, ["c" * 32, "d" * 32])[0] == group
+        assert mocked.called
+
+
+@pytest.mark.django_db
+def test_grouphash_cache_invalidation(default_project, grouphash_cache):
+    from sentry.tasks.unmerge import lock_hashes, unlock_hashes
+
+    group = save_aggregate(default_project, ["a" * 32])[0]
+    save_aggregate(default_project, ["a" * 32])
+
+    other_group = save_aggregate(default_project, ["b" * 32])[0]
+    locked_hashes = lock_hashes(default_project.id, group.id, ["a" * 32])
+    GroupHash.objects.filter(project=default_project, hash="a" * 32).update(group=other_group)
+    unlock_hashes(default_project.id, locked_hashes)
+
+    assert save_aggregate(default_project, ["a" * 32])[0] == other_group
+
+
+@pytest.mark.django_db
+def test_grouphash_cache_deleted_group(default_project, grouphash_cache):
+    group = save_aggregate(default_project, ["a" * 32])[0]
+    save_aggregate(default_project, ["a" * 32])
+
+    Group.objects.filter(id=group.id).delete()
+
+    new_group, is_new, _ = save_aggregate(default_project, ["a" * 32])
+    assert is_new
+    assert new_group.id != group.id
+
+
+@pytest.mark.django_db
+def test_grouphash_cache_regression(default_project, grouphash_cache):
+    group = save_aggregate(default_project, ["a" * 32])[0]
+    save_aggregate(default_project, ["a" * 32])
+    assert save_aggregate(default_project, ["a" * 32])[:3] == (group, False, False)
+
+    # Bulk resolving doesn't invalidate the model cache of the group
+    Group.objects.filter(id=group.id).update(
+        status=GroupStatus.RESOLVED, active_at=timezone.now() - timedelta(hours=1)
+    )
+
+    assert save_aggregate(default_project, ["a" * 32])[:3] == (group, False, True)
@@ -0,0 +1,79 @@
+import tracemalloc
+import zlib
+from hashlib import sha1
+
+import pytest
+
+from sentry.attachments import attachment_cache
+from sentry.event_manager import save_attachment
+from sentry.models import EventAttachment, File, FileBlobIndex
+
+CHUNK_SIZE = 1024 * 1024
+ATTACHMENT_SIZE = 200 * 1024 * 1024
+
+
+@pytest.mark.django_db
+def test_save_attachment_streams_chunks(default_project):
+    cache_key = f"e:{'a' * 32}:{default_project.id}"
+    chunk = bytes(range(256)) * (CHUNK_SIZE // 256)
+    chunks = ATTACHMENT_SIZE // CHUNK_SIZE
+
+    checksum = sha1()
+    for chunk_index in range(chunks):
+        attachment_cache.set_chunk(cache_key, "lol", chunk_index, chunk, timeout=3600)
+        checksum.update(chunk)
+
+    attachment = attachment_cache.get_from_chunks(
+        key=cache_key,
+        id="lol",
+        name="lol.bin",
+        content_type="application/octet-stream",
+        type="event.attachment",
+        chunks=chunks,
+        size=ATTACHMENT_SIZE,
+    )
+
+    # Peak Python heap usage rather than RSS, since the peak RSS of the test
+    # process can't be reset.
+    tracemalloc.start()
+    try:
+        save_attachment(cache_key, attachment, default_project, "a" * 32)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Not much more than a blob and the chunks that are read ahead are held in
+    # memory at once.
+    assert peak < ATTACHMENT_SIZE / 4
+
+    (event_attachment,) = EventAttachment.objects.filter(project_id=default_project.id)
+    file = File.objects.get(id=event_attachment.file_id)
+    assert file.size == ATTACHMENT_SIZE
+    assert file.checksum == checksum.hexdigest()
+
+
+@pytest.mark.django_db
+def test_save_attachment_corrupt_chunk(default_project, settings):
+    settings.SENTRY_ATTACHMENT_BLOB_SIZE = 1024
+    cache_key = f"e:{'a' * 32}:{default_project.id}"
+    for chunk_index in range(3):
+        attachment_cache.set_chunk(cache_key, "lol", chunk_index, b"x" * 1024, timeout=3600)
+
+    attachment = attachment_cache.get_from_chunks(
+        key=cache_key,
+        id="lol",
+        name="lol.bin",
+        content_type="application/octet-stream",
+        type="event.attachment",
+        chunks=3,
+        size=3 * 1024,
+    )
+    # The first blobs are written before the corrupt chunk is reached
+    attachment_cache.inner.set(list(attachment.chunk_keys)[2], b"rubbish", 3600, raw=True)
+
+    with pytest.raises(zlib.error):
+        save_attachment(cache_key, attachment, default_project, "a" * 32)
+
+    assert not EventAttachment.objects.filter(project_id=default_project.id).exists()
+    assert not File.objects.filter(name="lol.bin").exists()
+    assert not FileBlobIndex.objects.exists()
@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import defaultdict, deque
+from unittest.mock import Mock, patch
+
+import pytest
+from confluent_kafka import TopicPartition
+
+from sentry.eventstream.kafka.partitionedforwarder import PartitionedPostProcessForwarder
+from sentry.utils import json
+from sentry.utils.batching_kafka_consumer import KafkaConsumerFacade
+
+TOPIC = "events"
+
+
+def make_message(partition, offset):
+    payload = [
+        2,
+        "insert",
+        {
+            "group_id": 43,
+            "event_id": "%032x" % (partition * 1000000 + offset),
+            "organization_id": 1,
+            "project_id": 1,
+            "primary_hash": "311ee66a5b8e697929804ceb1c456ffe",
+        },
+        {
+            "is_new": False,
+            "is_regression": None,
+            "is_new_group_environment": False,
+            "skip_consume": False,
+        },
+    ]
+    message = Mock()
+    message.topic.return_value = TOPIC
+    message.partition.return_value = partition
+    message.offset.return_value = offset
+    message.error.return_value = None
+    message.headers.return_value = []
+    message.value.return_value = json.dumps(payload)
+    return message
+
+
+class FakeConsumer(KafkaConsumerFacade):
+    """
+    Consumer of a topic with the given number of messages in every partition,
+    that returns messages of all partitions which are not paused in turn.
+    """
+
+    def __init__(self, messages_per_partition):
+        self.messages = {
+            partition: deque(make_message(partition, offset) for offset in range(count))
+            for partition, count in messages_per_partition.items()
+        }
+        self.paused = set()
+        self.committed = {}
+        self.closed = False
+        self.__turn = 0
+
+    def subscribe(self, topics, on_assign=None, on_revoke=None):
+        self.on_revoke = on_revoke
+        on_assign(self, [TopicPartition(TOPIC, partition) for partition in self.messages])
+
+    def poll(self, timeout):
+        partitions = sorted(self.messages)
+        for i in range(len(partitions)):
+            partition = partitions[(self.__turn + i) % len(partitions)]
+            if partition not in self.paused and self.messages[partition]:
+                self.__turn += i + 1
+                return self.messages[partition].popleft()
+        return None
+
+    def commit(self, offsets=None, asynchronous=True):
+        for i in offsets:
+            assert i.offset >= self.committed.get(i.partition, 0)
+            self.committed[i.partition] = i.offset
+        return offsets
+
+    def pause(self, partitions):
+        self.paused.update(i.partition for i in partitions)
+
+    def resume(self, partitions):
+        self.paused.difference_update(i.partition for i in partitions)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBroker:
+    """
+    Broker that accepts post process tasks, blocking those of slow partitions
+    until they are released and failing a number of times first for flaky
+    partitions.
+    """
+
+    def __init__(self, slow_partitions=(), failures=None):
+        self.released = {partition: threading.Event() for partition in slow_partitions}
+        self.failures = defaultdict(int, failures or {})
+        self.dispatched = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def release(self, partition):
+        self.released[partition].set()
+
+    def dispatch(self, event_id, **kwargs):
+        partition, offset = divmod(int(event_id, 16), 1000000)
+        if partition in self.released:
+            self.released[partition].wait()
+        with self.lock:
+            if self.failures[partition] > 0:
+                self.failures[partition] -= 1
+                raise Exception("Broker unavailable")
+            self.dispatched[partition].append(offset)
+
+
+def run_until(forwarder, condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "Timed out waiting for the forwarder"
+        forwarder._run_once()
+
+
+@pytest.fixture
+def broker():
+    broker = FakeBroker(slow_partitions=[0])
+    yield broker
+    # Don't leave threads of failed tests waiting on the broker.
+    broker.release(0)
+
+
+@pytest.fixture
+def dispatch(broker):
+    with patch(
+        "sentry.eventstream.kafka.partitionedforwarder.dispatch_post_process_group_task",
+        side_effect=broker.dispatch,
+    ) as dispatch:
+        yield dispatch
+
+
+def create_forwarder(consumer, **kwargs):
+    kwargs.setdefault("window_size", 4)
+    kwargs.setdefault("concurrency", 2)
+    return PartitionedPostProcessForwarder(
+        topics=[TOPIC],
+        consumer=consumer,
+        commit_batch_size=1,
+        commit_batch_timeout_ms=60000,
+        retry_backoff_ms=0,
+        poll_timeout=0,
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+def test_slow_partition_does_not_block_others(broker, dispatch):
+    consumer = FakeConsumer({0: 20, 1: 20, 2: 20, 3: 20})
+    forwarder = create_forwarder(consumer)
+
+    # The broker doesn't accept any task of partition 0, yet the other
+    # partitions are forwarded and committed completely.
+    run_until(forwarder, lambda: all(consumer.committed.get(p) == 20 for p in (1, 2, 3)))
+
+    for partition in (1, 2, 3):
+        assert sorted(broker.dispatched[partition]) == list(range(20))
+    assert broker.dispatched[0] == []
+    assert 0 not in consumer.committed
+    # Partition 0 is paused with a full window rather than read into memory.
+    assert consumer.paused == {0}
+    assert len(consumer.messages[0]) > 0
+
+    broker.release(0)
+    run_until(forwarder, lambda: consumer.committed.get(0) == 20)
+
+    assert sorted(broker.dispatched[0]) == list(range(20))
+    assert consumer.paused == set()
+
+    forwarder.signal_shutdown()
+    forwarder.run()
+    assert consumer.closed
+
+
+@pytest.mark.django_db
+def test_commits_lowest_forwarded_offset(broker, dispatch):
+    consumer = FakeConsumer({0: 3})
+    forwarder = create_forwarder(consumer, concurrency=1)
+    forwarder.message_filter = lambda message: message.offset() == 0
+
+    # Offsets 1 and 2 are skipped, but can't be committed before offset 0
+    # was forwarded.
+    run_until(forwarder, lambda: not consumer.messages[0])
+    forwarder._run_once()
+    assert 0 not in consumer.committed
+
+    broker.release(0)
+    run_until(forwarder, lambda: consumer.committed.get(0) == 3)
+    assert broker.dispatched[0] == [0]
+
+
+@pytest.mark.django_db
+def test_dispatch_retries():
+    broker = FakeBroker(failures={0: 3})
+    consumer = FakeConsumer({0: 2})
+    forwarder = create_forwarder(consumer, max_retries=3)
+
+    with patch(
+        "sentry.eventstream.kafka.partitionedforwarder.dispatch_post_process_group_task",
+        side_effect=broker.dispatch,
+    ):
+        run_until(forwarder, lambda: consumer.committed.get(0) == 2)
+
+    assert sorted(broker.dispatched[0]) == [0, 1]
+
+
+@pytest.mark.django_db
+def test_dispatch_retries_exhausted():
+    broker = FakeBroker(failures={0: 4})
+    consumer = FakeConsumer({0: 1})
+    forwarder = create_forwarder(consumer, max_retries=3)
+
+    with patch(
+        "sentry.eventstream.kafka.partitionedforwarder.dispatch_post_process_group_task",
+        side_effect=broker.dispatch,
+    ):
+        # The forwarder stops once a task couldn't be dispatched after all retries.
+        with pytest.raises(Exception, match="Broker unavailable"):
+            run_until(forwarder, lambda: False)
+
+    assert broker.dispatched[0] == []
+    assert 0 not in consumer.committed
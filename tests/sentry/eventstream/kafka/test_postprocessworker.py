@@ -4,6 +4,7 @@ import pytest
 
 from sentry import options
 from sentry.eventstream.kafka.postprocessworker import (
+    _BATCH_SIZE_OPTION,
     _CONCURRENCY_OPTION,
     ErrorsPostProcessForwarderWorker,
     PostProcessForwarderWorker,
@@ -286,3 +287,53 @@ def test_transactions_post_process_forwarder_true_headers(
     )
 
     forwarder.shutdown()
+
+
+@pytest.mark.django_db
+@patch("sentry.eventstream.kafka.postprocessworker.post_process_group_batch")
+@patch("sentry.eventstream.kafka.postprocessworker.dispatch_post_process_group_task")
+def test_post_process_forwarder_task_batches(
+    dispatch_post_process_group_task, post_process_group_batch, kafka_message_payload
+):
+    """
+    Tests that events are dispatched in batches of the same project when the option is set.
+    """
+    options.set(_BATCH_SIZE_OPTION, 2)
+    forwarder = PostProcessForwarderWorker(concurrency=2)
+
+    messages = []
+    for project_id, event_id in [(1, "a"), (2, "b"), (1, "c"), (1, "d")]:
+        kafka_message_payload[2]["project_id"] = project_id
+        kafka_message_payload[2]["event_id"] = event_id * 32
+        mock_message = Mock()
+        mock_message.value = MagicMock(return_value=json.dumps(kafka_message_payload))
+        mock_message.partition = MagicMock("1")
+        messages.append(mock_message)
+
+    forwarder.flush_batch([forwarder.process_message(message) for message in messages])
+
+    assert not dispatch_post_process_group_task.called
+    batches = [
+        [event["cache_key"] for event in call[1]["events"]]
+        for call in post_process_group_batch.delay.call_args_list
+    ]
+    assert sorted(batches) == [
+        ["e:" + "a" * 32 + ":1", "e:" + "c" * 32 + ":1"],
+        ["e:" + "b" * 32 + ":2"],
+        ["e:" + "d" * 32 + ":1"],
+    ]
+    events = {
+        event["cache_key"]: event
+        for call in post_process_group_batch.delay.call_args_list
+        for event in call[1]["events"]
+    }
+    assert events["e:" + "a" * 32 + ":1"] == {
+        "is_new": False,
+        "is_regression": None,
+        "is_new_group_environment": False,
+        "primary_hash": "311ee66a5b8e697929804ceb1c456ffe",
+        "cache_key": "e:" + "a" * 32 + ":1",
+        "group_id": 43,
+    }
+
+    forwarder.shutdown()
@@ -209,3 +209,128 @@ class FeatureManagerTest(TestCase):
         assert manager.has("organizations:feature", actor=self.user, organization=self.organization)
         assert manager.has("projects:feature", actor=self.user, project=self.project)
         assert manager.has("auth:register", actor=self.user)
+
+    def test_has_memoized(self):
+        handler = mock.Mock(return_value=True)
+        handler.features = ["projects:feature"]
+        manager = features.FeatureManager()
+        manager.add("projects:feature", features.ProjectFeature)
+        manager.add_handler(handler)
+
+        # Without memoization every call runs the handlers
+        assert manager.has("projects:feature", self.project, actor=self.user)
+        assert manager.has("projects:feature", self.project, actor=self.user)
+        assert len(handler.mock_calls) == 2
+
+        manager.enable_memoization()
+        try:
+            assert manager.has("projects:feature", self.project, actor=self.user)
+            assert manager.has("projects:feature", self.project, actor=self.user)
+            assert len(handler.mock_calls) == 3
+
+            # Different actor is memoized separately
+            assert manager.has("projects:feature", self.project)
+            assert len(handler.mock_calls) == 4
+        finally:
+            manager.disable_memoization()
+
+        assert manager.has("projects:feature", self.project, actor=self.user)
+        assert len(handler.mock_calls) == 5
+
+    def test_prefetch(self):
+        projects = [self.create_project(organization=self.organization) for _ in range(5)]
+
+        class TestProjectHandler(features.FeatureHandler):
+            features = {"projects:feature"}
+
+            def __init__(self):
+                self.hit_counter = 0
+
+            def has(self, feature, actor):
+                self.hit_counter += 1
+                return True if feature.project == projects[0] else None
+
+        handler = TestProjectHandler()
+        entity_handler = MockBatchHandler()
+        entity_handler.batch_has = mock.Mock(
+            return_value={f"project:{projects[1].id}": {"projects:feature": False}}
+        )
+
+        manager = features.FeatureManager()
+        manager.add("projects:feature", features.ProjectFeature)
+        manager.add_handler(handler)
+        manager.add_entity_handler(entity_handler)
+
+        # Nothing to fill without memoization
+        manager.prefetch(["projects:feature"], projects, actor=self.user)
+        assert handler.hit_counter == 0
+
+        manager.enable_memoization()
+        try:
+            with self.settings(SENTRY_FEATURES={"projects:feature": True}):
+                manager.prefetch(["projects:feature"], projects, actor=self.user)
+            assert handler.hit_counter == 5
+            assert len(entity_handler.batch_has.mock_calls) == 1
+
+            assert [manager.has("projects:feature", p, actor=self.user) for p in projects] == [
+                True,
+                False,
+                True,
+                True,
+                True,
+            ]
+            assert handler.hit_counter == 5
+            assert len(entity_handler.batch_has.mock_calls) == 1
+        finally:
+            manager.disable_memoization()
+
+    def test_prefetch_organizations(self):
+        organizations = [self.organization, self.create_organization()]
+
+        class TestOrganizationHandler(features.BatchFeatureHandler):
+            features = {"organizations:feature"}
+
+            def _check_for_batch(self, feature_name, organization, actor):
+                return organization == organizations[0] or None
+
+        handler = TestOrganizationHandler()
+        entity_handler = MockBatchHandler()
+        entity_handler.batch_has = mock.Mock(
+            side_effect=lambda names, actor, organization: {
+                f"organization:{organization.id}": {name: True for name in names}
+            }
+        )
+
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", features.OrganizationFeature)
+        manager.add("organizations:other-feature", features.OrganizationFeature)
+        manager.add_handler(handler)
+        manager.add_entity_handler(entity_handler)
+
+        manager.enable_memoization()
+        try:
+            with mock.patch.object(handler, "has_for_batch", wraps=handler.has_for_batch) as batch:
+                manager.prefetch(
+                    ["organizations:feature", "organizations:other-feature"],
+                    organizations,
+                    actor=self.user,
+                )
+            # The handler is run once for all organizations
+            assert batch.call_count == 1
+            # The entity handler is asked once per organization about every feature left
+            assert entity_handler.batch_has.call_count == 2
+            entity_handler.batch_has.assert_any_call(
+                ["organizations:other-feature"], self.user, organization=organizations[0]
+            )
+            entity_handler.batch_has.assert_any_call(
+                ["organizations:feature", "organizations:other-feature"],
+                self.user,
+                organization=organizations[1],
+            )
+
+            for organization in organizations:
+                assert manager.has("organizations:feature", organization, actor=self.user)
+                assert manager.has("organizations:other-feature", organization, actor=self.user)
+            assert entity_handler.batch_has.call_count == 2
+        finally:
+            manager.disable_memoization()
@@ -0,0 +1,89 @@
+import pytest
+
+from sentry.grouping.grouphash_cache import CachedGroupHash, GroupHashCache
+from sentry.models import GroupHash
+
+
+def make_cache(local_ttl=60):
+    return GroupHashCache(cluster="default", ttl=60, local_ttl=local_ttl, local_cache_size=100)
+
+
+@pytest.mark.django_db
+def test_get_many(default_project, default_group):
+    cache = make_cache()
+    grouphashes = [
+        GroupHash.objects.create(project=default_project, hash="a" * 32, group=default_group),
+        GroupHash.objects.create(project=default_project, hash="b" * 32),
+        GroupHash.objects.create(
+            project=default_project, hash="c" * 32, group=default_group, group_tombstone_id=1
+        ),
+        GroupHash.objects.create(
+            project=default_project,
+            hash="d" * 32,
+            group=default_group,
+            state=GroupHash.State.LOCKED_IN_MIGRATION,
+        ),
+    ]
+
+    version, entries = cache.get_many(default_project.id, [gh.hash for gh in grouphashes])
+    assert entries == {}
+
+    cache.set_many(default_project.id, version, grouphashes)
+
+    locked_in_migration = grouphashes[3]
+    expected = {
+        "a" * 32: CachedGroupHash(grouphashes[0].id, default_group.id, None),
+        locked_in_migration.hash: CachedGroupHash(
+            locked_in_migration.id, default_group.id, GroupHash.State.LOCKED_IN_MIGRATION
+        ),
+    }
+    assert cache.get_many(default_project.id, [gh.hash for gh in grouphashes]) == (
+        version,
+        expected,
+    )
+
+    # Another process reads the entries from Redis
+    assert make_cache().get_many(default_project.id, [gh.hash for gh in grouphashes]) == (
+        version,
+        expected,
+    )
+
+
+@pytest.mark.django_db
+def test_invalidate(default_project, default_group):
+    cache = make_cache()
+    other_process = make_cache(local_ttl=0)
+    stale_process = make_cache()
+
+    grouphash = GroupHash.objects.create(
+        project=default_project, hash="a" * 32, group=default_group
+    )
+    version, _ = cache.get_many(default_project.id, [grouphash.hash])
+    cache.set_many(default_project.id, version, [grouphash])
+    assert other_process.get_many(default_project.id, [grouphash.hash])[1]
+    assert stale_process.get_many(default_project.id, [grouphash.hash])[1]
+
+    cache.invalidate([default_project.id])
+
+    assert cache.get_many(default_project.id, [grouphash.hash]) == (version + 1, {})
+    assert other_process.get_many(default_project.id, [grouphash.hash]) == (version + 1, {})
+
+    # Until the local version expires, entries of the previous version are used
+    assert stale_process.get_many(default_project.id, [grouphash.hash])[1]
+    stale_process.clear_local_cache()
+    assert stale_process.get_many(default_project.id, [grouphash.hash]) == (version + 1, {})
+
+
+@pytest.mark.django_db
+def test_set_many_after_invalidation(default_project, default_group):
+    cache = make_cache()
+    grouphash = GroupHash.objects.create(
+        project=default_project, hash="a" * 32, group=default_group
+    )
+
+    # The row was read before the project was invalidated, it must not be used
+    version, _ = cache.get_many(default_project.id, [grouphash.hash])
+    cache.invalidate([default_project.id])
+    cache.set_many(default_project.id, version, [grouphash])
+
+    assert cache.get_many(default_project.id, [grouphash.hash]) == (version + 1, {})
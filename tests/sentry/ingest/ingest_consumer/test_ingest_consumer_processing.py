@@ -9,6 +9,7 @@ from sentry.event_manager import EventManager
 from sentry.ingest.ingest_consumer import (
     process_attachment_chunk,
     process_event,
+    process_events,
     process_individual_attachment,
     process_userreport,
 )
@@ -69,6 +70,41 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
     }
 
 
+@pytest.mark.django_db
+def test_process_events(default_project, task_runner, preprocess_event):
+    payloads = [
+        get_normalized_event({"message": f"hello world {i}"}, default_project) for i in range(2)
+    ]
+    project_id = default_project.id
+    start_time = time.time() - 3600
+
+    # The second event is a duplicate of the first one
+    process_events(
+        [
+            {
+                "payload": json.dumps(payload),
+                "start_time": start_time,
+                "event_id": payload["event_id"],
+                "project_id": project_id,
+                "remote_addr": "127.0.0.1",
+            }
+            for payload in [payloads[0], payloads[0], payloads[1]]
+        ],
+        projects={default_project.id: default_project},
+    )
+
+    assert preprocess_event == [
+        {
+            "cache_key": f"e:{payload['event_id']}:{project_id}",
+            "data": payload,
+            "event_id": payload["event_id"],
+            "project": default_project,
+            "start_time": start_time,
+        }
+        for payload in payloads
+    ]
+
+
 @pytest.mark.django_db
 def test_transactions_spawn_save_event_transaction(
     default_project,
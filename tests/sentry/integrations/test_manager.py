@@ -1,4 +1,8 @@
+from unittest import mock
+
 from sentry import integrations
+from sentry.integrations.example import ExampleIntegrationProvider
+from sentry.integrations.manager import IntegrationManager
 from sentry.integrations.vsts_extension import VstsExtensionIntegrationProvider
 from sentry.testutils import TestCase
 
@@ -7,3 +11,14 @@ class TestIntegrations(TestCase):
     def test_excludes_non_visible_integrations(self):
         # The VSTSExtension is not visible
         assert all(not isinstance(i, VstsExtensionIntegrationProvider) for i in integrations.all())
+
+    def test_register_lazy(self):
+        manager = IntegrationManager()
+        manager.register_lazy("sentry.integrations.example.ExampleIntegrationProvider")
+        manager.register_lazy("sentry.integrations.example.DoesNotExist")
+
+        with mock.patch.object(ExampleIntegrationProvider, "setup") as setup:
+            assert manager.exists("example")
+            assert not manager.exists("does-not-exist")
+            assert isinstance(manager.get("example"), ExampleIntegrationProvider)
+            assert setup.call_count == 1
@@ -126,6 +126,16 @@ class FileTest(TestCase):
         with self.assertRaises(ValueError):
             fp.read()
 
+    def test_putchunks(self):
+        file1 = File.objects.create(name="baz.js", type="default")
+        results = file1.putchunks([b"fo", b"", b"o bar b", b"a", b"z"], 3)
+        assert [result.offset for result in results] == [0, 3, 6, 9]
+        assert [result.blob.size for result in results] == [3, 3, 3, 2]
+        assert file1.size == 11
+
+        with file1.getfile() as fp:
+            assert fp.read() == b"foo bar baz"
+
     def test_seek(self):
         """Test behavior of seek with difference values for whence"""
         bytes = BytesIO(b"abcdefghijklmnopqrstuvwxyz")
@@ -1,7 +1,21 @@
+import time
+from threading import Thread
+
 import pytest
+from django.db import OperationalError, connection, transaction
 
 from sentry import options
-from sentry.models import Counter
+from sentry.models import Counter, Group
+from sentry.models import counter as counter_module
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
+
+
+@pytest.fixture
+def local_blocks():
+    counter_module._blocks.clear()
+    yield
+    counter_module._blocks.clear()
 
 
 @pytest.mark.django_db
@@ -11,3 +25,93 @@ def test_increment(default_project, upsert_sample_rate):
 
     assert Counter.increment(default_project, 42) == 42
     assert Counter.increment(default_project, 1) == 43
+
+
+@pytest.mark.django_db(transaction=True)
+def test_next_value(default_project, local_blocks):
+    assert Counter.next_value(default_project) == 1
+    assert Counter.next_value(default_project) == 2
+    assert Counter.objects.get(project=default_project).value == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_next_value_blocks(default_project, local_blocks):
+    with override_options({"store.projectcounter-block-size": 10}):
+        assert [Counter.next_value(default_project) for _ in range(12)] == list(range(1, 13))
+
+    assert Counter.objects.get(project=default_project).value == 20
+
+    # Values left in blocks are handed out even if the block size changes
+    assert Counter.next_value(default_project) == 13
+
+
+@pytest.mark.django_db(transaction=True)
+def test_next_value_blocks_rollback(default_project, local_blocks):
+    with override_options({"store.projectcounter-block-size": 10}):
+        with pytest.raises(ZeroDivisionError), transaction.atomic():
+            assert Counter.next_value(default_project) == 1
+            1 / 0
+
+        # The counter was rolled back, so must be the block
+        assert Counter.next_value(default_project) == 1
+        assert Counter.next_value(default_project) == 2
+
+
+def create_groups(project, threads, groups_per_thread):
+    """
+    Creates groups in the project from many threads at once, the way events
+    create new groups. Returns the short IDs of the created groups, the number
+    of groups that could not be created because of a timeout, and the time it
+    took.
+    """
+    short_ids = []
+    timeouts = []
+
+    def run():
+        try:
+            for _ in range(groups_per_thread):
+                try:
+                    with transaction.atomic():
+                        short_id = project.next_short_id()
+                        Group.objects.create(project=project, short_id=short_id)
+                except OperationalError:
+                    timeouts.append(1)
+                else:
+                    short_ids.append(short_id)
+        finally:
+            connection.close()
+
+    start = time.monotonic()
+    workers = [Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    return short_ids, len(timeouts), time.monotonic() - start
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("block_size", [1, 10])
+def test_next_short_id_concurrency(default_project, local_blocks, block_size):
+    with override_options({"store.projectcounter-block-size": block_size}):
+        short_ids, timeouts, _ = create_groups(default_project, 8, 25)
+
+    assert len(short_ids) + timeouts == 8 * 25
+    assert len(set(short_ids)) == len(short_ids)
+    assert sorted(short_ids) == sorted(
+        Group.objects.filter(project=default_project).values_list("short_id", flat=True)
+    )
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("block_size", [1, 100])
+def test_benchmark_next_short_id_concurrency(default_project, local_blocks, block_size, benchmark):
+    with override_options({"store.projectcounter-block-size": block_size}):
+        short_ids, timeouts, duration = benchmark.pedantic(
+            create_groups, args=(default_project, 32, 50), rounds=1
+        )
+
+    benchmark.extra_info["groups_per_second"] = len(short_ids) / duration
+    benchmark.extra_info["timeouts"] = timeouts
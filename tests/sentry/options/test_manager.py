@@ -297,6 +297,18 @@ class OptionsManagerTest(TestCase):
         keys = list(self.manager.filter(flag=FLAG_REQUIRED))
         assert {k.name for k in keys} == {"required", "nostorerequired"}
 
+    def test_warm_cache(self):
+        self.manager.register("nostore", flags=FLAG_NOSTORE)
+        self.manager.set("foo", "bar")
+        self.store.flush_local_cache()
+
+        assert self.manager.warm_cache() == 1
+        assert set(self.store._local_cache) == {self.manager.lookup_key("foo").cache_key}
+
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            with patch.object(self.store.cache, "get", side_effect=RuntimeError()):
+                assert self.manager.get("foo") == "bar"
+
     def test_isset(self):
         self.manager.register("basic")
         assert self.manager.isset("basic") is False
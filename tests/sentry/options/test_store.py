@@ -1,3 +1,4 @@
+from time import sleep
 from unittest.mock import patch
 from uuid import uuid1
 
@@ -149,3 +150,84 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+    def test_get_many(self):
+        store = self.store
+        key1, key2, key3 = self.make_key(), self.make_key(), self.make_key()
+
+        store.set(key1, "foo")
+        store.set(key2, "bar")
+        # Only in the database, should be written back into the cache
+        store.cache.delete(key2.cache_key)
+
+        assert store.get_many([key1, key2, key3]) == {
+            key1.cache_key: "foo",
+            key2.cache_key: "bar",
+        }
+        assert store.cache.get(key2.cache_key) == "bar"
+
+    def test_get_many_db_unavailable(self):
+        store = self.store
+        key1, key2 = self.make_key(), self.make_key()
+        store.set(key1, "foo")
+
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            assert store.get_many([key1, key2]) == {key1.cache_key: "foo"}
+
+    def test_warm_local_cache(self):
+        store = self.store
+        key1, key2 = self.make_key(), self.make_key()
+        store.set(key1, "foo")
+        store.flush_local_cache()
+
+        assert store.warm_local_cache([key1, key2, self.make_key(ttl=0)]) == 2
+        assert len(store._local_cache) == 2
+
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            with patch.object(store.cache, "get", side_effect=RuntimeError()):
+                assert store.get(key1) == "foo"
+                # Known to be unset, served without hitting the network
+                assert store.get(key2) is None
+
+        # Setting a key after warm up replaces the unset marker
+        store.set(key2, "bar")
+        assert store.get(key2) == "bar"
+
+    def test_warm_local_cache_db_unavailable(self):
+        store = self.store
+        key1, key2 = self.make_key(), self.make_key()
+        store.set(key1, "foo")
+        store.set(key2, "bar")
+        store.cache.delete(key2.cache_key)
+
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            # Only the value found in the cache is loaded, the other is kept
+            assert store.warm_local_cache([key1, key2]) == 1
+
+            with patch.object(store.cache, "get", side_effect=RuntimeError()):
+                assert store.get(key1) == "foo"
+                assert store.get(key2) == "bar"
+
+        store.flush_local_cache()
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            assert store.warm_local_cache([key2]) == 0
+        # Not marked as unset, so it is still read from the database
+        assert store.get(key2) == "bar"
+
+    def test_background_refresh(self):
+        store, key = self.store, self.key
+        store.set(key, "foo")
+        store.flush_local_cache()
+
+        with patch.object(store, "warm_local_cache") as warm_local_cache:
+            store.start_background_refresh(lambda: [key], 0.01)
+            try:
+                for _ in range(100):
+                    if warm_local_cache.called:
+                        break
+                    sleep(0.01)
+            finally:
+                store.stop_background_refresh()
+
+        warm_local_cache.assert_called_with([key], silent=True)
+        assert store._refresh is None
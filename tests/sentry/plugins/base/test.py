@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.conf.urls import url
 
 from sentry.plugins.base.response import JSONResponse
@@ -82,3 +84,42 @@ class Plugin2TestCase(TestCase):
         assert a_plugin.get_option("key", project=project) == "value"
         a_plugin.reset_options(project=project)
         assert a_plugin.get_option("key", project=project) is None
+
+
+class LazyPlugin(Plugin2):
+    title = "Lazy"
+    slug = "lazy"
+
+
+class LazySetupPlugin(Plugin2):
+    title = "Lazy Setup"
+    slug = "lazy-setup"
+
+
+def test_plugin_manager_register_lazy():
+    from sentry.plugins.base.bindings import BindingManager
+    from sentry.plugins.base.manager import PluginManager
+
+    def load_broken():
+        raise ImportError("broken")
+
+    manager = PluginManager()
+    load = mock.Mock(return_value=LazyPlugin)
+    setup = mock.Mock()
+    manager.register_lazy("lazy", load)
+    manager.register_lazy("broken", load_broken, setup)
+    manager.register_lazy("lazy-setup", lambda: LazySetupPlugin, setup)
+    assert not load.called
+
+    # Looking up bindings loads pending plugins, as they can add bindings
+    bindings = BindingManager()
+    bindings.add_loader(manager.load)
+    bindings.get("repository.provider")
+    assert load.call_count == 1
+    assert setup.call_count == 1
+    assert isinstance(setup.call_args[0][0], LazySetupPlugin)
+
+    assert isinstance(manager.get("lazy"), LazyPlugin)
+    assert [plugin.slug for plugin in manager.all(version=None)] == ["lazy", "lazy-setup"]
+    assert load.call_count == 1
+    assert setup.call_count == 1
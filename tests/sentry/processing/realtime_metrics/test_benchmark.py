@@ -0,0 +1,44 @@
+from typing import Any, Dict, Generator
+
+import pytest
+
+from sentry.processing.realtime_metrics.redis import RedisRealtimeMetricsStore
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import redis
+
+UNRELATED_KEYS = 1000000
+ACTIVE_PROJECTS = 100
+
+
+@pytest.fixture
+def store() -> Generator[RedisRealtimeMetricsStore, None, None]:
+    config: Dict[str, Any] = {
+        "cluster": "default",
+        "counter_bucket_size": 10,
+        "counter_time_window": 120,
+        "duration_bucket_size": 10,
+        "duration_time_window": 120,
+        "backoff_timer": 1,
+    }
+    cluster, _ = redis.get_cluster_from_options(
+        "TEST_CLUSTER", config, cluster_manager=redis.redis_clusters
+    )
+
+    for start in range(0, UNRELATED_KEYS, 10000):
+        cluster.mset({f"unrelated:{i}": 1 for i in range(start, start + 10000)})
+
+    store = RedisRealtimeMetricsStore(**config)
+    for project_id in range(ACTIVE_PROJECTS):
+        store.increment_project_event_counter(project_id, 1147)
+        store.increment_project_duration_counter(project_id, 1147, 20)
+
+    yield store
+
+    cluster.flushdb()
+
+
+@requires_pytest_benchmark
+def test_benchmark_projects(store: RedisRealtimeMetricsStore, benchmark: Any) -> None:
+    project_ids = benchmark(lambda: list(store.projects(now=1150)))
+
+    assert len(project_ids) == ACTIVE_PROJECTS
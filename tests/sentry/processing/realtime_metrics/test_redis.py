@@ -328,73 +328,109 @@ def test_projects_unset(store: RedisRealtimeMetricsStore) -> None:
     assert list(candidates) == []
 
 
-def test_projects_empty(
-    store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
-) -> None:
-    redis_cluster.set(
-        "symbolicate_event_low_priority:counter:10:42:111",
-        0,
-    )
-    redis_cluster.delete("symbolicate_event_low_priority:counter:10:42:111")
+def test_projects_one_count(store: RedisRealtimeMetricsStore) -> None:
+    store.increment_project_event_counter(42, 1147)
 
-    candidates = store.projects()
-    assert list(candidates) == []
+    candidates = store.projects(now=1150)
+    assert list(candidates) == [42]
 
 
-def test_projects_different_bucket(
-    store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
-) -> None:
-    redis_cluster.set("symbolicate_event_low_priority:counter:5:42:111", 0)
+def test_projects_one_histogram(store: RedisRealtimeMetricsStore) -> None:
+    store.increment_project_duration_counter(42, 1147, 20)
 
-    candidates = store.projects()
-    assert list(candidates) == []
+    candidates = store.projects(now=1150)
+    assert list(candidates) == [42]
 
 
-def test_projects_negative_timestamp(
-    store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
-) -> None:
-    redis_cluster.set("symbolicate_event_low_priority:counter:10:42:-111", 0)
+def test_projects_negative_timestamp(store: RedisRealtimeMetricsStore) -> None:
+    store.increment_project_event_counter(42, -111)
 
-    candidates = store.projects()
+    candidates = store.projects(now=-100)
     assert list(candidates) == [42]
 
 
-def test_projects_one_count(
+def test_projects_multiple_metric_types(store: RedisRealtimeMetricsStore) -> None:
+    store.increment_project_event_counter(42, 1147)
+    store.increment_project_duration_counter(53, 1147, 20)
+
+    candidates = store.projects(now=1150)
+    assert list(candidates) == [42, 53]
+
+
+def test_projects_expired(
     store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
 ) -> None:
-    redis_cluster.set("symbolicate_event_low_priority:counter:10:42:111", 0)
+    store.increment_project_event_counter(42, 1147)
+    store.increment_project_event_counter(53, 1247)
 
-    candidates = store.projects()
-    assert list(candidates) == [42]
+    # The time window is 120 seconds plus one bucket
+    candidates = store.projects(now=1270)
+    assert list(candidates) == [42, 53]
 
+    candidates = store.projects(now=1271)
+    assert list(candidates) == [53]
+    assert redis_cluster.zrange("symbolicate_event_low_priority:projects:10:10", 0, -1) == ["53"]
 
-def test_projects_one_histogram(
-    store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
+
+def test_projects_different_bucket(
+    store: RedisRealtimeMetricsStore, config: Dict[str, Any]
 ) -> None:
-    redis_cluster.hset("symbolicate_event_low_priority:duration:10:42:111:0", 0, 123)
+    other_store = RedisRealtimeMetricsStore(**{**config, "counter_bucket_size": 5})
+    other_store.increment_project_event_counter(53, 1147)
+    store.increment_project_event_counter(42, 1147)
 
-    candidates = store.projects()
-    assert list(candidates) == [42]
+    assert list(store.projects(now=1150)) == [42]
+    assert list(other_store.projects(now=1150)) == [53]
 
 
-def test_projects_multiple_metric_types(
+def test_projects_unrelated_keys(
     store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
 ) -> None:
-    redis_cluster.set("symbolicate_event_low_priority:counter:10:42:111", 0)
-    redis_cluster.hset("symbolicate_event_low_priority:duration:10:53:111:20", 20, 456)
+    redis_cluster.set("symbolicate_event_low_priority:counter:10:42:1140", 1)
 
-    candidates = store.projects()
-    assert list(candidates) == [42, 53]
+    candidates = store.projects(now=1150)
+    assert list(candidates) == []
 
 
-def test_projects_mixed_buckets(
-    store: RedisRealtimeMetricsStore, redis_cluster: redis._RedisCluster
+#
+# flush()
+#
+
+
+def test_buffered_increments(config: Dict[str, Any], redis_cluster: redis._RedisCluster) -> None:
+    store = RedisRealtimeMetricsStore(**{**config, "flush_interval": 60})
+    store.increment_project_event_counter(17, 1147)
+    store.increment_project_event_counter(17, 1149)
+    store.increment_project_duration_counter(17, 1147, 15)
+    store.increment_project_duration_counter(17, 1149, 19)
+
+    assert redis_cluster.get("symbolicate_event_low_priority:counter:10:17:1140") is None
+    assert list(store.projects(now=1150)) == []
+
+    store.flush()
+
+    assert redis_cluster.get("symbolicate_event_low_priority:counter:10:17:1140") == "2"
+    assert redis_cluster.hget("symbolicate_event_low_priority:duration:10:17:1140", "10") == "2"
+    assert list(store.projects(now=1150)) == [17]
+
+    # Nothing left to write
+    store.flush()
+    assert redis_cluster.get("symbolicate_event_low_priority:counter:10:17:1140") == "2"
+
+
+def test_flush_keeps_newer_activity(
+    config: Dict[str, Any], redis_cluster: redis._RedisCluster
 ) -> None:
-    redis_cluster.set("symbolicate_event_low_priority:counter:10:42:111", 0)
-    redis_cluster.set("symbolicate_event_low_priority:counter:5:53:111", 0)
+    store = RedisRealtimeMetricsStore(**{**config, "flush_interval": 60})
+    late_store = RedisRealtimeMetricsStore(**{**config, "flush_interval": 60})
+    store.increment_project_event_counter(17, 1147)
+    late_store.increment_project_event_counter(17, 1100)
 
-    candidates = store.projects()
-    assert list(candidates) == [42]
+    store.flush()
+    # A worker that flushes late doesn't move the project back in time
+    late_store.flush()
+
+    assert redis_cluster.zscore("symbolicate_event_low_priority:projects:10:10", 17) == 1140
 
 
 #
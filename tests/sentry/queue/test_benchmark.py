@@ -0,0 +1,144 @@
+import pickle
+from datetime import datetime
+
+import pytest
+from django.db.models import F
+from django.utils import timezone
+
+from sentry.models import Group
+from sentry.queue.serializer import dumps, loads
+from sentry.testutils.skips import requires_pytest_benchmark
+
+
+def make_event_data():
+    return {
+        "event_id": "a" * 32,
+        "project": 1,
+        "platform": "python",
+        "timestamp": 1636000000.5,
+        "received": 1636000001.25,
+        "level": "error",
+        "logger": "",
+        "environment": "production",
+        "release": "backend@21.11.0",
+        "tags": [["server_name", "web-1"], ["browser", "Chrome 95"]],
+        "user": {"id": "42", "ip_address": "127.0.0.1"},
+        "exception": {
+            "values": [
+                {
+                    "type": "ValueError",
+                    "value": "invalid literal for int() with base 10: 'foo'",
+                    "stacktrace": {
+                        "frames": [
+                            {
+                                "abs_path": f"/srv/app/module{i}.py",
+                                "filename": f"module{i}.py",
+                                "function": f"handler{i}",
+                                "module": f"app.module{i}",
+                                "lineno": 100 + i,
+                                "in_app": i % 2 == 0,
+                                "context_line": f"    return process(value, index={i})",
+                                "pre_context": ["def handler(value):", "    index = 0"],
+                                "post_context": ["", ""],
+                                "vars": {"value": "'foo'", "index": str(i)},
+                            }
+                            for i in range(20)
+                        ]
+                    },
+                }
+            ]
+        },
+    }
+
+
+# (args, kwargs, embed) of typical messages of the tasks with the highest volume
+PAYLOADS = {
+    "preprocess_event": (
+        (),
+        {"cache_key": "e:" + "a" * 32 + ":1", "start_time": 1636000000.5, "event_id": "a" * 32},
+        {},
+    ),
+    "process_event": (
+        (),
+        {
+            "cache_key": "e:" + "a" * 32 + ":1",
+            "start_time": 1636000000.5,
+            "event_id": "a" * 32,
+            "data_has_changed": False,
+        },
+        {},
+    ),
+    "save_event": (
+        (),
+        {
+            "data": make_event_data(),
+            "start_time": 1636000000.5,
+            "event_id": "a" * 32,
+            "project_id": 1,
+        },
+        {},
+    ),
+    "post_process_group": (
+        (),
+        {
+            "is_new": False,
+            "is_regression": False,
+            "is_new_group_environment": True,
+            "cache_key": "e:" + "a" * 32 + ":1",
+            "group_id": 1234,
+        },
+        {},
+    ),
+    "process_incr": (
+        (),
+        {
+            "model": Group,
+            "columns": {"times_seen": 1},
+            "filters": {"id": 1234},
+            "extra": {"last_seen": datetime(2021, 11, 4, 12, 0, 0, 123456, tzinfo=timezone.utc)},
+            "signal_only": None,
+        },
+        {},
+    ),
+    "process_incr_expression": (
+        (),
+        {
+            "model": Group,
+            "columns": {"times_seen": 1},
+            "filters": {"id": 1234},
+            "extra": {"data": F("data")},
+        },
+        {},
+    ),
+}
+
+ENCODINGS = {
+    "pickle": (
+        lambda value: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+        pickle.loads,
+    ),
+    "sentry-msgpack": (dumps, loads),
+    "sentry-msgpack-zstd": (lambda value: dumps(value, compression_threshold=1024), loads),
+}
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("encoding", sorted(ENCODINGS))
+@pytest.mark.parametrize("task", sorted(PAYLOADS))
+def test_benchmark_encode(task, encoding, benchmark):
+    encode, _ = ENCODINGS[encoding]
+    payload = PAYLOADS[task]
+
+    data = benchmark(encode, payload)
+    benchmark.extra_info["size"] = len(data)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("encoding", sorted(ENCODINGS))
+@pytest.mark.parametrize("task", sorted(PAYLOADS))
+def test_benchmark_decode(task, encoding, benchmark):
+    encode, decode = ENCODINGS[encoding]
+    data = encode(PAYLOADS[task])
+
+    benchmark(decode, data)
+    benchmark.extra_info["size"] = len(data)
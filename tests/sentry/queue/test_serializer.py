@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytz
+from django.db.models import F
+from kombu.serialization import dumps as kombu_dumps
+from kombu.serialization import loads as kombu_loads
+
+from sentry.models import Group, Project
+from sentry.queue.routers import get_queue_serializer, get_task_serializer
+from sentry.queue.serializer import COMPRESSED_SERIALIZER, SERIALIZER, dumps, loads
+from sentry.tasks.post_process import post_process_group
+from sentry.tasks.process_buffer import process_incr
+from sentry.tasks.store import save_event
+from sentry.testutils import TestCase
+
+
+class SerializerTest(TestCase):
+    def test_builtin_types(self):
+        value = {
+            "str": "foo",
+            "bytes": b"\x00\xff",
+            "int": 2 ** 63 - 1,
+            "float": 1.5,
+            "list": [1, None, True],
+            "dict": {1: "int key"},
+        }
+        assert loads(dumps(value)) == value
+
+        # Tuples are decoded as lists
+        assert loads(dumps((1, 2))) == [1, 2]
+
+    def test_datetimes(self):
+        aware = datetime(2021, 11, 3, 10, 20, 30, 123456, tzinfo=pytz.utc)
+        naive = datetime(1969, 12, 31, 23, 59, 59, 1)
+        other_tz = aware.astimezone(pytz.timezone("Europe/Vienna"))
+
+        result = loads(dumps([aware, naive, other_tz]))
+        assert result == [aware, naive, aware]
+        assert result[0].tzinfo is not None
+        assert result[1].tzinfo is None
+
+    def test_models(self):
+        project = self.create_project()
+        project_only = Project.objects.only("id", "slug").get(id=project.id)
+
+        result = loads(dumps({"model": Group, "project": project, "deferred": project_only}))
+
+        assert result["model"] is Group
+        assert isinstance(result["project"], Project)
+        assert result["project"].id == project.id
+        assert result["project"].name == project.name
+        assert result["project"].date_added == project.date_added
+        assert not result["project"]._state.adding
+        assert result["deferred"].get_deferred_fields() == project_only.get_deferred_fields()
+
+    def test_pickle_fallback(self):
+        value = {"expression": F("times_seen") + 1, "delta": timedelta(days=1), "big": 2 ** 64}
+        assert loads(dumps(value)) == value
+
+    def test_compression(self):
+        value = {"data": "x" * 1000}
+
+        assert loads(dumps(value, compression_threshold=2000)) == value
+        assert loads(dumps(value, compression_threshold=100)) == value
+        assert len(dumps(value, compression_threshold=100)) < len(dumps(value))
+
+    def test_kombu_registration(self):
+        value = ((), {"cache_key": "e:1:abc", "start_time": 1.5}, {})
+        for serializer in (SERIALIZER, COMPRESSED_SERIALIZER):
+            content_type, content_encoding, data = kombu_dumps(value, serializer=serializer)
+            assert kombu_loads(data, content_type, content_encoding) == [
+                [],
+                {"cache_key": "e:1:abc", "start_time": 1.5},
+                {},
+            ]
+
+
+class QueueSerializerRoutingTest(TestCase):
+    def test_get_queue_serializer(self):
+        with self.settings(
+            SENTRY_CELERY_QUEUE_SERIALIZERS={
+                "events.save_event": COMPRESSED_SERIALIZER,
+                "counters": SERIALIZER,
+            }
+        ):
+            assert get_queue_serializer("events.save_event") == COMPRESSED_SERIALIZER
+            assert get_queue_serializer("counters-0") == SERIALIZER
+            assert get_queue_serializer("events.process_event") is None
+            assert get_queue_serializer(None) is None
+
+    def test_get_task_serializer(self):
+        with self.settings(
+            SENTRY_CELERY_QUEUE_SERIALIZERS={
+                "events.save_event": COMPRESSED_SERIALIZER,
+                "counters": SERIALIZER,
+            }
+        ):
+            assert get_task_serializer(save_event) == COMPRESSED_SERIALIZER
+            assert get_task_serializer(process_incr) == SERIALIZER
+            assert get_task_serializer(process_incr, queue="counters-3") == SERIALIZER
+            assert get_task_serializer(post_process_group) is None
+            assert get_task_serializer(save_event, queue="events.process_event") is None
+
+    @mock.patch("kombu.messaging.Producer._publish")
+    def test_send_task(self, mock_publish):
+        with self.settings(SENTRY_CELERY_QUEUE_SERIALIZERS={"counters": SERIALIZER}):
+            process_incr.apply_async(kwargs={"columns": {"times_seen": 1}})
+        content_type = mock_publish.call_args[0][2]
+        assert content_type == "application/x-sentry-msgpack"
+
+        post_process_group.apply_async(kwargs={"cache_key": "e:1:abc"})
+        content_type = mock_publish.call_args[0][2]
+        assert content_type == "application/x-python-serialize"
+
+    @mock.patch("sentry.queue.serializer.dumps", wraps=dumps)
+    def test_compression_threshold_setting(self, mock_dumps):
+        with self.settings(SENTRY_CELERY_COMPRESSION_THRESHOLD=10):
+            kombu_dumps({"data": "x"}, serializer=COMPRESSED_SERIALIZER)
+        assert mock_dumps.call_args[0][1] == 10
@@ -1,11 +1,14 @@
+import threading
+import time
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from sentry.release_health import duplex
 from sentry.release_health.duplex import ComparatorType as Ct
 from sentry.release_health.duplex import DuplexReleaseHealthBackend, ListSet
+from sentry.testutils.helpers import override_options
 
 
 @pytest.mark.parametrize(
@@ -518,3 +521,134 @@ def test_function_dispatch_is_working():
     duplex.sessions.get_current_and_previous_crash_free_rates.assert_called_with(*call_params)
     # check metrics backend were not called again (only one original call)
     assert duplex.metrics.get_current_and_previous_crash_free_rates.call_count == 1
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def shadowed_duplex():
+    def make(**kwargs):
+        duplex = DuplexReleaseHealthBackend(datetime(2021, 10, 4, 12, 0), **kwargs)
+        duplex.sessions = MagicMock()
+        duplex.metrics = MagicMock()
+        duplex.sessions.get_project_sessions_count.return_value = {"count": 1}
+        duplex.metrics.get_project_sessions_count.return_value = {"count": 1}
+        return duplex
+
+    with patch("sentry.release_health.duplex.features.has", return_value=True), patch(
+        "sentry.release_health.duplex.compare_results", return_value=[]
+    ) as compare_results, patch("sentry.release_health.duplex.incr") as incr:
+        yield make, compare_results, incr
+
+
+def _dispatch(duplex, should_compare=True):
+    organization = MagicMock(id=1)
+    return duplex._dispatch_call(
+        "get_project_sessions_count", should_compare, 60, organization, None, 1, 2
+    )
+
+
+def _shadow_results(incr):
+    return [
+        call[1]["tags"]["result"]
+        for call in incr.call_args_list
+        if call[0][0] == "releasehealth.metrics.shadow"
+    ]
+
+
+@pytest.mark.django_db
+def test_shadow_call_is_off_the_critical_path(shadowed_duplex):
+    make, compare_results, incr = shadowed_duplex
+    duplex = make(shadow_workers=1)
+
+    unblock_metrics = threading.Event()
+
+    def slow_metrics(*args):
+        unblock_metrics.wait(5)
+        return {"count": 2}
+
+    duplex.metrics.get_project_sessions_count.side_effect = slow_metrics
+
+    start = time.monotonic()
+    result = _dispatch(duplex)
+    # Returns without waiting on the metrics backend
+    assert time.monotonic() - start < 1
+    assert result == {"count": 1}
+    duplex.sessions.get_project_sessions_count.assert_called_once_with(1, 2)
+    assert compare_results.call_count == 0
+
+    # The caller mutating the result doesn't affect the comparison
+    result["count"] = 3
+
+    unblock_metrics.set()
+    _wait_for(lambda: compare_results.call_count == 1)
+    assert compare_results.call_args[0][:2] == ({"count": 1}, {"count": 2})
+    _wait_for(lambda: _shadow_results(incr) == ["completed"])
+
+
+@pytest.mark.django_db
+def test_shadow_call_closes_connections(shadowed_duplex):
+    make, compare_results, incr = shadowed_duplex
+    duplex = make(shadow_workers=1)
+
+    threads = []
+    with patch(
+        "sentry.release_health.duplex.close_old_connections",
+        side_effect=lambda: threads.append(threading.current_thread()),
+    ):
+        assert _dispatch(duplex) == {"count": 1}
+        _wait_for(lambda: threads)
+
+    # Connections are closed on the pool's thread rather than the caller's
+    assert threads != [threading.current_thread()]
+    assert threads[0].name.startswith("releasehealth")
+
+
+@pytest.mark.django_db
+def test_shadow_call_dropped(shadowed_duplex):
+    make, compare_results, incr = shadowed_duplex
+    duplex = make(shadow_workers=1, shadow_timeout=0.1)
+
+    unblock_metrics = threading.Event()
+
+    def slow_metrics(*args):
+        unblock_metrics.wait(5)
+        return {"count": 1}
+
+    duplex.metrics.get_project_sessions_count.side_effect = slow_metrics
+
+    # One running and one queued shadow call saturate the pool
+    for _ in range(3):
+        assert _dispatch(duplex) == {"count": 1}
+    assert _shadow_results(incr) == ["dropped"]
+
+    time.sleep(0.2)
+    unblock_metrics.set()
+    _wait_for(lambda: len(_shadow_results(incr)) == 3)
+    assert _shadow_results(incr) == ["dropped"] * 3
+    assert compare_results.call_count == 0
+
+
+@pytest.mark.django_db
+def test_shadow_call_sampling(shadowed_duplex):
+    make, compare_results, incr = shadowed_duplex
+    duplex = make(shadow_workers=0)
+
+    sample_rates = {"get_project_sessions_count": 0}
+    with override_options({"release-health.duplex.sample-rates": sample_rates}):
+        assert _dispatch(duplex) == {"count": 1}
+    assert duplex.metrics.get_project_sessions_count.call_count == 0
+
+    # Inline shadow calls
+    assert _dispatch(duplex) == {"count": 1}
+    assert duplex.metrics.get_project_sessions_count.call_count == 1
+    assert compare_results.call_count == 1
+
+    # Not compared if the sessions result says so
+    assert _dispatch(duplex, should_compare=lambda _: False) == {"count": 1}
+    assert duplex.metrics.get_project_sessions_count.call_count == 1
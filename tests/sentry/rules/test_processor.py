@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from unittest import mock
 from unittest.mock import patch
 
+import pytest
 from django.core.cache import cache
 from django.db import DEFAULT_DB_ALIAS, connections
 from django.test.utils import CaptureQueriesContext
@@ -13,7 +14,10 @@ from sentry.rules import init_registry
 from sentry.rules.conditions import EventCondition
 from sentry.rules.filters.base import EventFilter
 from sentry.rules.processor import RuleProcessor
+from sentry.rules.status import rule_status_store
 from sentry.testutils import TestCase
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.tsdb.inmemory import InMemoryTSDB
 
 EMAIL_ACTION_DATA = {
     "id": "sentry.mail.actions.NotifyEmailAction",
@@ -22,6 +26,12 @@ EMAIL_ACTION_DATA = {
 }
 
 EVERY_EVENT_COND_DATA = {"id": "sentry.rules.conditions.every_event.EveryEventCondition"}
+EVENT_FREQUENCY_COND_ID = "sentry.rules.conditions.event_frequency.EventFrequencyCondition"
+FATAL_LEVEL_FILTER_DATA = {
+    "id": "sentry.rules.filters.level.LevelFilter",
+    "match": "eq",
+    "level": "50",
+}
 
 
 class MockConditionTrue(EventCondition):
@@ -161,6 +171,38 @@ class RuleProcessorTest(TestCase):
             # creates no rows.
             self.run_query_test(rp, 2)
 
+    def test_redis_rule_status(self):
+        rule_2 = Rule.objects.create(
+            project=self.event.project,
+            data={"conditions": [EVERY_EVENT_COND_DATA], "actions": [EMAIL_ACTION_DATA]},
+        )
+        rp = RuleProcessor(
+            self.event,
+            is_new=True,
+            is_regression=True,
+            is_new_group_environment=True,
+            has_reappeared=True,
+        )
+        with self.settings(SENTRY_RULE_STATUS_REDIS_ENABLED=True):
+            results = list(rp.apply())
+            assert len(results) == 1
+            assert {future.rule for future in results[0][1]} == {self.rule, rule_2}
+
+            # Statuses are neither read nor written in Postgres once the rules
+            # were evaluated for the group
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+                assert list(rp.apply()) == []
+            assert not [q for q in queries.captured_queries if "grouprulestatus" in str(q)]
+
+            rule_status_store.persist_pending(100)
+            statuses = GroupRuleStatus.objects.filter(group=self.event.group)
+            assert {status.rule_id for status in statuses} == {self.rule.id, rule_2.id}
+            assert all(status.last_active is not None for status in statuses)
+
+            later = timezone.now() + timedelta(minutes=Rule.DEFAULT_FREQUENCY + 1)
+            with patch("sentry.rules.processor.timezone.now", return_value=later):
+                assert len(list(rp.apply())) == 1
+
     @patch(
         "sentry.constants._SENTRY_RULES",
         [
@@ -198,6 +240,138 @@ class RuleProcessorTest(TestCase):
         # mock condition first.
         assert passes.call_count == 0
 
+    def create_cooldown_rules(self, count, condition):
+        for _ in range(count):
+            rule = Rule.objects.create(
+                project=self.event.project,
+                data={"conditions": [condition], "actions": [EMAIL_ACTION_DATA]},
+            )
+            GroupRuleStatus.objects.create(
+                rule=rule,
+                group=self.event.group,
+                project=self.event.project,
+                last_active=timezone.now(),
+            )
+
+    def create_filtered_rules(self, count, condition):
+        for _ in range(count):
+            Rule.objects.create(
+                project=self.event.project,
+                data={
+                    "conditions": [FATAL_LEVEL_FILTER_DATA, condition],
+                    "actions": [EMAIL_ACTION_DATA],
+                },
+            )
+
+    def test_frequency_conditions_query_count(self):
+        Rule.objects.filter(project=self.event.project).delete()
+
+        unique_user_frequency = (
+            "sentry.rules.conditions.event_frequency.EventUniqueUserFrequencyCondition"
+        )
+        intervals = ["1m", "5m", "15m", "1h", "1d"]
+        passing_rules = set()
+        for i in range(50):
+            condition = {
+                "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+                "interval": intervals[i % len(intervals)],
+                "value": 0 if i % 2 else 100,
+            }
+            if i % 10 == 3:
+                condition["comparisonType"] = "percent"
+                condition["comparisonInterval"] = "1h"
+                condition["value"] = 100
+            elif i % 10 == 5:
+                condition["id"] = unique_user_frequency
+            rule = Rule.objects.create(
+                project=self.event.project,
+                data={"conditions": [condition], "actions": [EMAIL_ACTION_DATA]},
+            )
+            if condition["value"] == 0 and condition["id"].endswith(".EventFrequencyCondition"):
+                passing_rules.add(rule)
+
+        # Rules in cooldown would pass, but neither fire nor add queries
+        self.create_cooldown_rules(5, {"id": unique_user_frequency, "interval": "1w", "value": 0})
+        # Rules whose filters fail would pass, but never fire
+        self.create_filtered_rules(5, {"id": EVENT_FREQUENCY_COND_ID, "interval": "1h", "value": 0})
+
+        rp = RuleProcessor(
+            self.event,
+            is_new=True,
+            is_regression=True,
+            is_new_group_environment=True,
+            has_reappeared=True,
+        )
+        with patch.object(
+            InMemoryTSDB, "get_range", autospec=True, side_effect=InMemoryTSDB.get_range
+        ) as get_range, patch.object(
+            InMemoryTSDB,
+            "get_distinct_counts_totals",
+            autospec=True,
+            side_effect=InMemoryTSDB.get_distinct_counts_totals,
+        ) as get_distinct_counts_totals:
+            results = list(rp.apply())
+
+        # One range for each rollup of the intervals, and one distinct count for
+        # each interval of the unique user conditions.
+        assert get_range.call_count == 2
+        assert get_distinct_counts_totals.call_count == 1
+
+        assert len(results) == 1
+        _, futures = results[0]
+        assert {future.rule for future in futures} == passing_rules
+
+    def test_frequency_conditions_not_fetched(self):
+        Rule.objects.filter(project=self.event.project).delete()
+        condition = {"id": EVENT_FREQUENCY_COND_ID, "interval": "1h", "value": 0}
+        self.create_cooldown_rules(5, condition)
+        self.create_filtered_rules(5, condition)
+
+        rp = RuleProcessor(
+            self.event,
+            is_new=True,
+            is_regression=True,
+            is_new_group_environment=True,
+            has_reappeared=True,
+        )
+        with patch("sentry.rules.processor.fetch_tsdb_queries") as fetch_tsdb_queries, patch(
+            "sentry.rules.conditions.event_frequency.BaseEventFrequencyCondition.passes"
+        ) as passes:
+            results = list(rp.apply())
+
+        assert results == []
+        assert not fetch_tsdb_queries.called
+        assert not passes.called
+
+    def test_frequency_conditions_fetch_failure(self):
+        self.rule.update(
+            data={
+                "conditions": [
+                    {
+                        "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+                        "interval": "1h",
+                        "value": 0,
+                    }
+                ],
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+        rp = RuleProcessor(
+            self.event,
+            is_new=True,
+            is_regression=True,
+            is_new_group_environment=True,
+            has_reappeared=True,
+        )
+        with patch(
+            "sentry.rules.processor.fetch_tsdb_queries", side_effect=Exception("boom")
+        ) as fetch_tsdb_queries:
+            results = list(rp.apply())
+
+        # Conditions query on their own
+        assert fetch_tsdb_queries.called
+        assert len(results) == 1
+
 
 # mock filter which always passes
 class MockFilterTrue(EventFilter):
@@ -412,3 +586,37 @@ class RuleProcessorTestFilters(TestCase):
         assert len(futures) == 1
         assert futures[0].rule == self.rule
         assert futures[0].kwargs == {}
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("redis_rule_status", [False, True])
+def test_benchmark_hot_group(factories, default_project, settings, redis_rule_status, benchmark):
+    settings.SENTRY_RULE_STATUS_REDIS_ENABLED = redis_rule_status
+    event = factories.store_event(data={}, project_id=default_project.id)
+    Rule.objects.filter(project=default_project).delete()
+    for _ in range(20):
+        Rule.objects.create(
+            project=default_project,
+            data={"conditions": [EVERY_EVENT_COND_DATA], "actions": [EMAIL_ACTION_DATA]},
+        )
+
+    def evaluate_rules():
+        rp = RuleProcessor(
+            event,
+            is_new=False,
+            is_regression=False,
+            is_new_group_environment=False,
+            has_reappeared=False,
+        )
+        return list(rp.apply())
+
+    # All rules fire for the first event, and are rate-limited for every
+    # event of the group afterwards.
+    assert len(evaluate_rules()) == 1
+
+    with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+        assert evaluate_rules() == []
+    assert benchmark(evaluate_rules) == []
+
+    benchmark.extra_info["queries"] = len(queries.captured_queries)
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from sentry.models import GroupRuleStatus, Rule
+from sentry.rules.status import RedisRuleStatusStore, StoredRuleStatus
+from sentry.testutils import TestCase
+
+
+class RedisRuleStatusStoreTest(TestCase):
+    def setUp(self):
+        self.store = RedisRuleStatusStore(cluster="default", ttl=60)
+        self.rule = Rule.objects.create(project=self.project)
+        self.other_rule = Rule.objects.create(project=self.project)
+        self.now = timezone.now().replace(microsecond=0)
+
+    def test_get_many_seeds_from_rows(self):
+        GroupRuleStatus.objects.create(
+            group=self.group, rule=self.rule, project=self.project, last_active=self.now
+        )
+
+        expected = {
+            self.rule.id: StoredRuleStatus(self.rule.id, GroupRuleStatus.ACTIVE, self.now),
+            self.other_rule.id: StoredRuleStatus(self.other_rule.id, GroupRuleStatus.ACTIVE, None),
+        }
+        rule_ids = [self.rule.id, self.other_rule.id]
+        assert self.store.get_many(self.group, rule_ids) == expected
+
+        # Statuses are read from Redis once seeded, and no rows are created
+        GroupRuleStatus.objects.all().delete()
+        with self.assertNumQueries(0):
+            assert self.store.get_many(self.group, rule_ids) == expected
+
+    def test_mark_active(self):
+        window = timedelta(minutes=30)
+        assert self.store.mark_active(self.group, self.rule.id, self.now, self.now - window)
+        assert not self.store.mark_active(self.group, self.rule.id, self.now, self.now - window)
+
+        later = self.now + window + timedelta(seconds=1)
+        assert self.store.mark_active(self.group, self.rule.id, later, later - window)
+
+        assert self.store.get_many(self.group, [self.rule.id]) == {
+            self.rule.id: StoredRuleStatus(self.rule.id, GroupRuleStatus.ACTIVE, later)
+        }
+
+    def test_mark_active_seeded(self):
+        GroupRuleStatus.objects.create(
+            group=self.group, rule=self.rule, project=self.project, last_active=self.now
+        )
+        self.store.get_many(self.group, [self.rule.id])
+
+        window_start = self.now - timedelta(minutes=30)
+        assert not self.store.mark_active(self.group, self.rule.id, self.now, window_start)
+
+    def test_persist_pending(self):
+        existing = GroupRuleStatus.objects.create(
+            group=self.group, rule=self.rule, project=self.project
+        )
+        window_start = self.now - timedelta(minutes=30)
+        self.store.mark_active(self.group, self.rule.id, self.now, window_start)
+        self.store.mark_active(self.group, self.other_rule.id, self.now, window_start)
+
+        # A rule that is deleted before its status is persisted
+        deleted_rule = Rule.objects.create(project=self.project)
+        self.store.mark_active(self.group, deleted_rule.id, self.now, window_start)
+        deleted_rule.delete()
+
+        assert self.store.persist_pending(10) == 3
+        assert self.store.persist_pending(10) == 0
+
+        existing.refresh_from_db()
+        assert existing.last_active == self.now
+        created = GroupRuleStatus.objects.get(group=self.group, rule=self.other_rule)
+        assert created.last_active == self.now
+        assert created.project_id == self.project.id
+        assert not GroupRuleStatus.objects.filter(rule_id=deleted_rule.id).exists()
+
+    def test_persist_pending_batches(self):
+        rules = [Rule.objects.create(project=self.project) for _ in range(3)]
+        for rule in rules:
+            self.store.mark_active(self.group, rule.id, self.now, self.now - timedelta(minutes=30))
+
+        assert self.store.persist_pending(2) == 2
+        assert self.store.persist_pending(2) == 1
+        assert GroupRuleStatus.objects.filter(group=self.group).count() == 3
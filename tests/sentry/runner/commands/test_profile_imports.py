@@ -0,0 +1,51 @@
+import subprocess
+from unittest import mock
+
+from sentry.runner.commands.profile_imports import parse_import_times, profile_imports
+from sentry.testutils import CliTestCase
+
+IMPORT_TIMES = """\
+import time: self [us] | cumulative | imported package
+import time:       241 |        241 |   _io
+import time:        51 |       5321 | sentry.runner
+import time:      4000 |       4000 |   sentry.slow
+/some/file.py:1: DeprecationWarning: whatever
+import time:       100 |       1030 |     sentry.cumulative
+"""
+
+
+def test_parse_import_times():
+    assert parse_import_times(IMPORT_TIMES.splitlines()) == [
+        ("_io", 241, 241),
+        ("sentry.runner", 51, 5321),
+        ("sentry.slow", 4000, 4000),
+        ("sentry.cumulative", 100, 1030),
+    ]
+
+
+class ProfileImportsTest(CliTestCase):
+    command = profile_imports
+
+    @mock.patch("subprocess.run")
+    def test_simple(self, run):
+        run.return_value = subprocess.CompletedProcess([], 0, stderr=IMPORT_TIMES)
+
+        rv = self.invoke("--limit", "2", "sentry.tasks.store")
+        assert rv.exit_code == 0, rv.output
+        assert "import sentry.tasks.store" in run.call_args[0][0][-1]
+
+        lines = rv.output.splitlines()
+        assert lines[1].split() == ["5.3", "0.1", "sentry.runner"]
+        assert lines[2].split() == ["4.0", "4.0", "sentry.slow"]
+        assert "4 modules imported" in lines[-1]
+
+        rv = self.invoke("--sort", "self", "--limit", "1")
+        assert rv.output.splitlines()[1].split() == ["4.0", "4.0", "sentry.slow"]
+
+    @mock.patch("subprocess.run")
+    def test_failure(self, run):
+        run.return_value = subprocess.CompletedProcess([], 1, stderr="ImportError: nope")
+
+        rv = self.invoke()
+        assert rv.exit_code != 0
+        assert "Failed to start Sentry" in rv.output
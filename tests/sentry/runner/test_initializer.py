@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 
 from sentry.runner.importer import ConfigurationError
@@ -210,3 +213,58 @@ def test_require_secret_key(settings):
     assert "system.secret-key" not in settings.SENTRY_OPTIONS
     with pytest.raises(ConfigurationError):
         apply_legacy_settings(settings)
+
+
+BOOT_SCRIPT = """
+import os
+import sys
+
+os.environ["DJANGO_SETTINGS_MODULE"] = "sentry.conf.server"
+
+import django
+from django.conf import settings
+
+%s
+django.setup()
+
+from sentry.plugins.base import bindings
+from sentry.runner.initializer import register_plugins
+from sentry.utils import json
+
+register_plugins(settings)
+
+print(
+    json.dumps(
+        {
+            "modules": sorted(sys.modules),
+            "providers": sorted(bindings._bindings["integration-repository.provider"]),
+        }
+    )
+)
+"""
+
+
+def boot(lazy=None):
+    from sentry.utils import json
+
+    override = "" if lazy is None else f"settings.SENTRY_LAZY_PLUGINS = {lazy}"
+    output = subprocess.check_output([sys.executable, "-c", BOOT_SCRIPT % override])
+    return json.loads(output.splitlines()[-1])
+
+
+def test_plugins_boot_eagerly_by_default():
+    "Plugins and integrations are imported and set up when starting Sentry with default settings"
+    default = boot()
+
+    assert any(module.startswith("sentry_plugins.") for module in default["modules"])
+    assert "integrations:github" in default["providers"]
+
+
+def test_lazy_plugins_boot():
+    "Lazily registering plugins and integrations imports fewer modules when starting Sentry"
+    eager = boot(lazy=False)
+    lazy = boot(lazy=True)
+
+    assert any(module.startswith("sentry_plugins.") for module in eager["modules"])
+    assert not any(module.startswith("sentry_plugins.") for module in lazy["modules"])
+    assert set(lazy["modules"]) < set(eager["modules"])
@@ -0,0 +1,94 @@
+import itertools
+import random
+from datetime import datetime
+
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import Message, Partition, Topic
+
+from sentry.sentry_metrics.indexer.postgres import PGStringIndexer
+from sentry.sentry_metrics.multiprocess import process_messages
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+
+BATCH_SIZE = 100000
+
+# Number of distinct values per tag key
+TAG_CARDINALITY = {
+    "environment": 5,
+    "release": 200,
+    "session.status": 5,
+    "transaction": 1000,
+    "os.name": 10,
+}
+METRIC_NAMES = [f"metric.{i}" for i in range(20)]
+
+
+def generate_batch(size):
+    rand = random.Random(42)
+    timestamp = int(datetime(2021, 10, 1).timestamp())
+    messages = []
+    for offset in range(size):
+        tags = {
+            key: f"{key}-{rand.randrange(cardinality)}"
+            for key, cardinality in TAG_CARDINALITY.items()
+            if rand.random() < 0.8
+        }
+        payload = {
+            "name": rand.choice(METRIC_NAMES),
+            "tags": tags,
+            "timestamp": timestamp,
+            "type": "d",
+            "value": [rand.random() for _ in range(3)],
+            "org_id": rand.randrange(100),
+            "project_id": rand.randrange(1000),
+        }
+        messages.append(
+            Message(
+                Partition(Topic("topic"), 0),
+                offset,
+                KafkaPayload(None, json.dumps(payload).encode("utf-8"), []),
+                datetime.now(),
+            )
+        )
+    last = messages[-1]
+    return Message(last.partition, last.offset, messages, last.timestamp)
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_process_messages(benchmark, monkeypatch):
+    outer_message = generate_batch(BATCH_SIZE)
+
+    # Benchmark the steady state of a consumer process, where all strings are
+    # already in the local cache
+    indexer = PGStringIndexer(local_cache_size=100000)
+    strings = {*METRIC_NAMES, *TAG_CARDINALITY}
+    for key, cardinality in TAG_CARDINALITY.items():
+        strings.update(f"{key}-{i}" for i in range(cardinality))
+    indexer.bulk_record(list(strings))
+    monkeypatch.setattr("sentry.sentry_metrics.multiprocess.get_indexer", lambda: indexer)
+
+    new_messages = benchmark.pedantic(process_messages, args=(outer_message,), rounds=3)
+
+    assert len(new_messages) == BATCH_SIZE
+    benchmark.extra_info["messages_per_second"] = BATCH_SIZE / benchmark.stats.stats.mean
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("new_ratio", [0.01, 0.05, 0.1])
+def test_benchmark_bulk_record(benchmark, new_ratio):
+    batch_size = 1000
+    num_new = int(batch_size * new_ratio)
+    existing = [f"existing-{i}" for i in range(batch_size - num_new)]
+    counter = itertools.count()
+
+    indexer = PGStringIndexer(local_cache_size=0)
+    indexer.bulk_record(existing)
+
+    def setup():
+        new = [f"new-{next(counter)}" for _ in range(num_new)]
+        return (existing + new,), {}
+
+    benchmark.pedantic(indexer.bulk_record, setup=setup, rounds=20)
@@ -1,3 +1,6 @@
+import threading
+from unittest.mock import patch
+
 from sentry.sentry_metrics.indexer.models import MetricsKeyIndexer
 from sentry.sentry_metrics.indexer.postgres import PGStringIndexer
 from sentry.testutils.cases import TestCase
@@ -28,3 +31,85 @@ class PostgresIndexerTest(TestCase):
         # test invalid values
         assert PGStringIndexer().resolve("beep") is None
         assert PGStringIndexer().reverse_resolve(1234) is None
+
+    def test_local_cache(self):
+        indexer = PGStringIndexer(local_cache_size=2)
+        results = {"hello": indexer.record("hello")}
+        results.update(indexer.bulk_record(strings=["hey", "hi"]))
+
+        # Only the two most recently recorded strings are kept in memory
+        with patch.object(
+            MetricsKeyIndexer.objects, "get_many_from_cache", side_effect=AssertionError
+        ), patch.object(MetricsKeyIndexer.objects, "get_from_cache", side_effect=AssertionError):
+            assert indexer.bulk_record(strings=["hey", "hi"]) == {
+                "hey": results["hey"],
+                "hi": results["hi"],
+            }
+            assert indexer.resolve("hi") == results["hi"]
+            assert indexer.reverse_resolve(results["hey"]) == "hey"
+
+        assert indexer.resolve("hello") == results["hello"]
+        assert indexer.reverse_resolve(1234) is None
+
+    def test_local_cache_threads(self):
+        indexer = PGStringIndexer(local_cache_size=4)
+        errors = []
+
+        def run(offset):
+            try:
+                for i in range(2000):
+                    string = f"s{(offset + i) % 8}"
+                    indexer._cache_locally(string, (offset + i) % 8)
+                    indexer._get_id_locally(string)
+                    indexer._get_string_locally((offset + i) % 8)
+            except Exception as e:
+                errors.append(e)
+
+        # Threads that evict each other's entries don't interfere
+        threads = [threading.Thread(target=run, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+    def test_local_cache_disabled(self):
+        indexer = PGStringIndexer(local_cache_size=0)
+        indexer.bulk_record(strings=["hello"])
+
+        with patch.object(
+            MetricsKeyIndexer.objects, "get_from_cache", side_effect=MetricsKeyIndexer.DoesNotExist
+        ):
+            assert indexer.resolve("hello") is None
+
+    def test_reserved_ids(self):
+        indexer = PGStringIndexer(local_cache_size=0)
+        with patch.object(
+            MetricsKeyIndexer, "get_next_values", wraps=MetricsKeyIndexer.get_next_values
+        ) as get_next_values:
+            first = indexer.bulk_record(strings=["hello", "hey"])
+            second = indexer.bulk_record(strings=["hello", "hi"])
+
+        # A single range is reserved for both batches
+        assert get_next_values.call_count == 1
+        assert second["hello"] == first["hello"]
+        assert len({*first.values(), *second.values()}) == 3
+        assert indexer.reverse_resolve(second["hi"]) == "hi"
+
+    def test_bulk_record_conflict(self):
+        indexer = PGStringIndexer(local_cache_size=0)
+        original_get_many_from_cache = MetricsKeyIndexer.objects.get_many_from_cache
+
+        def get_many_from_cache(strings, key):
+            rv = original_get_many_from_cache(strings, key=key)
+            # Another consumer creates "hey" in the meantime
+            MetricsKeyIndexer.objects.create(string="hey")
+            return rv
+
+        with patch.object(
+            MetricsKeyIndexer.objects, "get_many_from_cache", side_effect=get_many_from_cache
+        ):
+            results = indexer.bulk_record(strings=["hello", "hey"])
+
+        rows = MetricsKeyIndexer.objects.filter(string__in=["hello", "hey"])
+        assert results == dict(rows.values_list("string", "id"))
@@ -0,0 +1,66 @@
+import random
+import time
+
+import pytest
+
+from sentry.similarity.backends.memory import InMemoryMinHashIndexBackend
+from sentry.similarity.backends.redis import RedisScriptMinHashIndexBackend
+from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import redis
+
+signature_builder = MinHashSignatureBuilder(16, 0xFFFF)
+
+
+def make_redis_index():
+    return RedisScriptMinHashIndexBackend(
+        redis.clusters.get("default").get_local_client(0),
+        "sim",
+        signature_builder,
+        8,
+        60 * 60 * 24 * 30,
+        3,
+        5000,
+    )
+
+
+def make_memory_index():
+    return InMemoryMinHashIndexBackend(signature_builder, 8, 60 * 60 * 24 * 30, 3, 5000)
+
+
+def generate_items(rand, count):
+    words = [f"word{i}" for i in range(200)]
+    return [
+        [
+            ("a", {rand.choice(words) for _ in range(20)}),
+            ("b", {rand.choice(words) for _ in range(5)}),
+        ]
+        for _ in range(count)
+    ]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("make_index", [make_redis_index, make_memory_index])
+def test_benchmark_compare(make_index, benchmark):
+    index = make_index()
+    rand = random.Random(42)
+    timestamp = int(time.time())
+    for key, items in enumerate(generate_items(rand, 1000)):
+        index.record("benchmark", str(key), items, timestamp=timestamp)
+
+    def run():
+        for key in range(0, 1000, 50):
+            index.compare(
+                "benchmark", str(key), [("a", 0), ("b", 0)], limit=10, timestamp=timestamp
+            )
+
+    benchmark(run)
+    index.flush("benchmark", ["a", "b"])
+
+
+@requires_pytest_benchmark
+def test_benchmark_record_many(benchmark):
+    rand = random.Random(42)
+    entries = [(str(key), items) for key, items in enumerate(generate_items(rand, 1000))]
+
+    benchmark(lambda: make_memory_index().record_many("benchmark", entries))
@@ -0,0 +1,191 @@
+import random
+import time
+
+import msgpack
+from exam import fixture
+
+from sentry.similarity.backends.memory import InMemoryMinHashIndexBackend
+from sentry.similarity.backends.redis import RedisScriptMinHashIndexBackend
+from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.testutils import TestCase
+from sentry.utils import redis
+
+from .base import MinHashIndexBackendTestMixin
+
+signature_builder = MinHashSignatureBuilder(32, 0xFFFF)
+
+
+def make_index():
+    return InMemoryMinHashIndexBackend(signature_builder, 16, 60 * 60, 12, 10)
+
+
+class InMemoryMinHashIndexBackendTestCase(MinHashIndexBackendTestMixin, TestCase):
+    @fixture
+    def index(self):
+        return make_index()
+
+    def test_export_import(self):
+        self.index.record("example", "1", [("index", "hello world")])
+
+        timestamp = int(time.time())
+        result = self.index.export("example", [("index", 1)], timestamp=timestamp)
+        assert len(result) == 1
+
+        # Copy the data from key 1 to key 2.
+        self.index.import_("example", [("index", 2, result[0])], timestamp=timestamp)
+
+        r1 = msgpack.unpackb(self.index.export("example", [("index", 1)], timestamp=timestamp)[0])
+        r2 = msgpack.unpackb(self.index.export("example", [("index", 2)], timestamp=timestamp)[0])
+        assert r1 == r2
+
+        assert self.index.export("example", [("index", 3)], timestamp=timestamp) == [
+            msgpack.packb({})
+        ]
+
+    def test_expiration(self):
+        timestamp = int(time.time())
+        self.index.record("example", "1", [("index", "hello world")], timestamp=timestamp)
+
+        results = self.index.classify("example", [("index", 0, "hello world")], timestamp=timestamp)
+        assert results == [("1", [1.0])]
+
+        expired = timestamp + 60 * 60 * 13
+        results = self.index.classify("example", [("index", 0, "hello world")], timestamp=expired)
+        assert results == []
+        assert self.index.export("example", [("index", 1)], timestamp=expired) == [
+            msgpack.packb({})
+        ]
+
+    def test_expiration_sweep(self):
+        timestamp = int(time.time())
+        self.index.record("example", "1", [("index", "hello world")], timestamp=timestamp)
+        self.index.record("example", "2", [("index", "jello world")], timestamp=timestamp)
+        assert len(self.index._frequencies[("example", "index")]) == 2
+
+        # Expired data that is never accessed again is discarded by recording
+        expired = timestamp + 60 * 60 * 13
+        self.index.record("example", "3", [("index", "pizza")], timestamp=expired)
+        assert list(self.index._frequencies[("example", "index")]) == ["3"]
+        assert all(
+            i >= expired // (60 * 60) - 12
+            for intervals in self.index._members.values()
+            for i in intervals
+        )
+
+        self.index.expire(timestamp=expired + 60 * 60 * 13)
+        assert not self.index._frequencies
+        assert not self.index._members
+
+    def test_record_many(self):
+        self.index.record_many(
+            "example",
+            [
+                ("1", [("index", "hello world")]),
+                ("2", [("index", "hello world"), ("index", "jello world")]),
+                ("3", [("index", "")]),
+            ],
+        )
+
+        results = self.index.classify("example", [("index", 0, "hello world")])
+        assert [key for key, _ in results] == ["1", "2"]
+        assert results[0] == ("1", [1.0])
+        assert 0 < results[1][1][0] < 1
+
+    def test_snapshot(self):
+        self.index.record("example", "1", [("index:a", "hello world"), ("index:b", "pizza")])
+        self.index.record("example", "2", [("index:a", "jello world")])
+
+        restored = make_index()
+        restored.restore(self.index.snapshot())
+
+        for key in ("1", "2"):
+            assert restored.compare("example", key, [("index:a", 0), ("index:b", 0)]) == (
+                self.index.compare("example", key, [("index:a", 0), ("index:b", 0)])
+            )
+        assert restored.snapshot() == self.index.snapshot()
+
+
+class InMemoryRedisParityTestCase(TestCase):
+    """
+    Checks that the in-memory backend returns the same results as the Redis
+    script backend, and that they can exchange exported data.
+    """
+
+    def setUp(self):
+        self.redis_index = RedisScriptMinHashIndexBackend(
+            redis.clusters.get("default").get_local_client(0),
+            "sim",
+            signature_builder,
+            16,
+            60 * 60,
+            12,
+            1000,
+        )
+        self.memory_index = InMemoryMinHashIndexBackend(signature_builder, 16, 60 * 60, 12, 1000)
+        self.timestamp = int(time.time())
+
+        rand = random.Random(42)
+        words = ["hello", "world", "foo", "bar", "baz", "pizza", "error", "value"]
+
+        def features():
+            return {rand.choice(words) + rand.choice(words) for _ in range(rand.randint(1, 8))}
+
+        self.keys = [str(i) for i in range(20)]
+        for key in self.keys:
+            items = [("index:a", features()), ("index:b", features())]
+            for index in (self.redis_index, self.memory_index):
+                index.record("example", key, items, timestamp=self.timestamp)
+        self.queries = [[("index:a", 0, features()), ("index:b", 0, features())] for _ in range(5)]
+
+    def assert_same_results(self, redis_results, memory_results):
+        assert len(redis_results) == len(memory_results)
+        for (redis_key, redis_scores), (memory_key, memory_scores) in zip(
+            redis_results, memory_results
+        ):
+            assert redis_key == memory_key
+            for redis_score, memory_score in zip(redis_scores, memory_scores):
+                if redis_score is None:
+                    assert memory_score is None
+                else:
+                    assert abs(redis_score - memory_score) < 1e-6
+
+    def test_compare(self):
+        for key in self.keys:
+            items = [("index:a", 0), ("index:b", 0)]
+            self.assert_same_results(
+                self.redis_index.compare("example", key, items, timestamp=self.timestamp),
+                self.memory_index.compare("example", key, items, timestamp=self.timestamp),
+            )
+
+    def test_classify(self):
+        for items in self.queries:
+            self.assert_same_results(
+                self.redis_index.classify("example", items, timestamp=self.timestamp),
+                self.memory_index.classify("example", items, timestamp=self.timestamp),
+            )
+
+    def test_merge_and_delete(self):
+        for index in (self.redis_index, self.memory_index):
+            index.merge("example", "0", [("index:a", "1"), ("index:b", "2")], self.timestamp)
+            index.delete("example", [("index:a", "3")], self.timestamp)
+
+        self.test_compare()
+        self.test_classify()
+
+    def test_import_from_redis(self):
+        memory_index = InMemoryMinHashIndexBackend(signature_builder, 16, 60 * 60, 12, 1000)
+        for idx in ("index:a", "index:b"):
+            exported = self.redis_index.export(
+                "example", [(idx, key) for key in self.keys], timestamp=self.timestamp
+            )
+            memory_index.import_(
+                "example",
+                [(idx, key, data) for key, data in zip(self.keys, exported)],
+                timestamp=self.timestamp,
+            )
+
+        for items in self.queries:
+            self.assert_same_results(
+                self.redis_index.classify("example", items, timestamp=self.timestamp),
+                memory_index.classify("example", items, timestamp=self.timestamp),
+            )
@@ -4,7 +4,7 @@ import msgpack
 from exam import fixture
 
 from sentry.similarity.backends.redis import RedisScriptMinHashIndexBackend
-from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.similarity.signatures import MinHashSignatureBuilder, SlicedMinHashSignatureBuilder
 from sentry.testutils import TestCase
 from sentry.utils import redis
 
@@ -46,3 +46,17 @@ class RedisScriptMinHashIndexBackendTestCase(MinHashIndexBackendTestMixin, TestC
 
         result = self.index.export("example", [("index", 2)], timestamp=timestamp)
         assert len(result) == 1
+
+
+class RedisScriptSlicedMinHashIndexBackendTestCase(MinHashIndexBackendTestMixin, TestCase):
+    @fixture
+    def index(self):
+        return RedisScriptMinHashIndexBackend(
+            redis.clusters.get("default").get_local_client(0),
+            "sim",
+            SlicedMinHashSignatureBuilder(32, 0xFFFF),
+            16,
+            60 * 60,
+            12,
+            10,
+        )
@@ -0,0 +1,34 @@
+import pytest
+
+from sentry.similarity.signatures import MinHashSignatureBuilder, SlicedMinHashSignatureBuilder
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.iterators import shingle
+
+TEXT = (
+    "ValueError: invalid literal for int() with base 10: 'abc' while handling the request to "
+    "/api/0/organizations/sentry/issues/ with the query is:unresolved assigned:me"
+)
+FEATURE_SETS = [["".join(s) for s in shingle(5, f"{TEXT} {i}")] for i in range(50)]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "signature_builder_class", [MinHashSignatureBuilder, SlicedMinHashSignatureBuilder]
+)
+def test_benchmark_signatures(signature_builder_class, benchmark):
+    get_signature = signature_builder_class(16, 0xFFFF)
+
+    def run():
+        for features in FEATURE_SETS:
+            get_signature(features)
+
+    benchmark(run)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "signature_builder_class", [MinHashSignatureBuilder, SlicedMinHashSignatureBuilder]
+)
+def test_benchmark_signatures_build_many(signature_builder_class, benchmark):
+    get_signature = signature_builder_class(16, 0xFFFF)
+    benchmark(get_signature.build_many, FEATURE_SETS)
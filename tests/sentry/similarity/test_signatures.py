@@ -1,14 +1,16 @@
 from collections import Counter
 from unittest import TestCase
 
-from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.similarity.signatures import MinHashSignatureBuilder, SlicedMinHashSignatureBuilder
 
 
-class MinHashSignatureBuilderTestCase(TestCase):
+class MinHashSignatureBuilderTestMixin:
+    signature_builder_class = None
+
     def test_signatures(self):
         n = 32
         r = 0xFFFF
-        get_signature = MinHashSignatureBuilder(n, r)
+        get_signature = self.signature_builder_class(n, r)
         assert get_signature({"foo", "bar", "baz"}) == get_signature({"foo", "bar", "baz"})
 
         assert len(get_signature("hello world")) == n
@@ -28,3 +30,36 @@ class MinHashSignatureBuilderTestCase(TestCase):
         self.assertAlmostEqual(
             similarity, estimation, delta=0.1  # totally made up constant, seems reasonable
         )
+
+    def test_build_many(self):
+        get_signature = self.signature_builder_class(32, 0xFFFF)
+        feature_sets = [["foo", "bar"], ["bar", "baz"], ["foo", "bar"]]
+
+        signatures = get_signature.build_many(feature_sets)
+        assert signatures == [list(get_signature(features)) for features in feature_sets]
+        assert signatures[0] == signatures[2]
+
+
+class MinHashSignatureBuilderTestCase(MinHashSignatureBuilderTestMixin, TestCase):
+    signature_builder_class = MinHashSignatureBuilder
+
+
+class SlicedMinHashSignatureBuilderTestCase(MinHashSignatureBuilderTestMixin, TestCase):
+    signature_builder_class = SlicedMinHashSignatureBuilder
+
+    def test_seed(self):
+        features = "the quick brown fox jumps over the lazy dog".split()
+        assert SlicedMinHashSignatureBuilder(32, 0xFFFF)(features) == (
+            SlicedMinHashSignatureBuilder(32, 0xFFFF)(features)
+        )
+        assert SlicedMinHashSignatureBuilder(32, 0xFFFF, seed=1)(features) != (
+            SlicedMinHashSignatureBuilder(32, 0xFFFF)(features)
+        )
+
+    def test_wide_rows(self):
+        get_signature = SlicedMinHashSignatureBuilder(32, 1 << 20)
+        for value in get_signature("hello world"):
+            assert 0 <= value < 1 << 20
+
+        with self.assertRaises(ValueError):
+            SlicedMinHashSignatureBuilder(32, (1 << 32) + 1)
@@ -0,0 +1,66 @@
+import random
+
+from sentry.spans.grouping.strategy.base import SpanGroupingStrategy
+from sentry.spans.grouping.strategy.config import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
+
+
+def generate_transaction(num_spans):
+    rand = random.Random(42)
+    spans = []
+    for i in range(num_spans):
+        op, description = rand.choice(
+            [
+                ("db", f"SELECT * FROM table_{i % 50} WHERE id IN (%s, %s, %s)"),
+                ("db", f"SELECT * FROM table_{i % 50} WHERE id = %s"),
+                ("http.client", f"GET https://sentry.io/api/0/projects/{i % 20}/?cursor={i}"),
+                ("redis", f"GET key:{i}"),
+                ("django.view", f"view_{i % 10}"),
+            ]
+        )
+        spans.append(
+            {
+                "trace_id": "a" * 32,
+                "parent_span_id": "a" * 16,
+                "span_id": f"{i:016x}",
+                "start_timestamp": 0,
+                "timestamp": 1,
+                "same_process_as_parent": True,
+                "op": op,
+                "description": description,
+                "fingerprint": None,
+                "tags": None,
+                "data": None,
+            }
+        )
+
+    return {
+        "transaction": "transaction name",
+        "contexts": {"trace": {"span_id": "a" * 16}},
+        "spans": spans,
+    }
+
+
+@requires_pytest_benchmark
+def test_benchmark_span_grouping_cold(benchmark):
+    event = generate_transaction(5000)
+    config = CONFIGURATIONS["default:2021-08-25"].strategy
+
+    def setup():
+        # A new strategy starts out with an empty cache
+        return (SpanGroupingStrategy(config.name, config.strategies), event), {}
+
+    benchmark.pedantic(run_strategy, setup=setup, rounds=20)
+
+
+@requires_pytest_benchmark
+def test_benchmark_span_grouping_warm(benchmark):
+    event = generate_transaction(5000)
+    strategy = CONFIGURATIONS["default:2021-08-25"].strategy
+    strategy.execute(event)
+
+    benchmark(run_strategy, strategy, event)
+
+
+def run_strategy(strategy, event):
+    strategy.execute(event)
@@ -1,10 +1,12 @@
 from typing import Any, List, Mapping, Optional
+from unittest import mock
 
 import pytest
 
 from sentry.spans.grouping.strategy.base import (
     Span,
     SpanGroupingStrategy,
+    get_span_op,
     normalized_db_span_in_condition_strategy,
     raw_description_strategy,
     remove_http_client_query_string_strategy,
@@ -393,3 +395,59 @@ def test_default_2021_08_25_strategy(spans: List[Span], expected: Mapping[str, L
         key: hash_values(values)
         for key, values in {**expected, "a" * 16: ["transaction name"]}.items()
     }
+
+
+def test_span_op_strategy_dispatch() -> None:
+    assert get_span_op(normalized_db_span_in_condition_strategy) == "db"
+    assert get_span_op(remove_http_client_query_string_strategy) == "http.client"
+    assert get_span_op(raw_description_strategy) is None
+
+    db_strategy = mock.Mock(return_value=None, span_op="db")
+    any_op_strategy = mock.Mock(return_value=None, span_op=None)
+    strategy = SpanGroupingStrategy("test-strategy", [db_strategy, any_op_strategy])
+
+    span = SpanBuilder().with_op("redis").with_description("INCRBY 'key' 1").build()
+    assert strategy.handle_default_fingerprint(span) == ["INCRBY 'key' 1"]
+    # strategies restricted to an op are never tried on spans with other ops
+    assert not db_strategy.called
+    assert any_op_strategy.call_count == 1
+
+    span = SpanBuilder().with_op("db").with_description("SELECT 1").build()
+    assert strategy.handle_default_fingerprint(span) == ["SELECT 1"]
+    assert db_strategy.call_count == 1
+    assert any_op_strategy.call_count == 2
+
+
+def test_span_groups_parity() -> None:
+    spans = [
+        SpanBuilder()
+        .with_span_id(f"{i:016x}")
+        .with_op(op)
+        .with_description(description)
+        .with_fingerprint(fingerprint)
+        .build()
+        for i, (op, description, fingerprint) in enumerate(
+            [
+                ("db", "SELECT count() FROM table WHERE id IN (%s, %s)", None),
+                ("db", "SELECT count() FROM table WHERE id IN (%s)", None),
+                ("db", "SELECT count() FROM table WHERE id IN (%s)", ["{{ default }}", "a"]),
+                ("db", None, None),
+                ("http.client", "GET https://sentry.io/api/0/?all_projects=0", None),
+                ("http.client", "GET https://sentry.io/api/0/?all_projects=1", []),
+                ("http.client", "invalid", None),
+                ("redis", "INCRBY 'key' 1", None),
+                ("redis", "INCRBY 'key' 1", ["a"]),
+                ("default", "INCRBY 'key' 1", None),
+                ("default", "INCRBY 'key' 1", None),
+            ]
+        )
+    ]
+    strategy = CONFIGURATIONS["default:2021-08-25"].strategy
+    expected = [strategy.get_span_group(span) for span in spans]
+
+    assert strategy.get_span_groups(spans) == expected
+
+    # span groups are remembered across events
+    with mock.patch.object(SpanGroupingStrategy, "get_span_group") as get_span_group:
+        assert strategy.get_span_groups(spans) == expected
+        assert not get_span_group.called
@@ -0,0 +1,95 @@
+from collections import deque
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from sentry.eventstream.kafka.postprocessworker import (
+    _BATCH_SIZE_OPTION,
+    PostProcessForwarderWorker,
+)
+from sentry.tasks.post_process import post_process_group, post_process_group_batch
+from sentry.testutils.helpers.eventprocessing import write_event_to_cache
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+
+EVENT_COUNT = 50
+
+
+class LocalBroker:
+    """
+    Stand-in for the broker and the workers, that queues the tasks which are
+    dispatched and runs them in order when drained.
+    """
+
+    def __init__(self):
+        self.queue = deque()
+
+    def get_delay(self, task):
+        def delay(**kwargs):
+            self.queue.append((task, kwargs))
+
+        return delay
+
+    def drain(self):
+        while self.queue:
+            task, kwargs = self.queue.popleft()
+            task(**kwargs)
+
+
+def make_message(event):
+    payload = [
+        2,
+        "insert",
+        {
+            "group_id": event.group_id,
+            "event_id": event.event_id,
+            "organization_id": event.project.organization_id,
+            "project_id": event.project_id,
+            "primary_hash": None,
+        },
+        {
+            "is_new": False,
+            "is_regression": False,
+            "is_new_group_environment": False,
+            "skip_consume": False,
+        },
+    ]
+    message = Mock()
+    message.value = MagicMock(return_value=json.dumps(payload))
+    message.partition = MagicMock(return_value=0)
+    return message
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("batch_size", [1, 10])
+def test_benchmark_post_process_throughput(factories, default_project, batch_size, benchmark):
+    events = [
+        factories.store_event(
+            data={"message": "testing", "fingerprint": [f"group-{i % 5}"]},
+            project_id=default_project.id,
+        )
+        for i in range(EVENT_COUNT)
+    ]
+    messages = [make_message(event) for event in events]
+    broker = LocalBroker()
+
+    def write_events():
+        for event in events:
+            write_event_to_cache(event)
+
+    def forward_and_process():
+        forwarder.flush_batch([forwarder.process_message(message) for message in messages])
+        broker.drain()
+
+    with override_options({_BATCH_SIZE_OPTION: batch_size}), patch.object(
+        post_process_group, "delay", broker.get_delay(post_process_group)
+    ), patch.object(post_process_group_batch, "delay", broker.get_delay(post_process_group_batch)):
+        forwarder = PostProcessForwarderWorker(concurrency=1)
+        try:
+            benchmark.pedantic(forward_and_process, setup=write_events, rounds=5)
+        finally:
+            forwarder.shutdown()
+
+    benchmark.extra_info["events_per_second"] = EVENT_COUNT / benchmark.stats.stats.mean
@@ -2,7 +2,9 @@ from datetime import timedelta
 from unittest import mock
 from unittest.mock import ANY, Mock, patch
 
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from sentry import buffer
@@ -24,7 +26,11 @@ from sentry.models import (
 from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema
 from sentry.rules import init_registry
 from sentry.tasks.merge import merge_groups
-from sentry.tasks.post_process import post_process_group
+from sentry.tasks.post_process import (
+    handle_group_owners,
+    post_process_group,
+    post_process_group_batch,
+)
 from sentry.testutils import TestCase
 from sentry.testutils.helpers import with_feature
 from sentry.testutils.helpers.datetime import before_now, iso_format
@@ -147,7 +153,9 @@ class PostProcessGroupTest(TestCase):
             cache_key=cache_key,
         )
 
-        mock_processor.assert_called_once_with(EventMatcher(event), True, False, True, False)
+        mock_processor.assert_called_once_with(
+            EventMatcher(event), True, False, True, False, rules=ANY
+        )
         mock_processor.return_value.apply.assert_called_once_with()
 
         mock_callback.assert_called_once_with(EventMatcher(event), mock_futures)
@@ -170,7 +178,9 @@ class PostProcessGroupTest(TestCase):
             group_id=event.group_id,
         )
 
-        mock_processor.assert_called_once_with(EventMatcher(event), True, False, True, False)
+        mock_processor.assert_called_once_with(
+            EventMatcher(event), True, False, True, False, rules=ANY
+        )
         mock_processor.return_value.apply.assert_called_once_with()
 
         mock_callback.assert_called_once_with(EventMatcher(event), mock_futures)
@@ -262,7 +272,7 @@ class PostProcessGroupTest(TestCase):
         )
         # Ensure that rule processing sees the merged group.
         mock_processor.assert_called_with(
-            EventMatcher(event, group=group2), True, False, True, False
+            EventMatcher(event, group=group2), True, False, True, False, rules=ANY
         )
 
     @patch("sentry.signals.issue_unignored.send_robust")
@@ -286,7 +296,7 @@ class PostProcessGroupTest(TestCase):
         GroupInbox.objects.filter(group=group).delete()  # Delete so it creates the UNIGNORED entry.
         Activity.objects.filter(group=group).delete()
 
-        mock_processor.assert_called_with(EventMatcher(event), True, False, True, False)
+        mock_processor.assert_called_with(EventMatcher(event), True, False, True, False, rules=ANY)
 
         cache_key = write_event_to_cache(event)
         # Check for has_reappeared=True if is_new=False
@@ -298,7 +308,7 @@ class PostProcessGroupTest(TestCase):
             group_id=event.group_id,
         )
 
-        mock_processor.assert_called_with(EventMatcher(event), False, False, True, True)
+        mock_processor.assert_called_with(EventMatcher(event), False, False, True, True, rules=ANY)
 
         assert not GroupSnooze.objects.filter(id=snooze.id).exists()
 
@@ -366,7 +376,7 @@ class PostProcessGroupTest(TestCase):
             group_id=event.group_id,
         )
 
-        mock_processor.assert_called_with(EventMatcher(event), True, False, True, False)
+        mock_processor.assert_called_with(EventMatcher(event), True, False, True, False, rules=ANY)
 
         assert GroupSnooze.objects.filter(id=snooze.id).exists()
 
@@ -612,7 +622,7 @@ class PostProcessGroupTest(TestCase):
         #     group=group
         # ).delete()  # Delete so it creates the .REGRESSION entry.
 
-        mock_processor.assert_called_with(EventMatcher(event), True, True, False, False)
+        mock_processor.assert_called_with(EventMatcher(event), True, True, False, False, rules=ANY)
 
         cache_key = write_event_to_cache(event)
         post_process_group(
@@ -624,7 +634,7 @@ class PostProcessGroupTest(TestCase):
             group_id=event.group_id,
         )
 
-        mock_processor.assert_called_with(EventMatcher(event), False, True, False, False)
+        mock_processor.assert_called_with(EventMatcher(event), False, True, False, False, rules=ANY)
 
         group = Group.objects.get(id=group.id)
         assert group.status == GroupStatus.UNRESOLVED
@@ -645,6 +655,180 @@ class PostProcessGroupTest(TestCase):
                 group_id=event.group_id,
             )
 
+    @override_settings(SENTRY_OWNER_EVALUATION_DEBOUNCE=60)
+    @patch("sentry.signals.event_processed.send_robust")
+    def test_bounded_queries_and_cache_round_trips(self, mock_signal):
+        self.create_commit(repo=self.create_repo())
+        self.create_service_hook(
+            project=self.project, organization=self.project.organization, actor=self.user, events=[]
+        )
+        event, event_2 = (
+            self.store_event(
+                data={"message": "testing", "fingerprint": ["group-1"]}, project_id=self.project.id
+            )
+            for _ in range(2)
+        )
+
+        with self.feature("projects:servicehooks"):
+            # Fills the caches that the stages of post processing read
+            post_process_group(
+                is_new=False,
+                is_regression=False,
+                is_new_group_environment=False,
+                cache_key=write_event_to_cache(event),
+                group_id=event.group_id,
+            )
+
+            cache_key = write_event_to_cache(event_2)
+            with patch("sentry.tasks.post_process.cache", wraps=cache) as mock_cache:
+                with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+                    post_process_group(
+                        is_new=False,
+                        is_regression=False,
+                        is_new_group_environment=False,
+                        cache_key=cache_key,
+                        group_id=event_2.group_id,
+                    )
+
+        # Everything that the stages look up in the cache is read at once
+        assert [name for name, args, kwargs in mock_cache.method_calls] == ["get_many"]
+        assert len(queries.captured_queries) <= 5
+
+
+class PostProcessGroupBatchTest(TestCase):
+    def get_batch(self, events):
+        return [
+            {
+                "is_new": True,
+                "is_regression": False,
+                "is_new_group_environment": True,
+                "cache_key": write_event_to_cache(event),
+                "group_id": event.group_id,
+            }
+            for event in events
+        ]
+
+    @patch("sentry.signals.event_processed.send_robust")
+    def test_batch(self, mock_signal):
+        event, event_2, deleted_event = (
+            self.store_event(
+                data={"message": "testing", "fingerprint": [f"group-{i}"]},
+                project_id=self.project.id,
+            )
+            for i in range(3)
+        )
+        batch = self.get_batch([event, event_2, deleted_event])
+        deleted_event.group.delete()
+        missing = dict(batch[0], cache_key="total-rubbish")
+
+        post_process_group_batch(events=batch + [missing])
+
+        # The event whose group was deleted doesn't affect the others
+        assert [call[1]["event"].event_id for call in mock_signal.call_args_list] == [
+            event.event_id,
+            event_2.event_id,
+        ]
+        for group in (event.group, event_2.group):
+            assert GroupInbox.objects.filter(
+                group=group, reason=GroupInboxReason.NEW.value
+            ).exists()
+        for event_kwargs in batch:
+            assert event_processing_store.get(event_kwargs["cache_key"]) is None
+
+    @patch("sentry.signals.event_processed.send_robust")
+    def test_batch_shares_context(self, mock_signal):
+        events = [
+            self.store_event(
+                data={"message": "testing", "fingerprint": [f"group-{i}"]},
+                project_id=self.project.id,
+            )
+            for i in range(3)
+        ]
+        batch = self.get_batch(events)
+
+        with patch("sentry.tasks.post_process.cache", wraps=cache) as mock_cache:
+            post_process_group_batch(events=batch)
+
+        assert mock_signal.call_count == 3
+        # What the stages look up in the cache is read at once for all events
+        assert [name for name, args, kwargs in mock_cache.method_calls].count("get_many") == 1
+
+    @patch("sentry.signals.event_processed.send_robust")
+    def test_batch_shares_context_with_deleted_group(self, mock_signal):
+        events = [
+            self.store_event(
+                data={"message": "testing", "fingerprint": [f"group-{i}"]},
+                project_id=self.project.id,
+            )
+            for i in range(3)
+        ]
+        batch = self.get_batch(events)
+        events[1].group.delete()
+
+        with patch("sentry.tasks.post_process.cache", wraps=cache) as mock_cache:
+            post_process_group_batch(events=batch)
+
+        assert mock_signal.call_count == 2
+        assert [name for name, args, kwargs in mock_cache.method_calls].count("get_many") == 1
+        assert event_processing_store.get(batch[1]["cache_key"]) is None
+
+    @patch("sentry.signals.event_processed.send_robust")
+    @patch("sentry.tasks.post_process.logger")
+    @patch("sentry.tasks.post_process.fetch_buffered_group_stats", side_effect=Exception("boom"))
+    def test_batch_fetch_failure(self, mock_fetch, mock_logger, mock_signal):
+        events = [
+            self.store_event(
+                data={"message": "testing", "fingerprint": [f"group-{i}"]},
+                project_id=self.project.id,
+            )
+            for i in range(2)
+        ]
+        batch = self.get_batch(events)
+
+        post_process_group_batch(events=batch)
+
+        # Every event fetches its context again, and fails visibly
+        assert not mock_signal.called
+        assert [call[0][0] for call in mock_logger.exception.call_args_list] == [
+            "Failed to fetch post process contexts of batch",
+            "post_process.batch.failed",
+            "post_process.batch.failed",
+        ]
+
+    def test_deleted_group(self):
+        event = self.store_event(data={"message": "testing"}, project_id=self.project.id)
+        cache_key = write_event_to_cache(event)
+        group_id = event.group_id
+        event.group.delete()
+
+        with self.assertRaises(Group.DoesNotExist):
+            post_process_group(
+                is_new=True,
+                is_regression=False,
+                is_new_group_environment=True,
+                cache_key=cache_key,
+                group_id=group_id,
+            )
+
+    def test_batch_deletes_cache_per_event(self):
+        events = [
+            self.store_event(
+                data={"message": "testing", "fingerprint": [f"group-{i}"]},
+                project_id=self.project.id,
+            )
+            for i in range(2)
+        ]
+        batch = self.get_batch(events)
+        cached = []
+
+        def post_process_event(event, **kwargs):
+            cached.append([bool(event_processing_store.get(k["cache_key"])) for k in batch])
+
+        with patch("sentry.tasks.post_process._post_process_event", side_effect=post_process_event):
+            post_process_group_batch(events=batch)
+
+        assert cached == [[False, True], [False, False]]
+
 
 class PostProcessGroupAssignmentTest(TestCase):
     def make_ownership(self, extra_rules=None):
@@ -951,6 +1135,60 @@ class PostProcessGroupAssignmentTest(TestCase):
         assignee = event.group.assignee_set.first()
         assert assignee.user == user_3
 
+    @override_settings(SENTRY_OWNER_EVALUATION_DEBOUNCE=60)
+    def test_owner_evaluation_debounce(self):
+        self.make_ownership()
+        event = self.store_event(
+            data={
+                "message": "oh no",
+                "platform": "python",
+                "stacktrace": {"frames": [{"filename": "lib/example.py"}]},
+            },
+            project_id=self.project.id,
+        )
+
+        def run_post_process():
+            post_process_group(
+                is_new=False,
+                is_regression=False,
+                is_new_group_environment=False,
+                cache_key=write_event_to_cache(event),
+                group_id=event.group_id,
+            )
+
+        with patch(
+            "sentry.models.ProjectOwnership.get_autoassign_owners",
+            wraps=ProjectOwnership.get_autoassign_owners,
+        ) as get_autoassign_owners:
+            # No rule matches, the owners of the group are only evaluated once
+            for _ in range(3):
+                run_post_process()
+            assert get_autoassign_owners.call_count == 1
+            assert event.group.assignee_set.first() is None
+
+            # Owners are evaluated again once the ownership rules change
+            self.prj_ownership.schema = dump_schema(
+                [Rule(Matcher("path", "lib/*"), [Owner("user", self.user.email)])]
+            )
+            self.prj_ownership.save()
+            run_post_process()
+            assert get_autoassign_owners.call_count == 2
+
+        assert event.group.assignee_set.first().user == self.user
+
+    def test_handle_group_owners_unchanged(self):
+        owners = [self.user, self.team]
+        assert handle_group_owners(self.project, self.group, owners)
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            assert handle_group_owners(self.project, self.group, owners)
+        # The current owners are read, and nothing is written
+        assert [q["sql"].split()[0] for q in queries.captured_queries] == ["SELECT"]
+
+        assert handle_group_owners(self.project, self.group, [self.user])
+        owners = GroupOwner.objects.filter(group=self.group)
+        assert [(o.user_id, o.team_id) for o in owners] == [(self.user.id, None)]
+
     def test_ensure_when_assignees_and_owners_are_cached_does_not_cause_unbound_errors(self):
         self.make_ownership()
         event = self.store_event(
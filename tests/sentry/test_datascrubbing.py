@@ -1,8 +1,10 @@
 import copy
+from unittest import mock
 
 import pytest
 
-from sentry.datascrubbing import scrub_data
+from sentry.datascrubbing import get_compiled_pii_configs, get_pii_configs_epoch, scrub_data
+from sentry.testutils.skips import requires_pytest_benchmark
 
 
 def merge_pii_configs(prefixes_and_configs):
@@ -80,6 +82,105 @@ def test_scrub_data(field, default_project):
     )
 
 
+@pytest.mark.django_db
+def test_compiled_pii_configs_cache(default_project):
+    project = default_project
+    project.update_option("sentry:sensitive_fields", ["a"])
+
+    epoch = get_pii_configs_epoch(project)
+    assert get_pii_configs_epoch(project) == epoch
+
+    configs = get_compiled_pii_configs(project)
+    with mock.patch("sentry.datascrubbing.get_all_pii_configs") as get_all_pii_configs:
+        assert get_compiled_pii_configs(project) is configs
+        assert not get_all_pii_configs.called
+
+    event = {"extra": {"a": "pls remove", "b": "keep"}}
+    assert scrub_data(project, copy.deepcopy(event))["extra"] == {"a": "[Filtered]", "b": "keep"}
+
+    # Changing an option of the project or its organization invalidates the cached configs
+    project.update_option("sentry:sensitive_fields", ["b"])
+    assert get_pii_configs_epoch(project) != epoch
+    new_event = scrub_data(project, copy.deepcopy(event))
+    assert new_event["extra"] == {"a": "pls remove", "b": "[Filtered]"}
+
+    project.organization.update_option("sentry:sensitive_fields", ["a"])
+    new_event = scrub_data(project, copy.deepcopy(event))
+    assert new_event["extra"] == {"a": "[Filtered]", "b": "[Filtered]"}
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_scrub_data(default_project, benchmark):
+    project = default_project
+    organization = project.organization
+
+    organization.update_option(
+        "sentry:relay_pii_config",
+        """
+    {
+        "rules": {
+            "remove_ips_alias": {"type": "alias", "rule": "@ip", "redaction": {"method": "remove"}},
+            "remove_ips_and_macs": {
+                "type": "multiple",
+                "rules": ["remove_ips_alias", "@mac"],
+                "redaction": {"method": "remove"}
+            }
+        },
+        "applications": {
+            "$string": ["remove_ips_and_macs"],
+            "debug_meta.images.*.code_file": ["@userpath:replace"],
+            "debug_meta.images.*.debug_file": ["@userpath:replace"]
+        }
+    }
+    """,
+    )
+    organization.update_option("sentry:sensitive_fields", ["session", "token"])
+    organization.update_option("sentry:require_scrub_data", True)
+    project.update_option(
+        "sentry:relay_pii_config",
+        '{"applications": {"$frame.vars": ["@password:filter", "@creditcard:mask"]}}',
+    )
+    project.update_option("sentry:safe_fields", ["user_id"])
+    project.update_option("sentry:scrub_ip_address", True)
+
+    event = {
+        "user": {"ip_address": "127.0.0.1", "id": "123"},
+        "request": {
+            "url": "https://example.com/login",
+            "headers": [["Authorization", "Bearer foo"], ["Cookie", "session=bar"]],
+            "data": {"password": "hunter2", "username": "foo"},
+        },
+        "extra": {"token": "secret", "user_id": "42", "mac": "00:0a:95:9d:68:16"},
+        "exception": {
+            "values": [
+                {
+                    "type": "ValueError",
+                    "value": "Invalid card 4111 1111 1111 1111 from 10.0.0.1",
+                    "stacktrace": {
+                        "frames": [
+                            {
+                                "function": "login",
+                                "filename": "/Users/foo/app.py",
+                                "vars": {"password": "hunter2", "card": "4111111111111111"},
+                            }
+                        ]
+                        * 20
+                    },
+                }
+            ]
+        },
+        "debug_meta": {
+            "images": [
+                {"type": "symbolic", "debug_file": "/Users/foo/bar", "code_file": "/Users/foo/bar"}
+            ]
+            * 50
+        },
+    }
+
+    benchmark(lambda: scrub_data(project, copy.deepcopy(event)))
+
+
 def test_merge_pii_configs_simple():
     assert merge_pii_configs([("p:", {}), ("o:", {})]) == {}
 
@@ -1,5 +1,6 @@
 from contextlib import contextmanager
 from datetime import datetime, timedelta
+from unittest import mock
 
 import pytest
 import pytz
@@ -179,6 +180,34 @@ class RedisTSDBTest(TestCase):
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert results == {1: 0, 2: 0}
 
+    def test_get_sums_for_ranges(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC)
+        for minutes in range(0, 120, 7):
+            self.db.incr(TSDBModel.project, 1, now - timedelta(minutes=minutes), count=minutes + 1)
+            self.db.incr(TSDBModel.project, 1, now - timedelta(minutes=minutes), environment_id=1)
+
+        ranges = [
+            (now - timedelta(minutes=1), now),
+            (now - timedelta(minutes=5), now),
+            (now - timedelta(minutes=65), now - timedelta(minutes=5)),
+            (now - timedelta(hours=2), now),
+            (now - timedelta(days=1), now),
+        ]
+        for environment_id in (None, 1):
+            with mock.patch.object(self.db, "get_range", wraps=self.db.get_range) as get_range:
+                results = self.db.get_sums_for_ranges(
+                    TSDBModel.project, [1, 2], ranges, environment_id=environment_id
+                )
+
+            assert results == [
+                self.db.get_sums(
+                    TSDBModel.project, [1, 2], start, end, environment_id=environment_id
+                )
+                for start, end in ranges
+            ]
+            # One query for each of the 10 second, one minute and one hour rollups
+            assert get_range.call_count == 3
+
     def test_count_distinct(self):
         now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -0,0 +1,114 @@
+import datetime
+import decimal
+import os
+import uuid
+from collections import OrderedDict
+from enum import Enum
+
+import pytest
+from django.utils.translation import ugettext_lazy as _
+
+from sentry.utils import json
+
+SAMPLES_DIR = os.path.join(os.path.dirname(json.__file__), os.pardir, "data", "samples")
+
+VALUES = [
+    None,
+    True,
+    1,
+    -(2 ** 63),
+    2 ** 64,
+    1.5,
+    1e16,
+    float("nan"),
+    float("-inf"),
+    "",
+    "café \U0001f600",
+    "\ud800",
+    "<script>alert('&');</script>",
+    b"bytes",
+    [1, "a", None],
+    (1, 2),
+    {"b": 1, "a": {"c": [1.0, 2]}},
+    OrderedDict([("z", 1), ("a", 2)]),
+    {1: "int key", None: "none key"},
+    {"foo"},
+    frozenset(["foo"]),
+    uuid.UUID("5b07e4de-1ed0-4a3c-8dfb-f6a2a19b0e11"),
+    datetime.datetime(2011, 1, 1, 1, 1, 1, 123),
+    datetime.date(2011, 1, 1),
+    datetime.time(1, 1, 1),
+    decimal.Decimal("1.10"),
+    Enum("foo", "a b c").a,
+    _("word"),
+]
+
+
+def load_samples():
+    for filename in sorted(os.listdir(SAMPLES_DIR)):
+        if filename.endswith(".json"):
+            with open(os.path.join(SAMPLES_DIR, filename), "rb") as f:
+                yield filename, f.read()
+
+
+@pytest.fixture(params=sorted(json.backends))
+def backend(request):
+    return json.backends[request.param]()
+
+
+@pytest.fixture
+def reference():
+    return json.SimpleJSONBackend()
+
+
+@pytest.mark.parametrize("value", VALUES, ids=repr)
+def test_dumps_parity(backend, reference, value):
+    assert reference.loads(backend.dumps(value)) == reference.loads(reference.dumps(value))
+    assert backend.dumps(value).isascii()
+
+
+@pytest.mark.parametrize("value", VALUES, ids=repr)
+def test_dumps_escape_parity(backend, reference, value):
+    rv = backend.dumps(value, escape=True)
+    assert not set("<>&'") & set(rv)
+    assert reference.loads(rv) == reference.loads(reference.dumps(value, escape=True))
+
+
+def test_samples_parity(backend, reference):
+    for filename, payload in load_samples():
+        data = reference.loads(payload)
+        assert backend.loads(payload) == data, filename
+        assert reference.loads(backend.dumps(data)) == data, filename
+
+
+@pytest.mark.parametrize("payload", ["", "{", '{"a": 1', "[1,]"])
+def test_loads_error_parity(backend, payload):
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads(payload)
+
+
+def test_loads_lone_surrogate(backend):
+    assert backend.loads('"\\ud800"') == "\ud800"
+
+
+def test_set_backend():
+    try:
+        json.set_backend("rapidjson")
+        assert isinstance(json.get_backend(), json.RapidJSONBackend)
+        assert json.loads(json.dumps({"a": [1, None]})) == {"a": [1, None]}
+    finally:
+        json.set_backend("simplejson")
+
+    with pytest.raises(ValueError):
+        json.set_backend("nope")
+
+
+def test_dumps_sort_keys():
+    assert json.dumps({"b": 1, "a": {"d": 1, "c": 2}}, sort_keys=True) == (
+        '{"a":{"c":2,"d":1},"b":1}'
+    )
+    assert json.dumps({"b": 1, "a": 2}, sort_keys=True, separators=(", ", ": ")) == (
+        '{"a": 2, "b": 1}'
+    )
+    assert json.dumps({"a": "<"}, sort_keys=True, escape=True) == '{"a":"\\u003c"}'
+    assert json.dumps([1], indent=2) == "[\n  1\n]"
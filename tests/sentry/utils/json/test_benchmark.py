@@ -0,0 +1,32 @@
+import pytest
+
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+from tests.sentry.utils.json.test_backends import load_samples
+
+PAYLOADS = [payload for _, payload in load_samples()]
+DATA = [json.SimpleJSONBackend().loads(payload) for payload in PAYLOADS]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("backend_name", sorted(json.backends))
+def test_benchmark_dumps(backend_name, benchmark):
+    backend = json.backends[backend_name]()
+
+    def run():
+        for data in DATA:
+            backend.dumps(data)
+
+    benchmark(run)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("backend_name", sorted(json.backends))
+def test_benchmark_loads(backend_name, benchmark):
+    backend = json.backends[backend_name]()
+
+    def run():
+        for payload in PAYLOADS:
+            backend.loads(payload)
+
+    benchmark(run)
@@ -125,3 +125,11 @@ def test_multiple_key_operations(properties: Properties) -> None:
     store.delete_many(all_keys)
 
     assert dict(store.get_many(all_keys)) == {}
+
+
+def test_set_many(properties: Properties) -> None:
+    store = properties.store
+
+    items = list(itertools.islice(properties.items, 10))
+    store.set_many(items, ttl=timedelta(seconds=30))
+    assert dict(store.get_many([key for key, value in items])) == dict(items)
@@ -0,0 +1,86 @@
+import pytest
+from redis import Redis
+
+from sentry.eventstore.processing.base import EventProcessingStore
+from sentry.utils.cache import cache_key_for_event
+from sentry.utils.codecs import BytesCodec, JSONCodec
+from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
+from sentry.utils.kvstore.redis import RedisKVStorage
+
+
+class RoundTripCountingRedis:
+    """
+    Redis client that counts the round trips to the server, where a pipeline
+    is a single round trip no matter how many commands it holds.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.round_trips = 0
+
+    def pipeline(self, *args, **kwargs):
+        pipeline = self.client.pipeline(*args, **kwargs)
+        execute = pipeline.execute
+
+        def counting_execute(*args, **kwargs):
+            self.round_trips += 1
+            return execute(*args, **kwargs)
+
+        pipeline.execute = counting_execute
+        return pipeline
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+
+        def counting_command(*args, **kwargs):
+            self.round_trips += 1
+            return command(*args, **kwargs)
+
+        return counting_command
+
+
+@pytest.fixture
+def client():
+    client = RoundTripCountingRedis(Redis(db=6))
+    yield client
+    client.client.flushdb()
+
+
+def test_many_operations_are_single_round_trips(client):
+    store = RedisKVStorage(client)
+    items = [(f"kvstore/{i}", f"{i}".encode()) for i in range(10)]
+    keys = [key for key, value in items] + ["kvstore/missing"]
+
+    store.set_many(items)
+    assert client.round_trips == 1
+
+    assert dict(store.get_many(keys)) == dict(items)
+    assert client.round_trips == 2
+
+    store.delete_many(keys)
+    assert client.round_trips == 3
+
+    assert dict(store.get_many(keys)) == {}
+    assert client.round_trips == 4
+
+
+def test_event_processing_store_round_trips(client):
+    store = EventProcessingStore(
+        KVStorageCodecWrapper(RedisKVStorage(client), JSONCodec() | BytesCodec())
+    )
+    events = [{"event_id": f"{i:032x}", "project": 1} for i in range(10)]
+
+    keys = store.store_many(events)
+    assert keys == [cache_key_for_event(event) for event in events]
+    assert client.round_trips == 1
+
+    assert store.get_many(keys) == dict(zip(keys, events))
+    assert client.round_trips == 2
+
+    store.delete_many_by_key(keys)
+    assert client.round_trips == 3
+
+    store.delete_by_key(keys[0])
+    assert client.round_trips == 4
+
+    assert store.get_many(keys) == {}